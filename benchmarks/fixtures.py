@@ -0,0 +1,547 @@
+"""
+Synthetic audio files in every format scribepy decodes, for benchmarks.
+
+No encoder is needed: each writer emits the simplest valid stream of its
+format, uncompressed where the format allows it (FLAC verbatim subframes,
+ALAC escape frames) and digital silence where it doesn't (AAC, AC3, TTA).
+The decoders still run their full per frame work, which is what the
+benchmarks time.
+
+Usage:
+    python benchmarks/fixtures.py DIRECTORY [SECONDS]
+"""
+
+import math
+import struct
+import sys
+import wave
+import zlib
+from array import array
+from pathlib import Path
+
+from seek import make_vbr_mp3
+
+RATE = 44100
+AC3_RATE = 48000
+FLAC_BLOCK = 4096
+ALAC_FRAME = 4096
+AAC_FRAME = 1024
+AC3_FRAME = 1536
+
+
+class BitWriter:
+    """
+    Write values most significant bit first.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.value = 0
+        self.bits = 0
+
+    def write(self, value, bits):
+        self.value = (self.value << bits) | (value & ((1 << bits) - 1))
+        self.bits += bits
+        while self.bits >= 8:
+            self.bits -= 8
+            self.data.append((self.value >> self.bits) & 0xFF)
+        self.value &= (1 << self.bits) - 1
+
+    def align(self):
+        if self.bits:
+            self.write(0, 8 - self.bits)
+
+    def getvalue(self):
+        self.align()
+        return bytes(self.data)
+
+
+def crc_table(poly, width):
+    top = 1 << (width - 1)
+    mask = (1 << width) - 1
+    table = []
+    for byte in range(256):
+        crc = byte << (width - 8)
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly if crc & top else crc << 1) & mask
+        table.append(crc)
+    return table
+
+
+CRC8 = crc_table(0x07, 8)
+CRC16 = crc_table(0x8005, 16)
+
+
+def crc8(data):
+    crc = 0
+    for byte in data:
+        crc = CRC8[crc ^ byte]
+    return crc
+
+
+def crc16(data, crc=0):
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ CRC16[(crc >> 8) ^ byte]
+    return crc
+
+
+def tone(frames, chans, rate=RATE, amplitude=8000):
+    """
+    Interleaved 16 bit samples of a 440 Hz tone, a fifth higher on the
+    second channel.
+    """
+    samples = array("h", bytes(2 * frames * chans))
+    for channel in range(chans):
+        step = 2 * math.pi * 440 * (1.5**channel) / rate
+        for n in range(frames):
+            samples[n * chans + channel] = int(amplitude * math.sin(step * n))
+    return samples
+
+
+def write_wav(path, seconds):
+    samples = tone(int(seconds * RATE), 2)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes(samples.tobytes())
+    return path
+
+
+def write_mp3(path, seconds):
+    return make_vbr_mp3(path, hours=seconds / 3600)
+
+
+def write_flac(path, seconds):
+    """
+    Stereo FLAC of verbatim subframes.
+    """
+    blocks = max(int(seconds * RATE) // FLAC_BLOCK, 1)
+    samples = tone(blocks * FLAC_BLOCK, 2)
+    if sys.byteorder == "little":
+        samples.byteswap()
+
+    info = BitWriter()
+    info.write(FLAC_BLOCK, 16)
+    info.write(FLAC_BLOCK, 16)
+    info.write(0, 24)
+    info.write(0, 24)
+    info.write(RATE, 20)
+    info.write(2 - 1, 3)
+    info.write(16 - 1, 5)
+    info.write(blocks * FLAC_BLOCK, 36)
+    info.write(0, 128)  # MD5 not computed
+    streaminfo = info.getvalue()
+
+    with open(path, "wb") as f:
+        f.write(b"fLaC")
+        f.write(bytes((0x80, 0, 0, len(streaminfo))) + streaminfo)
+        for block in range(blocks):
+            header = BitWriter()
+            header.write(0b11111111111110, 14)
+            header.write(0, 2)  # reserved, fixed block size
+            header.write(0b1100, 4)  # 4096 samples
+            header.write(0b1001, 4)  # 44.1 kHz
+            header.write(0b0001, 4)  # left, right
+            header.write(0b100, 3)  # 16 bit
+            header.write(0, 1)
+            frame = bytearray(header.getvalue())
+            frame += utf8_number(block)
+            frame.append(crc8(frame))
+            start = block * FLAC_BLOCK * 2
+            channels = samples[start : start + FLAC_BLOCK * 2]
+            for channel in range(2):
+                frame.append(0b00000010)  # verbatim, no wasted bits
+                frame += channels[channel::2].tobytes()
+            frame += struct.pack(">H", crc16(frame))
+            f.write(frame)
+    return path
+
+
+def utf8_number(number):
+    # FLAC frame numbers are coded like UTF-8 code points.
+    if number < 0x80:
+        return bytes((number,))
+    encoded = bytearray()
+    while number >= 0x40 >> len(encoded):
+        encoded.insert(0, 0x80 | (number & 0x3F))
+        number >>= 6
+    lead = (0xFF00 >> (len(encoded) + 1)) & 0xFF
+    return bytes((lead | number,)) + bytes(encoded)
+
+
+def write_aac(path, seconds):
+    """
+    Silent stereo AAC LC in ADTS frames.
+    """
+    block = BitWriter()
+    block.write(1, 3)  # channel pair element
+    block.write(0, 4)
+    block.write(1, 1)  # common window
+    block.write(0, 11)  # long window, no bands, no prediction
+    block.write(0, 2)  # no M/S
+    for _ in range(2):
+        block.write(100, 8)  # global gain
+        block.write(0, 3)  # no pulse, TNS or gain control data
+    block.write(7, 3)  # end
+    block = block.getvalue()
+
+    header = BitWriter()
+    header.write(0xFFF, 12)
+    header.write(0b0001, 4)  # MPEG-4, layer 0, no CRC
+    header.write(1, 2)  # LC
+    header.write(4, 4)  # 44.1 kHz
+    header.write(0, 1)
+    header.write(2, 3)  # stereo
+    header.write(0, 4)
+    header.write(7 + len(block), 13)
+    header.write(0x7FF, 11)
+    header.write(0, 2)
+    frame = header.getvalue() + block
+
+    with open(path, "wb") as f:
+        f.write(frame * int(seconds * RATE / AAC_FRAME))
+    return path
+
+
+def write_ac3(path, seconds):
+    """
+    Silent mono AC3 at 48 kHz and 32 kbps.
+    """
+    size = 128  # bytes of a 32 kbps frame at 48 kHz
+    bits = BitWriter()
+    bits.write(0x0B77, 16)
+    bits.write(0, 16)  # crc1, set below
+    bits.write(0, 2)  # 48 kHz
+    bits.write(0, 6)  # 32 kbps
+    bits.write(8, 5)  # bsid
+    bits.write(0, 3)  # main audio service
+    bits.write(1, 3)  # 1/0 mono
+    bits.write(0, 1)  # no LFE
+    bits.write(27, 5)  # dialogue normalization
+    # No compression, language, production info, time codes or extra bsi,
+    # not copyrighted, not original.
+    bits.write(0, 8)
+    for block in range(6):
+        first = block == 0
+        bits.write(0, 3)  # blksw, dithflag, dynrnge
+        bits.write(first, 1)  # cplstre
+        if first:
+            bits.write(0, 1)  # cplinu
+            bits.write(3, 2)  # D45 exponents
+            bits.write(0, 6)  # chbwcod
+            bits.write(15, 4)  # first exponent
+            for _ in range(6):
+                bits.write(62, 7)  # three zero exponent deltas
+            bits.write(0, 2)  # gainrng
+            bits.write(1, 1)  # baie
+            bits.write(0b10_01_01_10_100, 11)
+            bits.write(1, 1)  # snroffste
+            bits.write(0, 6 + 4 + 3)  # zero offsets: no mantissas
+        else:
+            bits.write(0, 2)  # reuse exponents
+            bits.write(0, 2)  # no baie, no snroffste
+        bits.write(0, 2)  # no deltbaie, no skiple
+    frame = bytearray(bits.getvalue())
+    frame += bytes(size - len(frame))
+    frame[2:4] = struct.pack(">H", crc1(bytes(frame), size))
+    frame[-2:] = struct.pack(">H", crc16(frame[2:-2]))
+
+    with open(path, "wb") as f:
+        f.write(bytes(frame) * int(seconds * AC3_RATE / AC3_FRAME))
+    return path
+
+
+def crc1(frame, size):
+    """
+    The crc1 word making the CRC of the first 5/8 of an AC3 frame (after
+    the sync word) zero. CRC is linear, so the word is solved from the CRC
+    of each of its bits followed by the rest of the 5/8.
+    """
+    end = ((size >> 2) + (size >> 4)) << 1
+    tail = bytes(end - 4)
+    target = crc16(bytes(2) + frame[4:end])
+    columns = [crc16(struct.pack(">H", 1 << bit) + tail) for bit in range(16)]
+    # Gaussian elimination over GF(2).
+    rows = [(columns[bit], 1 << bit) for bit in range(16)]
+    word = 0
+    for bit in reversed(range(16)):
+        pivot = next((r for r in rows if r[0] >> bit & 1), None)
+        if pivot is None:
+            continue
+        rows.remove(pivot)
+        rows = [
+            (c ^ pivot[0], w ^ pivot[1]) if c >> bit & 1 else (c, w)
+            for c, w in rows
+        ]
+        if target >> bit & 1:
+            target ^= pivot[0]
+            word ^= pivot[1]
+    return word
+
+
+def write_tta(path, seconds):
+    """
+    Silent stereo TTA1. Zero samples code as a zero bit plus k zero bits
+    with k adapting as in the decoder, so only the bit count is simulated.
+    """
+    frames = int(seconds * RATE)
+    frame_length = 256 * RATE // 245
+    header = struct.pack("<4sHHHII", b"TTA1", 1, 2, 16, RATE, frames)
+    header += struct.pack("<I", zlib.crc32(header))
+
+    sizes = []
+    data = []
+    for start in range(0, frames, frame_length):
+        count = min(frame_length, frames - start)
+        bits = 0
+        k = 10
+        total = 1 << (k + 4)
+        for _ in range(count):
+            bits += 1 + k
+            total -= total >> 4
+            if k > 0 and total < 1 << (k + 4):
+                k -= 1
+        # Both channels code the same bits, one after the other per sample.
+        payload = bytes(-(-2 * bits // 8))
+        data.append(payload + struct.pack("<I", zlib.crc32(payload)))
+        sizes.append(len(data[-1]))
+
+    table = struct.pack(f"<{len(sizes)}I", *sizes)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(table + struct.pack("<I", zlib.crc32(table)))
+        for frame in data:
+            f.write(frame)
+    return path
+
+
+def write_alac(path, seconds):
+    """
+    Stereo ALAC in an M4A file, every packet an uncompressed escape frame.
+    """
+    packets = max(int(seconds * RATE) // ALAC_FRAME, 1)
+    samples = tone(packets * ALAC_FRAME, 2)
+
+    if sys.byteorder == "little":
+        samples.byteswap()
+
+    # Channel pair element, whole frame, no shift, escape (uncompressed),
+    # then the samples and the end element, 26 bits around the samples.
+    header = 1 << 20 | 0b0001
+    width = ALAC_FRAME * 2 * 16
+    size = -(-(23 + width + 3) // 8)
+    pad = size * 8 - (23 + width + 3)
+    frames = []
+    for packet in range(packets):
+        start = packet * ALAC_FRAME * 2
+        value = int.from_bytes(samples[start : start + ALAC_FRAME * 2], "big")
+        value = ((header << width | value) << 3 | 7) << pad
+        frames.append(value.to_bytes(size, "big"))
+
+    cookie = struct.pack(
+        ">IBBBBBBHIII", ALAC_FRAME, 0, 16, 40, 10, 14, 2, 255, 0, 0, RATE
+    )
+    duration = packets * ALAC_FRAME
+    matrix = struct.pack(">9I", 0x10000, 0, 0, 0, 0x10000, 0, 0, 0, 0x40000000)
+
+    def box(name, *parts):
+        body = b"".join(parts)
+        return struct.pack(">I", 8 + len(body)) + name + body
+
+    def stbl(offset):
+        entry = struct.pack(">6xH8xHHHHI", 1, 2, 16, 0, 0, RATE << 16)
+        return box(
+            b"stbl",
+            box(
+                b"stsd",
+                struct.pack(">II", 0, 1),
+                box(b"alac", entry, box(b"alac", bytes(4), cookie)),
+            ),
+            box(b"stts", struct.pack(">IIII", 0, 1, packets, ALAC_FRAME)),
+            box(b"stsc", struct.pack(">IIIII", 0, 1, 1, packets, 1)),
+            box(
+                b"stsz",
+                struct.pack(
+                    f">III{packets}I", 0, 0, packets, *[size] * packets
+                ),
+            ),
+            box(b"stco", struct.pack(">III", 0, 1, offset)),
+        )
+
+    def moov(offset):
+        return box(
+            b"moov",
+            box(
+                b"mvhd",
+                struct.pack(
+                    ">IIIIIIH10x", 0, 0, 0, RATE, duration, 0x10000, 0x100
+                ),
+                matrix,
+                struct.pack(">24xI", 2),
+            ),
+            box(
+                b"trak",
+                box(
+                    b"tkhd",
+                    struct.pack(
+                        ">IIIIII8xHHH2x",
+                        7,
+                        0,
+                        0,
+                        1,
+                        0,
+                        duration,
+                        0,
+                        0,
+                        0x100,
+                    ),
+                    matrix,
+                    struct.pack(">II", 0, 0),
+                ),
+                box(
+                    b"mdia",
+                    box(
+                        b"mdhd",
+                        struct.pack(
+                            ">IIIIIHH", 0, 0, 0, RATE, duration, 0x55C4, 0
+                        ),
+                    ),
+                    box(
+                        b"hdlr", struct.pack(">II4s12x", 0, 0, b"soun"), b"\0"
+                    ),
+                    box(
+                        b"minf",
+                        box(b"smhd", bytes(8)),
+                        box(
+                            b"dinf",
+                            box(
+                                b"dref",
+                                struct.pack(">II", 0, 1),
+                                box(b"url ", struct.pack(">I", 1)),
+                            ),
+                        ),
+                        stbl(offset),
+                    ),
+                ),
+            ),
+        )
+
+    ftyp = box(b"ftyp", b"M4A ", struct.pack(">I", 0), b"M4A mp42isom")
+    # The chunk offset points past ftyp, moov and the mdat header.
+    offset = len(ftyp) + len(moov(0)) + 8
+    with open(path, "wb") as f:
+        f.write(ftyp)
+        f.write(moov(offset))
+        f.write(box(b"mdat", *frames))
+    return path
+
+
+# Fixture writers by extension, each decoded by a different BASS add-on
+# (or BASS itself for wav and mp3).
+WRITERS = {
+    "wav": write_wav,
+    "mp3": write_mp3,
+    "flac": write_flac,
+    "aac": write_aac,
+    "ac3": write_ac3,
+    "tta": write_tta,
+    "m4a": write_alac,
+}
+
+
+def ogg_crc(data):
+    # Ogg's CRC is the unreflected form of zlib's, with no inversion.
+    reflected = zlib.crc32(data.translate(REVERSED), 0xFFFFFFFF) ^ 0xFFFFFFFF
+    return int(f"{reflected:032b}"[::-1], 2)
+
+
+REVERSED = bytes(int(f"{byte:08b}"[::-1], 2) for byte in range(256))
+
+
+def write_ogg(path, seconds, packet_size=200):
+    """
+    Ogg Vorbis container with real header packets and filler audio packets,
+    for the pyogginfo page parser (it doesn't decode audio).
+    """
+    identification = b"\x01vorbis" + struct.pack(
+        "<IBIiiiBB", 0, 2, RATE, 0, 96000, 0, 0xB8, 1
+    )
+    vendor = b"scribepy benchmarks"
+    comments = (
+        b"\x03vorbis"
+        + struct.pack("<I", len(vendor))
+        + vendor
+        + struct.pack("<II", 1, 13)
+        + b"TITLE=fixture\x01"
+    )
+    setup = b"\x05vorbis" + bytes(32)
+
+    pages = []
+
+    def page(packets, granule, flags=0):
+        table = bytearray()
+        for packet in packets:
+            table += b"\xff" * (len(packet) // 255)
+            table.append(len(packet) % 255)
+        header = struct.pack(
+            "<4sBBqIIIB",
+            b"OggS",
+            0,
+            flags,
+            granule,
+            1,
+            len(pages),
+            0,
+            len(table),
+        )
+        body = bytes(table) + b"".join(packets)
+        crc = ogg_crc(header + body)
+        pages.append(header[:22] + struct.pack("<I", crc) + header[26:] + body)
+
+    page([identification], 0, 0x02)
+    page([comments, setup], 0)
+    # 1024 samples per packet, packets grouped up to ~4 KB per page.
+    per_page = 4096 // packet_size
+    total = int(seconds * RATE / 1024)
+    filler = bytes(range(256)) * (packet_size // 256 + 1)
+    for first in range(0, total, per_page):
+        count = min(per_page, total - first)
+        last = first + count == total
+        page(
+            [filler[:packet_size]] * count,
+            (first + count) * 1024,
+            0x04 if last else 0,
+        )
+
+    with open(path, "wb") as f:
+        f.write(b"".join(pages))
+    return path
+
+
+def make_fixtures(directory, seconds=30):
+    """
+    Write every fixture into directory, keeping files already there.
+
+    Returns:
+        Dictionary of path by extension, ogg included.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    files = {}
+    for ext, writer in {**WRITERS, "ogg": write_ogg}.items():
+        path = directory / f"fixture-{seconds:g}s.{ext}"
+        if not path.exists():
+            tmp = path.with_name(f"tmp-{path.name}")
+            writer(tmp, seconds)
+            tmp.replace(path)
+        files[ext] = path
+    return files
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 30
+    for ext, path in make_fixtures(sys.argv[1], seconds).items():
+        print(f"{ext:<6}{path.stat().st_size:>12} {path}")
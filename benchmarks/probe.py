@@ -0,0 +1,71 @@
+"""
+Benchmark format probing per file: libmagic vs signature sniffing vs cache.
+
+Usage:
+    python benchmarks/probe.py [FILES...]
+
+Without FILES, synthetic files carrying each supported header signature are
+generated in a temporary directory. The probe cache is redirected to a
+temporary directory so the user cache is never touched.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+HEADERS = {
+    "wav": b"RIFF\x24\x00\x00\x00WAVEfmt ",
+    "flac": b"fLaC\x00\x00\x00\x22",
+    "ogg": b"OggS\x00\x02",
+    "mp3": b"ID3\x04\x00\x00\x00\x00\x00\x00",
+    "mp2": b"\xff\xfd\x90\x00",
+    "aac": b"\xff\xf1\x50\x80",
+    "m4a": b"\x00\x00\x00\x20ftypM4A \x00\x00\x00\x00",
+    "mp4": b"\x00\x00\x00\x20ftypisom\x00\x00\x02\x00",
+    "ac3": b"\x0b\x77\x00\x00",
+    "tta": b"TTA1\x01\x00\x02\x00",
+}
+
+
+def make_fixtures(directory, size=1 << 20):
+    files = []
+    for ext, header in HEADERS.items():
+        path = Path(directory) / f"fixture.{ext}"
+        path.write_bytes(header + bytes(size - len(header)))
+        files.append(path)
+    return files
+
+
+def timed(func, *args):
+    start = perf_counter()
+    result = func(*args)
+    return (perf_counter() - start) * 1000, result
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SCRIBEPY_CACHE_DIR"] = str(Path(tmp) / "cache")
+        files = [Path(f) for f in argv] or make_fixtures(tmp)
+
+        import magic
+        from scribepy.player import probe_mime
+
+        print(
+            f"{'file':<24}{'mime':<26}"
+            f"{'libmagic ms':>12}{'probe ms':>10}{'cached ms':>11}"
+        )
+        for f in files:
+            before, _ = timed(magic.from_file, str(f), True)
+            after, mime = timed(probe_mime, f)
+            cached, _ = timed(probe_mime, f)
+            print(
+                f"{f.name[:23]:<24}{mime[:25]:<26}"
+                f"{before:>12.3f}{after:>10.3f}{cached:>11.3f}"
+            )
+        print("\nlibmagic column includes database load on the first file.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark short rewinds: decoder seeks vs the rewind history.
+
+Usage:
+    python benchmarks/rewind.py [FILES...]
+
+Without FILES, a synthetic 10 minute VBR MP3 is generated in a temporary
+directory. Each file is played for a few seconds on the no sound device,
+then rewound by 2 and 10 seconds (F7/F2) repeatedly with:
+
+    decoder     BASS_ChannelSetPosition on the decoder
+    seek table  Player(precise_seek=True), MP3/AAC only
+    history     Player(rewind_seconds=60), served from the ring buffer
+"""
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from seek import make_vbr_mp3
+
+MODES = (
+    ("decoder", {}),
+    ("seek table", {"precise_seek": True}),
+    ("history", {"rewind_seconds": 60}),
+)
+PLAY_SECONDS = 12
+REPEAT = 20
+
+
+def rewind_ms(p, seconds):
+    # Rewind and jump forward again so every rewind starts at the same point.
+    timings = []
+    for _ in range(REPEAT):
+        start = perf_counter()
+        p.seek(-seconds)
+        timings.append((perf_counter() - start) * 1000)
+        p.seek(seconds)
+    return timings
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SCRIBEPY_CACHE_DIR"] = str(Path(tmp) / "cache")
+        files = [Path(f) for f in argv] or [
+            make_vbr_mp3(Path(tmp) / "vbr.mp3", hours=1 / 6)
+        ]
+
+        from scribepy import player
+        from scribepy.pybass import pybass as bass
+
+        if not bass.BASS_Init(0, 44100, 0, 0, 0):
+            sys.exit("BASS_Init failed")
+        player.BASS_Init = lambda *args: True
+
+        print(
+            f"{'file':<24}{'mode':<12}{'-2s ms':>10}{'max':>8}"
+            f"{'-10s ms':>10}{'max':>8}{'history s':>11}"
+        )
+        for f in files:
+            for name, options in MODES:
+                p = player.Player(**options)
+                if p.create_file_stream(f):
+                    break
+                if name == "seek table":
+                    # Let the background scan cache the table, then reopen.
+                    time.sleep(2)
+                    p.destruct()
+                    p.create_file_stream(f)
+                p.play()
+                time.sleep(PLAY_SECONDS)
+                p.pause()
+
+                short, long = rewind_ms(p, 2), rewind_ms(p, 10)
+                held = p.history.seconds if p.history else 0.0
+                print(
+                    f"{f.name:<24}{name:<12}"
+                    f"{sum(short) / len(short):>10.3f}{max(short):>8.3f}"
+                    f"{sum(long) / len(long):>10.3f}{max(long):>8.3f}"
+                    f"{held:>11.1f}"
+                )
+                p.destruct()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark seek latency and accuracy on a long VBR MP3.
+
+Usage:
+    python benchmarks/seek.py [FILE]
+
+Without FILE, a synthetic 4 hour VBR MP3 (silent frames with random
+bitrates) is generated in a temporary directory. Compared are BASS's
+default bitrate estimated seeking, BASS_STREAM_PRESCAN and the cached seek
+table used by Player(precise_seek=True). Accuracy is the distance between
+the requested time and the time of the frame BASS decodes from, according
+to the seek table. BASS runs on the no sound device, so no audio is played.
+"""
+import os
+import sys
+import random
+import tempfile
+from bisect import bisect_right
+from pathlib import Path
+from time import perf_counter
+
+BITRATES = {32: 1, 40: 2, 48: 3, 64: 5, 128: 9}  # kbps: MPEG-1 L3 index
+
+
+def make_vbr_mp3(path, hours=4, seed=1):
+    """
+    Write silent MPEG-1 Layer III frames (44.1 kHz stereo) with random
+    bitrates, so BASS can't derive time from file position.
+    """
+    rng = random.Random(seed)
+    frames = int(hours * 3600 * 44100 / 1152)
+    with open(path, "wb") as f:
+        for _ in range(frames):
+            bitrate = rng.choice(tuple(BITRATES))
+            padding = rng.random() < 0.5
+            size = 144 * bitrate * 1000 // 44100 + padding
+            header = bytes(
+                (0xFF, 0xFB, BITRATES[bitrate] << 4 | padding << 1, 0xC4)
+            )
+            f.write(header + bytes(size - 4))
+    return path
+
+
+def timed(func, *args):
+    start = perf_counter()
+    result = func(*args)
+    return (perf_counter() - start) * 1000, result
+
+
+def summary(name, open_ms, seek_ms, errors, failed=0):
+    errors = errors or [float("nan")]
+    print(
+        f"{name:<14}{open_ms:>10.2f}"
+        f"{sum(seek_ms) / len(seek_ms):>11.3f}{max(seek_ms):>10.3f}"
+        f"{sum(errors) / len(errors):>12.3f}{max(errors):>10.3f}"
+        f"{failed:>8}"
+    )
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SCRIBEPY_CACHE_DIR"] = str(Path(tmp) / "cache")
+        if argv:
+            file = Path(argv[0])
+        else:
+            print("Generating 4 hour VBR MP3...")
+            file = make_vbr_mp3(Path(tmp) / "long.mp3")
+
+        from scribepy import player
+        from scribepy.pybass import pybass as bass
+        from scribepy.seektable import SeekTable
+
+        if not bass.BASS_Init(0, 44100, 0, 0, 0):
+            sys.exit("BASS_Init failed")
+        player.BASS_Init = lambda *args: True
+
+        build_ms, table = timed(SeekTable.build, file)
+        if table is None:
+            sys.exit(f"{file} is not an MPEG audio/ADTS file")
+        table.save(file)
+        load_ms, table = timed(SeekTable.load, file)
+        print(
+            f"{file.name}: {table.duration:.0f}s, seek table built in "
+            f"{build_ms:.0f}ms, loaded in {load_ms:.2f}ms\n"
+        )
+
+        def frame_time(offset):
+            # Time of the last indexed frame at or before a file offset.
+            k = bisect_right(table.offsets, offset) - 1
+            return table.times[max(k, 0)]
+
+        rng = random.Random(2)
+        targets = [rng.uniform(0, table.duration - 5) for _ in range(50)]
+
+        print(
+            f"{'mode':<14}{'open ms':>10}{'seek ms':>11}{'max ms':>10}"
+            f"{'error s':>12}{'max s':>10}{'failed':>8}"
+        )
+        for name, flags in (
+            ("estimated", bass.BASS_STREAM_DECODE),
+            ("prescan", bass.BASS_STREAM_DECODE | bass.BASS_STREAM_PRESCAN),
+        ):
+            open_ms, stream = timed(
+                bass.BASS_StreamCreateFile, False, bytes(file), 0, 0, flags
+            )
+            clock = player.PlaybackClock(stream)
+            seek_ms, errors, failed = [], [], 0
+            for target in targets:
+                ms, ok = timed(
+                    bass.BASS_ChannelSetPosition,
+                    stream,
+                    clock.bytes(target),
+                    bass.BASS_POS_BYTE,
+                )
+                offset = bass.BASS_StreamGetFilePosition(
+                    stream, bass.BASS_FILEPOS_CURRENT
+                )
+                seek_ms.append(ms)
+                if not ok:
+                    failed += 1
+                    continue
+                # Index entries are at most one interval apart.
+                errors.append(
+                    max(abs(frame_time(offset) - target) - table.interval, 0)
+                )
+            bass.BASS_StreamFree(stream)
+            summary(name, open_ms, seek_ms, errors, failed)
+
+        p = player.Player(precise_seek=True)
+        open_ms, _ = timed(p.create_file_stream, file)
+        seek_ms, errors = [], []
+        for target in targets:
+            ms, _ = timed(p.move_to_position_seconds, target)
+            seek_ms.append(ms)
+            errors.append(abs(p.position - target))
+        summary("seek table", open_ms, seek_ms, errors)
+        p.destruct()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""
+Benchmark suite of scribepy's hot paths, with JSON results and regression
+checks against a baseline.
+
+Usage:
+    python benchmarks/suite.py run [-o FILE] [-f DIR] [-s SECONDS] [-k NAME]
+    python benchmarks/suite.py compare BASELINE CURRENT [-t PERCENT]
+
+run generates synthetic fixtures in every supported format (see
+fixtures.py), initializes BASS on the no sound device and measures:
+
+    open.EXT        Player.create_file_stream latency, ms
+    decode.ADDON    decoding speed of each BASS add-on, x realtime
+    blocks.EXT      scribepy.decode.iter_blocks speed (mono float32),
+                    x realtime
+    seek.EXT        Player.move_to_position_seconds latency, ms
+    poll.position   Player.position, us per call
+    poll.snapshot   Player.snapshot(), us per call
+    browser         CustomFileBrowser._populate_list of 10000 entries, ms
+    ogginfo         pyogginfo parsing speed, MB/s
+
+Every metric is the median of several runs. The results are printed and
+written to a JSON file; compare prints the change of every metric between
+two such files and exits with status 1 if any got worse by more than the
+threshold, so it can gate a CI job.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from time import perf_counter
+
+from fixtures import WRITERS, make_fixtures
+
+FORMAT = 1
+REPEAT = 7
+SEEKS = 50
+POLLS = 20000
+BROWSER_ENTRIES = 10000
+# Fixture decoded by each add-on.
+ADDONS = {
+    "bass": "wav",
+    "mp3": "mp3",
+    "flac": "flac",
+    "aac": "aac",
+    "alac": "m4a",
+    "tta": "tta",
+    "ac3": "ac3",
+}
+THRESHOLD = 10.0
+
+
+def result(values, unit, better="lower"):
+    return {
+        "value": statistics.median(values),
+        "min": min(values),
+        "max": max(values),
+        "runs": len(values),
+        "unit": unit,
+        "better": better,
+    }
+
+
+def timed_ms(func, *args):
+    start = perf_counter()
+    func(*args)
+    return (perf_counter() - start) * 1000
+
+
+def bench_open(files):
+    from scribepy.player import Player
+
+    for ext in WRITERS:
+        p = Player(device=0)
+        timings = []
+        for _ in range(REPEAT):
+            start = perf_counter()
+            error = p.create_file_stream(files[ext])
+            timings.append((perf_counter() - start) * 1000)
+            p.destruct()
+            if error:
+                raise RuntimeError(error["error"])
+        yield f"open.{ext}", result(timings, "ms")
+
+
+def bench_decode(files):
+    import ctypes
+    from scribepy.player import registry
+    from scribepy.pybass import pybass as bass
+
+    decoders = {decoder.name: decoder for decoder in registry.decoders}
+    buffer = ctypes.create_string_buffer(1 << 20)
+    for addon, ext in ADDONS.items():
+        decoder = decoders["bass" if addon == "mp3" else addon]
+        registry.load_plugin(decoder)
+        speeds = []
+        for _ in range(3):
+            stream = decoder.open(files[ext], bass.BASS_STREAM_DECODE)
+            if not stream:
+                raise RuntimeError(f"{addon} can't open {files[ext]}")
+            seconds = bass.BASS_ChannelBytes2Seconds(
+                stream,
+                bass.BASS_ChannelGetLength(stream, bass.BASS_POS_BYTE),
+            )
+            start = perf_counter()
+            read = 1
+            while read not in (0, 0xFFFFFFFF):
+                read = bass.BASS_ChannelGetData(stream, buffer, len(buffer))
+            speeds.append(seconds / (perf_counter() - start))
+            bass.BASS_StreamFree(stream)
+        yield f"decode.{addon}", result(speeds, "x realtime", "higher")
+
+
+def bench_blocks(files):
+    from scribepy.decode import file_format, iter_blocks
+
+    for ext in WRITERS:
+        seconds = file_format(files[ext])["seconds"]
+        speeds = []
+        for _ in range(3):
+            start = perf_counter()
+            for _ in iter_blocks(files[ext], 1.0):
+                pass
+            speeds.append(seconds / (perf_counter() - start))
+        yield f"blocks.{ext}", result(speeds, "x realtime", "higher")
+
+
+def bench_seek(files):
+    from scribepy.player import Player
+
+    rng = random.Random(2)
+    for ext in WRITERS:
+        p = Player(device=0)
+        if p.create_file_stream(files[ext]):
+            raise RuntimeError(f"Can't open {files[ext]}")
+        p.play()
+        length = p.length
+        timings = [
+            timed_ms(p.move_to_position_seconds, rng.uniform(0, length - 1))
+            for _ in range(SEEKS)
+        ]
+        p.destruct()
+        yield f"seek.{ext}", result(timings, "ms")
+
+
+def bench_poll(files):
+    from scribepy.player import Player
+
+    p = Player(device=0)
+    p.create_file_stream(files["wav"])
+    p.play()
+    for name, poll in (
+        ("position", lambda: p.position),
+        ("snapshot", p.snapshot),
+    ):
+        timings = []
+        for _ in range(REPEAT):
+            start = perf_counter()
+            for _ in range(POLLS):
+                poll()
+            timings.append((perf_counter() - start) * 1e6 / POLLS)
+        yield f"poll.{name}", result(timings, "us")
+    p.destruct()
+
+
+def bench_browser(files):
+    from scribepy.tui.utils.widgets import CustomFileBrowser
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in range(BROWSER_ENTRIES):
+            if n % 10:
+                (Path(tmp) / f"{n:05}.mp3").touch()
+            else:
+                os.mkdir(Path(tmp) / f"dir{n:05}")
+        browser = CustomFileBrowser(20, tmp)
+        timings = [
+            timed_ms(browser._populate_list, tmp) for _ in range(REPEAT)
+        ]
+    yield "browser", result(timings, "ms")
+
+
+def bench_ogginfo(files):
+    from scribepy.pybass import pyogginfo
+
+    data = files["ogg"].read_bytes()
+    speeds = []
+    for _ in range(REPEAT):
+        info = pyogginfo.VorbisStreamInfo()
+        stream = pyogginfo.SimpleDemultiplexer(info)
+        start = perf_counter()
+        for offset in range(0, len(data), 1 << 16):
+            stream.process(data[offset : offset + (1 << 16)])
+        speeds.append(len(data) / 1e6 / (perf_counter() - start))
+    yield "ogginfo", result(speeds, "MB/s", "higher")
+
+
+BENCHMARKS = {
+    "open": bench_open,
+    "decode": bench_decode,
+    "blocks": bench_blocks,
+    "seek": bench_seek,
+    "poll": bench_poll,
+    "browser": bench_browser,
+    "ogginfo": bench_ogginfo,
+}
+
+
+def print_row(name, entry):
+    print(
+        f"{name:<16}{entry['value']:>12.3f}{entry['min']:>12.3f}"
+        f"{entry['max']:>12.3f}  {entry['unit']}"
+    )
+
+
+def run(opts):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SCRIBEPY_CACHE_DIR"] = str(Path(tmp) / "cache")
+        fixtures = Path(opts.fixtures or Path(tmp) / "fixtures")
+        print(f"Writing {opts.seconds:g}s fixtures to {fixtures}...")
+        files = make_fixtures(fixtures, opts.seconds)
+
+        from scribepy.pybass import pybass as bass
+
+        if not bass.BASS_Init(0, 44100, 0, 0, 0):
+            sys.exit("BASS_Init failed")
+
+        results = {}
+        skipped = {}
+        print(f"\n{'benchmark':<16}{'median':>12}{'min':>12}{'max':>12}")
+        for name, bench in BENCHMARKS.items():
+            if opts.only and not any(name.startswith(k) for k in opts.only):
+                continue
+            try:
+                for metric, entry in bench(files):
+                    results[metric] = entry
+                    print_row(metric, entry)
+            except (ImportError, RuntimeError) as error:
+                skipped[name] = str(error)
+                print(f"{name:<16}skipped: {error}")
+
+        report = {
+            "format": FORMAT,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "bass": f"{bass.BASS_GetVersion():08x}",
+            "fixture_seconds": opts.seconds,
+            "results": results,
+            "skipped": skipped,
+        }
+    with open(opts.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {opts.output}")
+    return 0
+
+
+def compare(opts):
+    with open(opts.baseline) as f:
+        baseline = json.load(f)["results"]
+    with open(opts.current) as f:
+        current = json.load(f)["results"]
+
+    regressions = 0
+    print(
+        f"{'benchmark':<16}{'baseline':>12}{'current':>12}{'change':>9}"
+        f"  unit"
+    )
+    for name in sorted(set(baseline) | set(current)):
+        if name not in current:
+            print(f"{name:<16}{baseline[name]['value']:>12.3f}{'-':>12}")
+            continue
+        entry = current[name]
+        if name not in baseline:
+            print(f"{name:<16}{'-':>12}{entry['value']:>12.3f}")
+            continue
+        before, after = baseline[name]["value"], entry["value"]
+        change = 100 * (after - before) / before if before else 0.0
+        worse = change if entry["better"] == "lower" else -change
+        flag = ""
+        if worse > opts.threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        elif worse < -opts.threshold:
+            flag = "  improved"
+        print(
+            f"{name:<16}{before:>12.3f}{after:>12.3f}{change:>+8.1f}%"
+            f"  {entry['unit']}{flag}"
+        )
+    print(
+        f"\n{regressions} regression(s) over {opts.threshold:g}%"
+        if regressions
+        else f"\nNo regression over {opts.threshold:g}%"
+    )
+    return 1 if regressions else 0
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="suite.py", description="scribepy benchmark suite"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument(
+        "-o",
+        "--output",
+        default="benchmark.json",
+        help="JSON results file (default benchmark.json).",
+    )
+    run_parser.add_argument(
+        "-f",
+        "--fixtures",
+        help="Directory keeping the fixtures between runs "
+        "(default: a temporary directory).",
+    )
+    run_parser.add_argument(
+        "-s",
+        "--seconds",
+        type=float,
+        default=30,
+        help="Length of the fixtures (default 30).",
+    )
+    run_parser.add_argument(
+        "-k",
+        "--only",
+        action="append",
+        metavar="NAME",
+        help=f"Only run benchmarks starting with NAME, one of "
+        f"{', '.join(BENCHMARKS)}. Repeatable.",
+    )
+
+    compare_parser = commands.add_parser(
+        "compare", help="Compare two results files."
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help=f"Percent a metric may get worse by (default {THRESHOLD:g}).",
+    )
+    return parser
+
+
+def main(argv=None):
+    opts = get_parser().parse_args(argv)
+    command = run if opts.command == "run" else compare
+    sys.exit(command(opts))
+
+
+if __name__ == "__main__":
+    main()
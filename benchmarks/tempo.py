@@ -0,0 +1,127 @@
+"""
+Benchmark the CPU cost of the BASS_FX tempo profiles.
+
+Usage:
+    python benchmarks/tempo.py [FILE]
+
+Without FILE, a synthetic 30 second voice-like WAV (a gliding harmonic
+tone with noise) is generated in a temporary directory. For every profile
+in scribepy.tempo.TEMPO_PROFILES and tempo from -30% to +30% the file is:
+
+    played      through Player on the no sound device, reporting the mean
+                BASS_GetCPU over the playback time
+    decoded     through a decoding tempo stream as fast as possible,
+                reporting process CPU time per second of audio
+"""
+import sys
+import math
+import time
+import wave
+import random
+import tempfile
+from array import array
+from pathlib import Path
+
+TEMPOS = (-30, -20, -10, 0, 10, 20, 30)
+PLAY_SECONDS = 3
+SAMPLE_INTERVAL = 0.1
+
+
+def make_voice_wav(path, seconds=30, freq=44100, seed=1):
+    """
+    Write a mono 16 bit WAV of a harmonic tone gliding between 90 and
+    250 Hz with syllable-like amplitude and some noise.
+    """
+    rng = random.Random(seed)
+    samples = array("h")
+    phase = 0.0
+    for n in range(int(seconds * freq)):
+        t = n / freq
+        pitch = 170 + 80 * math.sin(2 * math.pi * 0.7 * t)
+        phase += 2 * math.pi * pitch / freq
+        envelope = max(math.sin(2 * math.pi * 3 * t), 0.0)
+        value = envelope * (
+            math.sin(phase) + 0.5 * math.sin(2 * phase)
+            + 0.25 * math.sin(3 * phase)
+        )
+        samples.append(int(7000 * value + rng.gauss(0, 300)))
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(freq)
+        f.writeframes(samples.tobytes())
+    return path
+
+
+def playback_cpu(player_module, file, profile, tempo):
+    p = player_module.Player(tempo_profile=profile)
+    if p.create_file_stream(file):
+        sys.exit(f"Can't open {file}")
+    p.change_tempo(tempo)
+    p.play()
+    readings = []
+    end = time.monotonic() + PLAY_SECONDS
+    while time.monotonic() < end:
+        time.sleep(SAMPLE_INTERVAL)
+        readings.append(player_module.BASS_GetCPU())
+    p.destruct()
+    return sum(readings) / len(readings)
+
+
+def decode_cpu(player_module, file, profile, tempo):
+    bass = player_module
+    source = bass.BASS_StreamCreateFile(
+        False, bytes(file), 0, 0, bass.BASS_STREAM_DECODE
+    )
+    stream = bass.BASS_FX_TempoCreate(
+        source, bass.BASS_STREAM_DECODE | bass.BASS_FX_FREESOURCE
+    )
+    options = player_module.tempo_options(profile)
+    for attribute, value in options.items():
+        bass.BASS_ChannelSetAttribute(stream, attribute, value)
+    bass.BASS_ChannelSetAttribute(stream, bass.BASS_ATTRIB_TEMPO, tempo)
+    seconds = bass.BASS_ChannelBytes2Seconds(
+        source, bass.BASS_ChannelGetLength(source, bass.BASS_POS_BYTE)
+    )
+
+    buffer = bass.ctypes.create_string_buffer(1 << 16)
+    start = time.process_time()
+    while True:
+        read = bass.BASS_ChannelGetData(stream, buffer, len(buffer))
+        if read in (0, 0xFFFFFFFF):
+            break
+    cpu = time.process_time() - start
+    bass.BASS_StreamFree(stream)
+    return 100 * cpu / seconds
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    with tempfile.TemporaryDirectory() as tmp:
+        file = Path(argv[0]) if argv else make_voice_wav(
+            Path(tmp) / "voice.wav"
+        )
+
+        from scribepy import player
+        from scribepy.tempo import TEMPO_PROFILES
+
+        if not player.BASS_Init(0, 44100, 0, 0, 0):
+            sys.exit("BASS_Init failed")
+        player.BASS_Init = lambda *args: True
+
+        print(
+            f"{'profile':<14}{'tempo %':>8}{'play CPU %':>12}"
+            f"{'decode CPU %':>14}"
+        )
+        for profile in TEMPO_PROFILES:
+            for tempo in TEMPOS:
+                played = playback_cpu(player, file, profile, tempo)
+                decoded = decode_cpu(player, file, profile, tempo)
+                print(
+                    f"{profile:<14}{tempo:>8}{played:>12.2f}"
+                    f"{decoded:>14.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
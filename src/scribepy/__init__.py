@@ -1,10 +1,37 @@
-from loguru import logger
 import sys
 
-logger.disable("scribepy")
+_enabled = False
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+class _Logger:
+    """
+    Stand-in for loguru's logger.
+
+    Logging is disabled until custom_logger is called, so loguru is only
+    imported once logging has been enabled and every log call is a no-op
+    before that.
+    """
+
+    def __getattr__(self, name):
+        if not _enabled:
+            return _noop
+        from loguru import logger
+
+        return getattr(logger, name)
+
+
+logger = _Logger()
 
 
 def custom_logger(sink=sys.stderr, level="WARNING"):
+    global _enabled
+    from loguru import logger
+
     logger.remove()
     logger.configure(handlers=[{"sink": sink, "level": level}])
     logger.enable("scribepy")
+    _enabled = True
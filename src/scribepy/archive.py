@@ -0,0 +1,474 @@
+"""
+Members of zip and tar archives played without extracting them.
+
+A member is addressed by the path of the archive followed by its name in
+the archive, as if the archive were a directory
+(/recordings/batch.zip/day1/a.mp3). BASS reads members through
+ArchiveMember (BASS_StreamCreateFileUser): stored members (in zip files,
+and every member of an uncompressed tar) are read and seeked straight from
+the archive, compressed ones are decompressed through a cache of blocks so
+rewinds don't decompress them again.
+"""
+
+import ctypes
+import os
+import struct
+import tarfile
+import threading
+import time
+import zipfile
+import zlib
+from collections import OrderedDict
+from pathlib import Path, PurePosixPath
+
+from scribepy import logger
+from scribepy.storage import UserFile
+
+ARCHIVE_SUFFIXES = (
+    ".zip",
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+)
+# Decompressed bytes per cached block, and blocks cached per member.
+BLOCK = 256 << 10
+CACHE_BLOCKS = 32
+# Archive indexes kept in memory.
+INDEX_LIMIT = 8
+
+# Fixed part of a zip local file header, whose name and extra field
+# lengths locate the member data.
+ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+_indexes = OrderedDict()
+_lock = threading.Lock()
+
+
+class ArchiveError(OSError):
+    """
+    Archive that can't be read: corrupt, truncated or of an unsupported
+    kind.
+    """
+
+
+def is_archive(path):
+    """
+    Check whether path is an archive file, by its name.
+
+    Arguments:
+        path: Path to check.
+
+    Returns:
+        True if path has an archive suffix and is a file.
+    """
+    return str(path).lower().endswith(ARCHIVE_SUFFIXES) and os.path.isfile(
+        path
+    )
+
+
+def member_name(name):
+    """
+    Normalize the name of an archive member, as tar stores it for
+    "tar cf batch.tar ." (./day1/a.mp3) or zip with a leading "/".
+
+    Arguments:
+        name: Name stored in the archive.
+
+    Returns:
+        Name relative to the top of the archive (day1/a.mp3), "" for the
+        top itself.
+    """
+    name = PurePosixPath(name.strip("/")).as_posix()
+    return "" if name == "." else name
+
+
+def split(path):
+    """
+    Split a path inside an archive into archive and member name.
+
+    Arguments:
+        path: Path to split.
+
+    Returns:
+        Tuple of (archive Path, member name), None if path isn't inside an
+        archive.
+    """
+    path = Path(path)
+    if path.exists():
+        return None
+    for parent in path.parents:
+        if is_archive(parent):
+            return parent, path.relative_to(parent).as_posix()
+        if parent.exists():
+            return None
+    return None
+
+
+class MemberInfo:
+    """
+    What an index knows about an archive member.
+    """
+
+    def __init__(self, name, size, mtime, kind, offset=None):
+        # Name as stored in the archive, which zipfile and tarfile open
+        # the member by.
+        self.name = name
+        self.size = size
+        self.mtime = mtime
+        # "zip" members start after a local header at offset, "tar" ones at
+        # offset, "compressed" ones are read through zipfile or tarfile.
+        self.kind = kind
+        self.offset = offset
+
+
+class ArchiveIndex:
+    """
+    Members and directories of an archive.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.members = {}
+        self.dirs = {""}
+        self.compressed_tar = False
+        if zipfile.is_zipfile(path):
+            self._read_zip()
+        else:
+            self._read_tar()
+
+    @classmethod
+    def get(cls, path):
+        """
+        Get the index of an archive, cached until the archive changes.
+
+        Arguments:
+            path: Archive path.
+
+        Returns:
+            ArchiveIndex.
+
+        Raises:
+            ArchiveError if the archive can't be read, OSError if it
+            can't be opened.
+        """
+        st = os.stat(path)
+        key = (str(Path(path).absolute()), st.st_size, st.st_mtime_ns)
+        with _lock:
+            index = _indexes.get(key)
+            if index is not None:
+                _indexes.move_to_end(key)
+                return index
+        try:
+            index = cls(path)
+        except (zipfile.BadZipFile, tarfile.TarError) as error:
+            raise ArchiveError(
+                f"Can't read archive {path}: {error}"
+            ) from error
+        with _lock:
+            _indexes[key] = index
+            while len(_indexes) > INDEX_LIMIT:
+                _indexes.popitem(last=False)
+        return index
+
+    def _add(self, info):
+        name = member_name(info.name)
+        if not name:
+            return
+        self.members[name] = info
+        for parent in PurePosixPath(name).parents:
+            self.dirs.add("" if parent.name == "" else parent.as_posix())
+
+    def _add_dir(self, name):
+        name = member_name(name)
+        self.dirs.add(name)
+        for parent in PurePosixPath(name).parents:
+            self.dirs.add("" if parent.name == "" else parent.as_posix())
+
+    def _read_zip(self):
+        with zipfile.ZipFile(self.path) as archive:
+            for info in archive.infolist():
+                name = info.filename
+                if info.is_dir():
+                    self._add_dir(name)
+                    continue
+                if info.flag_bits & 0x1:
+                    logger.debug(f"Skipping encrypted {name} in {self.path}")
+                    continue
+                stored = info.compress_type == zipfile.ZIP_STORED
+                self._add(
+                    MemberInfo(
+                        name,
+                        info.file_size,
+                        time.mktime(info.date_time + (0, 0, -1)),
+                        "zip" if stored else "compressed",
+                        info.header_offset if stored else None,
+                    )
+                )
+
+    def _read_tar(self):
+        try:
+            archive = tarfile.open(self.path, "r:")
+        except tarfile.ReadError:
+            # Compressed tar: members can only be decompressed in order.
+            archive = tarfile.open(self.path, "r:*")
+            self.compressed_tar = True
+        with archive:
+            for info in archive:
+                name = info.name
+                if info.isdir():
+                    self._add_dir(name)
+                elif info.isfile():
+                    self._add(
+                        MemberInfo(
+                            name,
+                            info.size,
+                            info.mtime,
+                            "compressed" if self.compressed_tar else "tar",
+                            None if self.compressed_tar else info.offset_data,
+                        )
+                    )
+
+    def listdir(self, directory=""):
+        """
+        List a directory of the archive.
+
+        Arguments:
+            directory: Directory name in the archive, "" for the top.
+
+        Returns:
+            List of (name, is directory, MemberInfo or None).
+        """
+        prefix = f"{directory}/" if directory else ""
+        entries = {}
+        for name in self.dirs:
+            if name.startswith(prefix) and name != directory:
+                child = name[len(prefix) :].split("/")[0]
+                entries[child] = (child, True, None)
+        for name, info in self.members.items():
+            if name.startswith(prefix) and "/" not in name[len(prefix) :]:
+                child = name[len(prefix) :]
+                entries[child] = (child, False, info)
+        return sorted(entries.values())
+
+
+def is_dir(path):
+    """
+    Check whether path is an archive or a directory inside one.
+
+    Arguments:
+        path: Path to check.
+
+    Returns:
+        True if path can be listed with listdir().
+    """
+    if is_archive(path):
+        return True
+    parts = split(path)
+    if parts is None:
+        return False
+    try:
+        return parts[1] in ArchiveIndex.get(parts[0]).dirs
+    except OSError:
+        return False
+
+
+def listdir(path):
+    """
+    List an archive, or a directory inside one.
+
+    Arguments:
+        path: Archive or directory inside an archive.
+
+    Returns:
+        List of (name, is directory, MemberInfo or None), empty if path
+        can't be listed.
+    """
+    parts = (Path(path), "") if is_archive(path) else split(path)
+    if parts is None:
+        return []
+    try:
+        return ArchiveIndex.get(parts[0]).listdir(parts[1])
+    except OSError as error:
+        logger.error(error)
+        return []
+
+
+def walk(path, extensions):
+    """
+    Get the members of an archive, or of a directory inside one, with one
+    of extensions.
+
+    Arguments:
+        path: Archive or directory inside an archive.
+        extensions: Extensions (without dot) to keep.
+
+    Returns:
+        List of Path of members, in name order.
+    """
+    parts = (Path(path), "") if is_archive(path) else split(path)
+    if parts is None:
+        return []
+    archive, directory = parts
+    try:
+        index = ArchiveIndex.get(archive)
+    except OSError as error:
+        logger.error(error)
+        return []
+    prefix = f"{directory}/" if directory else ""
+    return [
+        archive / name
+        for name in sorted(index.members)
+        if name.startswith(prefix)
+        and PurePosixPath(name).suffix.lower().lstrip(".") in extensions
+    ]
+
+
+def read_head(path, size):
+    """
+    Read the start of a member.
+
+    Arguments:
+        path: Path of the member.
+        size: Bytes to read.
+
+    Returns:
+        Up to size bytes.
+
+    Raises:
+        OSError if the member can't be read.
+    """
+    member = ArchiveMember(path)
+    try:
+        return member.read_bytes(0, size)
+    finally:
+        member.close()
+
+
+class ArchiveMember(UserFile):
+    """
+    Archive member read by BASS through BASS_FILEPROCS callbacks.
+
+    Stored members are read with pread from the archive, so seeks cost
+    nothing. Compressed members are decompressed by zipfile or tarfile
+    into blocks of BLOCK bytes, the last CACHE_BLOCKS of which are kept;
+    a seek back past the cache starts decompressing again from the start
+    of the member.
+    """
+
+    def __init__(self, path):
+        """
+        Arguments:
+            path: Path of the member, e.g. batch.zip/day1/a.mp3.
+
+        Raises:
+            FileNotFoundError if there is no such member, ArchiveError if the
+            archive can't be read.
+        """
+        parts = split(path)
+        if parts is None:
+            raise FileNotFoundError(f"{path} is not in an archive")
+        archive, name = parts
+        info = ArchiveIndex.get(archive).members.get(name)
+        if info is None:
+            raise FileNotFoundError(f"No {name} in {archive}")
+        super().__init__(path, info.size)
+        self.archive = archive
+        self.info = info
+        self.fd = None
+        self.offset = None
+        self.blocks = OrderedDict()
+        self._source = None
+        self._member = None
+        self._read_lock = threading.Lock()
+        if info.kind == "compressed":
+            self._open_compressed()
+        else:
+            self.fd = os.open(archive, os.O_RDONLY)
+            self.offset = info.offset
+            if info.kind == "zip":
+                self.offset += self._zip_header_length()
+
+    def _zip_header_length(self):
+        header = os.pread(self.fd, ZIP_LOCAL_HEADER.size, self.info.offset)
+        if len(header) < ZIP_LOCAL_HEADER.size:
+            os.close(self.fd)
+            raise ArchiveError(f"Truncated {self.archive}")
+        fields = ZIP_LOCAL_HEADER.unpack(header)
+        return ZIP_LOCAL_HEADER.size + fields[-2] + fields[-1]
+
+    def _open_compressed(self):
+        try:
+            if zipfile.is_zipfile(self.archive):
+                self._source = zipfile.ZipFile(self.archive)
+                self._member = self._source.open(self.info.name)
+            else:
+                self._source = tarfile.open(self.archive, "r:*")
+                self._member = self._source.extractfile(self.info.name)
+        except (zipfile.BadZipFile, tarfile.TarError, KeyError) as error:
+            if self._source is not None:
+                self._source.close()
+            raise ArchiveError(f"Can't open {self.file}: {error}") from error
+
+    def read_bytes(self, position, length):
+        """
+        Read member bytes.
+
+        Arguments:
+            position: Member offset to read from.
+            length: Bytes to read.
+
+        Returns:
+            Up to length bytes, fewer at the end of the member.
+        """
+        length = max(min(length, self.length - position), 0)
+        if self.offset is not None:
+            return os.pread(self.fd, length, self.offset + position)
+        chunks = []
+        while length > 0:
+            index, start = divmod(position, BLOCK)
+            data = self._block(index)[start : start + length]
+            if not data:
+                break
+            chunks.append(data)
+            position += len(data)
+            length -= len(data)
+        return b"".join(chunks)
+
+    def _block(self, index):
+        with self._read_lock:
+            data = self.blocks.get(index)
+            if data is not None:
+                self.blocks.move_to_end(index)
+                return data
+            try:
+                if self._member.tell() != index * BLOCK:
+                    self._member.seek(index * BLOCK)
+                data = self._member.read(BLOCK)
+            except (zlib.error, zipfile.BadZipFile, EOFError) as error:
+                raise ArchiveError(f"Can't decompress {self.file}: {error}")
+            self.blocks[index] = data
+            while len(self.blocks) > CACHE_BLOCKS:
+                self.blocks.popitem(last=False)
+            return data
+
+    def read(self, position, buffer, length):
+        data = self.read_bytes(position, length)
+        ctypes.memmove(buffer, data, len(data))
+        return len(data)
+
+    def close(self):
+        if self.users > 0:
+            return
+        with self._read_lock:
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
+            if self._source is not None:
+                self._member.close()
+                self._source.close()
+                self._source = None
+            self.blocks.clear()
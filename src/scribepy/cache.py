@@ -0,0 +1,163 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from scribepy import logger
+
+
+def cache_dir(*parts):
+    """
+    Get (and create) a directory inside the scribepy cache.
+
+    The cache root is $SCRIBEPY_CACHE_DIR if set, otherwise
+    $XDG_CACHE_HOME/scribepy (~/.cache/scribepy).
+
+    Arguments:
+        parts: Sub directories to append to the cache root.
+
+    Returns:
+        Path of the cache directory.
+    """
+    root = os.environ.get("SCRIBEPY_CACHE_DIR")
+    if root is None:
+        xdg = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        root = Path(xdg) / "scribepy"
+    path = Path(root, *parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def file_identity(file):
+    """
+    Get the identity of a file as (path, inode, size, mtime).
+
+    Members of archives (see scribepy.archive) are identified by their
+    path and the inode, size and mtime of the archive.
+
+    Arguments:
+        file: File to identify.
+
+    Returns:
+        Tuple (absolute path, inode, size in bytes, mtime in nanoseconds).
+    """
+    path = Path(file).absolute()
+    try:
+        st = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        from scribepy.archive import split
+
+        parts = split(path)
+        if parts is None:
+            raise
+        st = parts[0].stat()
+    return (str(path), st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def file_key(file):
+    """
+    Get a cache key for a file.
+
+    The key changes whenever the file is replaced, resized or modified.
+
+    Arguments:
+        file: File to create key for.
+
+    Returns:
+        Hex digest string usable as a file name.
+    """
+    identity = "\0".join(str(part) for part in file_identity(file))
+    return hashlib.sha1(identity.encode("utf-8", "surrogateescape")).hexdigest()
+
+
+class JsonStore:
+    """
+    A small on-disk key/value store backed by a single JSON file.
+
+    The file is only read on first access and written back atomically.
+    Stores are shared by the player, preload, download and analysis
+    threads, so changes and saves are serialized by a lock.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._data = None
+        self._lock = threading.RLock()
+
+    @property
+    def path(self):
+        return cache_dir() / self.name
+
+    @property
+    def data(self):
+        with self._lock:
+            if self._data is None:
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        self._data = json.load(f)
+                except (OSError, ValueError):
+                    self._data = {}
+            return self._data
+
+    def get(self, key, default=None):
+        """
+        Get value stored under key.
+
+        Arguments:
+            key: Key to look up.
+            default: Value to return if key is missing.
+
+        Returns:
+            Stored value or default.
+        """
+        return self.data.get(key, default)
+
+    def set(self, key, value, save=True):
+        """
+        Store value under key.
+
+        Arguments:
+            key: Key to store value under.
+            value: JSON serializable value.
+            save: Whether to write the store to disk immediately.
+
+        Returns:
+            None.
+        """
+        with self._lock:
+            self.data[key] = value
+            if save:
+                self.save()
+
+    def save(self):
+        """
+        Write the store to disk.
+
+        Returns:
+            True if successful else False.
+        """
+        path = self.path
+        tmp = None
+        with self._lock:
+            try:
+                with tempfile.NamedTemporaryFile(
+                    "w",
+                    encoding="utf-8",
+                    dir=path.parent,
+                    prefix=f".{path.name}.",
+                    suffix=".tmp",
+                    delete=False,
+                ) as f:
+                    tmp = f.name
+                    json.dump(self.data, f)
+                os.replace(tmp, path)
+                return True
+            except OSError as error:
+                logger.exception(error)
+                if tmp is not None:
+                    try:
+                        os.unlink(tmp)
+                    except OSError:
+                        pass
+                return False
@@ -1,14 +1,17 @@
-from scribepy.player import Player
+from scribepy.player import REWIND_SECONDS, Player, registry
+from scribepy.download import is_url
+from scribepy import events
+from scribepy.peaks import PeakLoader
+from scribepy.status import StatusMonitor
+from scribepy.storage import OPEN_AUTO, readahead_stats
+from scribepy.tempo import DEFAULT_PROFILE, TEMPO_RAMP_MS
+from scribepy.transcode import TRANSCODE_BUDGET_MB
 from pathlib import Path
-try:
-    import pyfiglet
-except ImportError:
-    pass
 import shutil
-from time import sleep
 from scribepy.connector import Connector
+from scribepy.keymap import keymap_help
 import subprocess, sys
-from loguru import logger
+from scribepy import logger
 
 def progressBar(
     player,
@@ -19,6 +22,8 @@ def progressBar(
     fill="█",
     printEnd="\r",
     autosize=False,
+    peaks=None,
+    status=None,
 ):
 
     """
@@ -32,13 +37,16 @@ def progressBar(
         length: Length of bar
         fill: Character to fill the bar.
         printEnd: end character (eg '\r\n', '\n')
+        peaks: PeakPyramid of the file, drawn above the bar if given.
+        status: Status of the engine, drawn below the bar if given.
 
     Returns:
         None
     """
 
-    position = player.position
-    total = player.length
+    snapshot = player.snapshot()
+    position = snapshot.position
+    total = snapshot.length
     # Progress Bar Printing Function
     def printProgressBar(position, length=length):
         percent = ("{0:." + str(decimals) + "f}").format(
@@ -50,14 +58,20 @@ def progressBar(
             cols, _ = shutil.get_terminal_size(fallback=(length, 1))
             length = cols - len(styling)
 
+        if peaks is not None:
+            # Overview of the whole file, aligned with the bar.
+            print(f"{' ' * (len(prefix) + 2)}{peaks.render(length)}")
+
         filledLength = int(length * position // total)
         bar = fill * filledLength + "-" * (length - filledLength)
         # print(f'\r{prefix} |{bar}| {percent}% {suffix}', end = printEnd)
         print(f"\r{styling.replace(fill, bar)}", end="\r")
         print()
-        timer = f"{player.position_time}/{player.length_time}"
+        timer = f"{snapshot.position_time}/{snapshot.length_time}"
         timer_pos = len(timer) + len(bar)
         print(f"{timer:>{timer_pos}}")
+        if status is not None:
+            print(f"{' ' * (len(prefix) + 2)}{status.meter()}")
 
     # Update Progress Bar
     if position <= total:
@@ -65,30 +79,84 @@ def progressBar(
     # Print New Line on Complete
     print()
 
-def play_file(file):
+def play_file(
+    file,
+    precise_seek=False,
+    rewind_seconds=0,
+    gapless=False,
+    tempo_profile=DEFAULT_PROFILE,
+    tempo_ramp=TEMPO_RAMP_MS,
+    skip_silence=0,
+    dsp=None,
+    normalize=False,
+    low_latency=False,
+    open_mode=OPEN_AUTO,
+    transcode_cache=0,
+    keymap=None,
+    waveform=False,
+):
     """
     Play file from the command line.
 
     Arguments:
-        file: File to play.
+        file: File, directory, M3U playlist or http(s) URL to play.
+        precise_seek: Whether to seek MP3/AAC files through a seek table.
+        rewind_seconds: Seconds of audio kept in memory for rewinds, 0
+            disables, REWIND_SECONDS if None.
+        gapless: Whether to play files through one mixer stream, so
+            playlists play without gaps (needs BASSmix).
+        tempo_profile: Name of the time stretching profile.
+        tempo_ramp: Milliseconds tempo changes are slid over.
+        skip_silence: Shortest silence skipped in seconds, 0 disables.
+        dsp: Name of a scribepy.dsp preset to process audio with.
+        normalize: Whether to apply a per file loudness gain.
+        low_latency: Whether to play through short low latency buffers.
+        open_mode: How files are handed to BASS, see scribepy.storage.
+        transcode_cache: Size budget in MB of the audio extracted from
+            video files, 0 disables, TRANSCODE_BUDGET_MB if None.
+        keymap: Keymap file, see scribepy.keymap.
+        waveform: Whether to draw a waveform overview above the progress
+            bar, analysing the peaks of every file played.
 
     Returns:
         None
     """
 
-    KEYBINDS = """
-    F2 - Rewind (-10)           F3 - Increase tempo
-    F4 - Pause                  F5 - Restore tempo
-    F6 - Fast Forward (+10)     F7 - Rewind (-2)
-    F8 - Fast Forward (+2)      F9 - Toggle play/pause
-    F11 - Decrease Tempo
-    """
+    try:
+        import pyfiglet
+    except ImportError:
+        pass
 
-    player = Player()
-    connector = Connector()
+    if rewind_seconds is None:
+        rewind_seconds = REWIND_SECONDS
+    if transcode_cache is None:
+        transcode_cache = TRANSCODE_BUDGET_MB
+    player = Player(
+        precise_seek=precise_seek,
+        rewind_seconds=rewind_seconds,
+        gapless=gapless,
+        tempo_profile=tempo_profile,
+        tempo_ramp=tempo_ramp,
+        skip_silence=skip_silence,
+        normalize=normalize,
+        low_latency=low_latency,
+        open_mode=open_mode,
+        transcode_budget=int(transcode_cache * (1 << 20)),
+    )
+    peaks = PeakLoader() if waveform else None
+    if dsp:
+        from scribepy.dsp import PRESETS
+
+        if dsp not in PRESETS:
+            sys.exit(f"Unknown DSP preset {dsp}, use one of {list(PRESETS)}")
+        player.set_dsp(PRESETS[dsp]())
+    monitor = StatusMonitor(player).start()
+    connector = Connector(keymap)
     connector.set_player(player)
     connector.player_play(file)
+    keybinds = keymap_help(connector.keymap)
 
+    playing = True
     while True:
         try:
             subprocess.call("clear")
@@ -101,12 +169,50 @@ def play_file(file):
                 print("                                         SCRIBEPY")
             print("Playing: ")
             print()
-            print(Path(file).absolute())
+            current = player.file or file
+            print(current if is_url(current) else Path(current).absolute())
             print()
-            progressBar(connector.player, autosize=True)
-            print(KEYBINDS)
+            progressBar(
+                connector.player,
+                autosize=True,
+                peaks=(
+                    peaks.get(player.file)
+                    if peaks is not None and not is_url(current)
+                    else None
+                ),
+                status=monitor.status,
+            )
+            print(keybinds)
             print("\nPress Ctrl-c to exit")
-            sleep(0.1)
+
+            # Redraw every 100ms while playing, otherwise sleep until the
+            # player reports something (play, seek, ...).
+            event = player.events.get(timeout=0.1 if playing else None)
+            while event is not None:
+                if connector.playlist is not None:
+                    connector.playlist.handle(event)
+                if event.name == events.PLAYING:
+                    playing = True
+                elif event.name in (events.PAUSED, events.ENDED):
+                    playing = False
+                event = player.events.get(timeout=0)
         except KeyboardInterrupt as error:
+            registry.learned.save()
+            reports = [
+                f"Decoder open latency:\n{registry.report()}",
+                f"Stream handles: {player.handles.report()}",
+            ]
+            if player.dsp is not None:
+                reports.append(f"DSP callback: {player.dsp.report()}")
+            reports.append(f"Key press latency:\n{connector.latency_report()}")
+            reports.append(f"Key dispatch: {connector.dispatch_report()}")
+            if readahead_stats.reads:
+                reports.append(f"Readahead: {readahead_stats.report()}")
+            # Printed whatever the log level, -L without -P only logs
+            # warnings to stderr.
+            print(file=sys.stderr)
+            for report in reports:
+                logger.info(report)
+                print(report, file=sys.stderr)
             sys.exit("\nExiting scribepy!!!")
 
@@ -0,0 +1,130 @@
+from scribepy.pybass.pybass import (
+    BASS_CHANNELINFO,
+    BASS_ChannelGetInfo,
+    BASS_ChannelGetLength,
+    BASS_ChannelGetPosition,
+    BASS_POS_BYTE,
+    BASS_SAMPLE_8BITS,
+    BASS_SAMPLE_FLOAT,
+)
+
+
+def format_time(seconds):
+    """
+    Format seconds in human readable format (MM:SS).
+
+    Arguments:
+        seconds: Seconds to format.
+
+    Returns:
+        Formatted time string.
+    """
+    seconds = max(seconds, 0)
+    return f"{int(seconds // 60):02}:{int(seconds % 60):02}"
+
+
+class ClockSnapshot:
+    """
+    Playback position and every value derived from it at one instant.
+    """
+
+    __slots__ = ("position", "length")
+
+    def __init__(self, position, length):
+        self.position = position
+        self.length = length
+
+    @property
+    def remaining(self):
+        return max(self.length - self.position, 0.0)
+
+    @property
+    def fraction(self):
+        return self.position / self.length if self.length > 0 else 0.0
+
+    @property
+    def percent(self):
+        return 100 * self.fraction
+
+    @property
+    def position_time(self):
+        return format_time(self.position)
+
+    @property
+    def length_time(self):
+        return format_time(self.length)
+
+    @property
+    def remaining_time(self):
+        return format_time(self.remaining)
+
+
+class PlaybackClock:
+    """
+    Per stream constants needed to turn a byte position into time.
+
+    Channel info, length and bytes per second are read once when the clock
+    is created, so sampling the clock costs a single BASS call.
+
+    A stream opened part way into a file starts at offset seconds, and
+    length can be given when BASS can only estimate it. Mixer sources read
+    their position with get_position (BASS_Mixer_ChannelGetPosition).
+    """
+
+    def __init__(self, handle, offset=0.0, length=None, get_position=None):
+        self.handle = handle
+        self.offset = offset
+        self.get_position = get_position or BASS_ChannelGetPosition
+        self.info = BASS_CHANNELINFO()
+        BASS_ChannelGetInfo(handle, self.info)
+
+        if self.info.flags & BASS_SAMPLE_FLOAT:
+            sample_size = 4
+        elif self.info.flags & BASS_SAMPLE_8BITS:
+            sample_size = 1
+        else:
+            sample_size = 2
+        self.bytes_per_second = self.info.freq * self.info.chans * sample_size
+
+        self.length_bytes = BASS_ChannelGetLength(handle, BASS_POS_BYTE)
+        if length is None:
+            length = self.seconds(self.length_bytes)
+        self.length = length
+
+    def seconds(self, position_bytes):
+        """
+        Convert a byte position of the stream to seconds.
+
+        Arguments:
+            position_bytes: Position in bytes.
+
+        Returns:
+            Position in seconds.
+        """
+        if not self.bytes_per_second or position_bytes < 0:
+            return self.offset
+        return self.offset + position_bytes / self.bytes_per_second
+
+    def bytes(self, seconds):
+        """
+        Convert seconds to a byte position of the stream, aligned to a frame.
+
+        Arguments:
+            seconds: Position in seconds.
+
+        Returns:
+            Position in bytes.
+        """
+        frame = self.bytes_per_second // max(self.info.freq, 1) or 1
+        seconds = max(seconds - self.offset, 0)
+        return int(seconds * self.bytes_per_second) // frame * frame
+
+    def sample(self):
+        """
+        Read the stream position once.
+
+        Returns:
+            ClockSnapshot of the current position.
+        """
+        position = self.get_position(self.handle, BASS_POS_BYTE)
+        return ClockSnapshot(self.seconds(position), self.length)
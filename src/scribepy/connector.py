@@ -1,49 +1,107 @@
-from pynput import keyboard
+import queue
+import threading
+from time import perf_counter
+
+from scribepy import logger
+from scribepy.keymap import COMMANDS, load_keymap
+from scribepy.latency import LatencyHistogram
+from scribepy.playlist import Playlist
+
+# Key events of one command less than this many milliseconds apart, queued
+# while the player was busy (auto-repeat of a held key), are merged into
+# one player call.
+COALESCE_MS = 50
+
+
+def key_name(key):
+    """
+    Get the keymap name of a pynput key.
+
+    Arguments:
+        key: pynput Key or KeyCode.
+
+    Returns:
+        Name like "f6", character of character keys, None if unknown.
+    """
+    return getattr(key, "name", None) or getattr(key, "char", None)
+
 
 class Connector:
     """
     A class to interact with the pynput module.
+
+    Key presses are looked up in a keymap (see scribepy.keymap) and queued
+    by the listener thread; a dispatcher thread makes the player calls.
     """
 
-    def __init__(self):
+    def __init__(self, keymap=None):
+        """
+        Arguments:
+            keymap: Keymap file, the one in the config directory if None.
+        """
         self.player = None
+        self.playlist = None
+        self.keymap = load_keymap(keymap)
+        self.latency = LatencyHistogram()
+        # Bound key events received, and player calls made for them.
+        self.received = 0
+        self.executed = 0
+        self._queue = queue.Queue()
+        self._dispatcher = None
 
     def on_press(self, key):
         """
-        Map keybindings to player functions.
+        Queue the command bound to key for the dispatcher thread.
 
         Returns:
             None.
         """
+        start = perf_counter()
+        name = key_name(key)
+        binding = self.keymap.get(name)
+        if binding is not None:
+            self.received += 1
+            self._queue.put((name, binding, start))
+
+    def _dispatch(self):
+        """
+        Make the player calls of queued key events, merging bursts of one
+        command (see COALESCE_MS).
 
-        if key == keyboard.Key.f2:
-            self.player.seek(-10)
-
-        if key == keyboard.Key.f3:
-            self.player.change_tempo(4)
-
-        if key == keyboard.Key.f4:
-            if self.player.isPlaying():
-                self.player.pause()
-                self.player.seek(-2)
-
-        if key == keyboard.Key.f5:
-            self.player.restore_tempo()
-
-        if key == keyboard.Key.f6:
-            self.player.seek(10)
-
-        if key == keyboard.Key.f7:
-            self.player.seek(-2)
-
-        if key == keyboard.Key.f8:
-            self.player.seek(2)
-
-        if key == keyboard.Key.f9:
-            self.player.play()
-
-        if key == keyboard.Key.f11:
-            self.player.change_tempo(-4)
+        The time from each key event to the completed player call is
+        recorded in self.latency per key.
+        """
+        event = None
+        while True:
+            if event is None:
+                event = self._queue.get()
+            presses = [event]
+            command, argument = event[1]
+            function, coalesce = COMMANDS[command]
+            event = None
+            while coalesce:
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if (
+                    event[1][0] != command
+                    or (event[2] - presses[-1][2]) * 1000 > COALESCE_MS
+                ):
+                    break
+                argument += event[1][1]
+                presses.append(event)
+                event = None
+
+            # Opposite commands can cancel out.
+            if not coalesce or argument:
+                try:
+                    function(self.player, argument)
+                except Exception as error:
+                    logger.exception(error)
+                self.executed += 1
+            for name, _, start in presses:
+                self.latency.time(name, start)
 
     def run(self):
         """
@@ -52,11 +110,42 @@ class Connector:
         Returns:
             None.
         """
+        from pynput import keyboard
+
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(
+                target=self._dispatch, daemon=True
+            )
+            self._dispatcher.start()
         listener = keyboard.Listener(
             on_press=self.on_press,
         )
         listener.start()
 
+    def latency_report(self):
+        """
+        Key press latency histogram, with the output latency of the player
+        added to get the time until the change is heard.
+
+        Returns:
+            Report as a multi line string.
+        """
+        extra = self.player.output_latency if self.player else 0
+        return self.latency.report(extra)
+
+    def dispatch_report(self):
+        """
+        Key events received versus player calls made for them.
+
+        Returns:
+            Report as a string.
+        """
+        merged = self.received - self.executed
+        return (
+            f"{self.received} key events, {self.executed} player calls "
+            f"({merged} merged or cancelled out)"
+        )
+
     def set_player(self, player):
         """
         Set connector attribute player.
@@ -86,14 +175,14 @@ class Connector:
         Play connector channel stream.
 
         Arguments:
-            file: File to play.
+            file: File, directory or M3U playlist to play.
         Returns:
             None if successfull, Error message if fails.
         """
-        stream = self.player.create_file_stream(file)
+        self.playlist = Playlist(self.player, [file])
+        stream = self.playlist.play()
         if stream is None:
             self.run()
-            self.player.play()
             return None
         else:
             return stream["error"]
@@ -0,0 +1,180 @@
+"""
+Any file the player supports decoded to NumPy float32 blocks, for audio
+analysis outside the player.
+
+    from scribepy.decode import iter_blocks
+
+    for block in iter_blocks("interview.mp3", 1.0, rate=16000):
+        ...
+
+Files are opened through the player's decoder registry (so archive
+members and every BASS add-on work), as decoding channels of float
+samples. Each BASS_ChannelGetData call fills the same preallocated array,
+and the blocks yielded are views of it: a block is only valid until the
+next one is read, copy it to keep it. BASS needs a player, or BASS_Init,
+before files can be decoded.
+"""
+
+from pathlib import Path
+
+from scribepy import logger
+
+BASS_DATA_ERROR = 0xFFFFFFFF
+
+
+def _open(path, flags):
+    from scribepy.player import registry
+    from scribepy.pybass.pybass import BASS_ErrorGetCode, get_error_description
+
+    stream, decoder = registry.open(Path(path), flags)
+    if not stream:
+        raise OSError(
+            f"Can't decode {path}: "
+            f"{get_error_description(BASS_ErrorGetCode())}"
+        )
+    logger.debug(f"Decoding {path} with {decoder.name}")
+    return stream
+
+
+def file_format(path):
+    """
+    Get the format a file decodes to.
+
+    Arguments:
+        path: File to probe.
+
+    Returns:
+        Dictionary with rate (Hz), channels and seconds.
+
+    Raises:
+        FileNotFoundError if there is no such file, OSError if it can't be
+        decoded.
+    """
+    from scribepy.pybass.pybass import (
+        BASS_CHANNELINFO,
+        BASS_ChannelBytes2Seconds,
+        BASS_ChannelGetInfo,
+        BASS_ChannelGetLength,
+        BASS_POS_BYTE,
+        BASS_SAMPLE_FLOAT,
+        BASS_STREAM_DECODE,
+        BASS_StreamFree,
+    )
+
+    stream = _open(path, BASS_STREAM_DECODE | BASS_SAMPLE_FLOAT)
+    try:
+        info = BASS_CHANNELINFO()
+        BASS_ChannelGetInfo(stream, info)
+        seconds = BASS_ChannelBytes2Seconds(
+            stream, BASS_ChannelGetLength(stream, BASS_POS_BYTE)
+        )
+    finally:
+        BASS_StreamFree(stream)
+    return {"rate": info.freq, "channels": info.chans, "seconds": seconds}
+
+
+def _resampler(stream, rate, chans):
+    """
+    Get a decoding mixer playing stream at rate with chans channels.
+
+    The mixer frees stream when it is freed.
+    """
+    from scribepy.pybass.pybass import (
+        BASS_SAMPLE_FLOAT,
+        BASS_STREAM_AUTOFREE,
+        BASS_STREAM_DECODE,
+        BASS_StreamFree,
+    )
+    from scribepy.pybass.pybassmix import (
+        BASS_MIXER_DOWNMIX,
+        BASS_MIXER_END,
+        BASS_MIXER_NORAMPIN,
+        BASS_Mixer_StreamAddChannel,
+        BASS_Mixer_StreamCreate,
+    )
+
+    try:
+        mixer = BASS_Mixer_StreamCreate(
+            rate,
+            chans,
+            BASS_STREAM_DECODE | BASS_SAMPLE_FLOAT | BASS_MIXER_END,
+        )
+    except OSError as error:
+        BASS_StreamFree(stream)
+        raise OSError(f"Resampling needs BASSmix: {error}") from error
+    if not mixer or not BASS_Mixer_StreamAddChannel(
+        mixer,
+        stream,
+        BASS_MIXER_DOWNMIX | BASS_MIXER_NORAMPIN | BASS_STREAM_AUTOFREE,
+    ):
+        BASS_StreamFree(mixer)
+        BASS_StreamFree(stream)
+        raise OSError(f"Can't resample to {rate} Hz")
+    return mixer
+
+
+def iter_blocks(path, block_seconds, mono=True, rate=None):
+    """
+    Decode a file to blocks of float32 samples.
+
+    Arguments:
+        path: File to decode, any file the player can open.
+        block_seconds: Length of the blocks in seconds, the last one can
+            be shorter.
+        mono: Whether to downmix to one channel.
+        rate: Sample rate to resample to (needs BASSmix), None keeps the
+            rate of the file (see file_format).
+
+    Yields:
+        1-D arrays of samples when mono, else arrays of frames x channels.
+        Every block is a view of one buffer, overwritten by the next.
+
+    Raises:
+        FileNotFoundError if there is no such file, OSError if it can't be
+        decoded or resampled.
+    """
+    import numpy as np
+    from scribepy.pybass.pybass import (
+        BASS_CHANNELINFO,
+        BASS_ChannelGetData,
+        BASS_ChannelGetInfo,
+        BASS_SAMPLE_FLOAT,
+        BASS_SAMPLE_MONO,
+        BASS_STREAM_DECODE,
+        BASS_StreamFree,
+    )
+
+    # BASS_SAMPLE_MONO makes the MP3 decoder skip the second channel,
+    # other decoders ignore it and are downmixed below.
+    flags = BASS_STREAM_DECODE | BASS_SAMPLE_FLOAT
+    stream = _open(path, flags | BASS_SAMPLE_MONO if mono else flags)
+    info = BASS_CHANNELINFO()
+    BASS_ChannelGetInfo(stream, info)
+    chans = info.chans
+    if rate and rate != info.freq:
+        chans = 1 if mono else chans
+        stream = _resampler(stream, rate, chans)
+    frames = max(int((rate or info.freq) * block_seconds), 1)
+
+    try:
+        block = np.empty((frames, chans), np.float32)
+        downmix = np.empty(frames, np.float32) if mono else None
+        while True:
+            read = BASS_ChannelGetData(stream, block.ctypes.data, block.nbytes)
+            if read == BASS_DATA_ERROR or not read:
+                break
+            count = read // (4 * chans)
+            if not mono:
+                yield block[:count]
+            elif chans == 1:
+                yield block[:count, 0]
+            else:
+                # Channel by channel in place, faster than sum(axis=1).
+                out = downmix[:count]
+                np.copyto(out, block[:count, 0])
+                for channel in range(1, chans):
+                    np.add(out, block[:count, channel], out=out)
+                out *= 1 / chans
+                yield out
+    finally:
+        BASS_StreamFree(stream)
@@ -0,0 +1,501 @@
+"""
+Playback of http(s) URLs through BASS_StreamCreateURL, with a local copy.
+
+BASS hands every block it downloads to a DOWNLOADPROC, which appends it to
+a partial file in the download cache. Once the download is complete the
+partial file becomes the cached copy of the URL, and the URL is played
+from it from then on, so replays and seeks after the first listen never
+hit the server again. A download cut short (the file closed before its
+end, a network error) keeps its partial file. The next open plays that
+file through BASS_FILEPROCS callbacks while a background thread fetches
+the missing bytes with a Range request, so no byte is downloaded twice.
+"""
+
+import ctypes
+import hashlib
+import os
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path, PurePosixPath
+from urllib.parse import urlsplit
+
+from scribepy import logger
+from scribepy.cache import JsonStore, cache_dir
+from scribepy.storage import UserFile
+from scribepy.pybass.pybass import (
+    BASS_ChannelGetTags,
+    BASS_ChannelSetSync,
+    BASS_ErrorGetCode,
+    BASS_StreamCreateURL,
+    BASS_SYNC_FREE,
+    BASS_SYNC_ONETIME,
+    BASS_TAG_HTTP,
+    DOWNLOADPROC,
+    SYNCPROC,
+    get_error_description,
+)
+
+URL_SCHEMES = ("http://", "https://")
+# Bytes copied per read when resuming a download.
+CHUNK = 1 << 16
+# Seconds a resume request may wait for the server.
+TIMEOUT = 30
+
+download_store = JsonStore("downloads.json")
+
+# Downloads in progress by URL key, and finished ones whose callbacks (which
+# can't be destroyed while they run) are kept until the next open.
+_active = {}
+_finished = []
+_lock = threading.Lock()
+
+
+def is_url(file):
+    """
+    Check whether file is an http(s) URL rather than a path.
+
+    Arguments:
+        file: Path or string.
+
+    Returns:
+        True if file is an http or https URL.
+    """
+    return isinstance(file, str) and file.lower().startswith(URL_SCHEMES)
+
+
+def url_key(url):
+    """
+    Get the cache key of a URL.
+
+    Arguments:
+        url: http(s) URL.
+
+    Returns:
+        Hex digest string usable as a file name.
+    """
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def http_headers(stream):
+    """
+    Get the response headers of a URL stream.
+
+    Arguments:
+        stream: Stream created by BASS_StreamCreateURL.
+
+    Returns:
+        Dictionary of lower case header name to value.
+    """
+    headers = {}
+    address = BASS_ChannelGetTags(stream, BASS_TAG_HTTP)
+    while address:
+        line = ctypes.string_at(address)
+        if not line:
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if value:
+            headers[name.strip().lower()] = value.strip()
+        address += len(line) + 1
+    return headers
+
+
+class DownloadCache:
+    """
+    Local copies of URLs, complete or partial, in the download cache.
+    """
+
+    def __init__(self, store=download_store, directory=None):
+        """
+        Arguments:
+            store: JsonStore of what is known about each URL.
+            directory: Directory of the copies, cache_dir("downloads") if
+                None.
+        """
+        self.store = store
+        self.directory = directory
+
+    def path(self, url):
+        """
+        Get the path of the complete copy of url, which keeps the
+        extension of the URL so the decoder registry can use it.
+        """
+        directory = Path(self.directory or cache_dir("downloads"))
+        suffix = PurePosixPath(urlsplit(url).path).suffix[:10]
+        return directory / f"{url_key(url)}{suffix}"
+
+    def partial(self, url):
+        # Keeps the extension too, the decoder registry opens the file.
+        path = self.path(url)
+        return path.with_name(f"{path.stem}.part{path.suffix}")
+
+    def lookup(self, url):
+        """
+        Get the complete copy of url.
+
+        Arguments:
+            url: http(s) URL.
+
+        Returns:
+            Path of the copy, None if url isn't fully downloaded yet.
+        """
+        path = self.path(url)
+        entry = self.store.get(url_key(url))
+        if entry is None or not entry.get("complete") or not path.exists():
+            return None
+        return path
+
+    def open(self, url, flags):
+        """
+        Stream url with BASS, copying it to the cache as it downloads.
+
+        When a partial copy of known length exists, it is played while the
+        rest is downloaded instead (see open_partial).
+
+        Arguments:
+            url: http(s) URL.
+            flags: BASS_StreamCreateURL flags.
+
+        Returns:
+            Stream handle, 0 if BASS can't open url.
+        """
+        key = url_key(url)
+        with _lock:
+            _finished.clear()
+            busy = key in _active
+        entry = self.store.get(key) or {}
+        download = None
+        if busy:
+            logger.debug(f"{url} is already being downloaded")
+        elif self.partial(url).exists() and entry.get("length"):
+            return self.open_partial(url, flags, entry["length"])
+        else:
+            # Without a length the partial copy can't be played, it is
+            # downloaded again from the start.
+            download = Download(self, url)
+
+        proc = download.proc if download is not None else DOWNLOADPROC()
+        stream = BASS_StreamCreateURL(
+            url.encode("utf-8"), 0, flags, proc, None
+        )
+        if not stream:
+            logger.error(
+                f"BASS_StreamCreateURL error "
+                f"{get_error_description(BASS_ErrorGetCode())}"
+            )
+            if download is not None:
+                download.abort()
+            return 0
+        if download is not None:
+            # The length tells when the copy is complete, the validators
+            # let If-Range resume it later. BASS_FILEPOS_END can't be used,
+            # it leaves out headers (of WAV files for one).
+            headers = http_headers(stream)
+            length = headers.get("content-length", "")
+            self.store.set(
+                key,
+                {
+                    "url": url,
+                    "complete": False,
+                    "length": int(length) if length.isdigit() else None,
+                    "etag": headers.get("etag"),
+                    "last_modified": headers.get("last-modified"),
+                },
+            )
+            download.attach(stream)
+        return stream
+
+    def finish(self, url, size, ended):
+        """
+        Make the partial copy of url the complete one if it has every byte.
+
+        Arguments:
+            url: http(s) URL.
+            size: Bytes in the partial copy.
+            ended: Whether the download reached its end, the only way to
+                tell a copy is complete when the length is unknown.
+
+        Returns:
+            True if the copy is complete.
+        """
+        key = url_key(url)
+        entry = self.store.get(key) or {"url": url}
+        length = entry.get("length")
+        if (length is None and not ended) or (length and size != length):
+            logger.debug(f"{url}: {size} of {length} B downloaded")
+            return False
+        os.replace(self.partial(url), self.path(url))
+        self.store.set(key, dict(entry, complete=True, length=size))
+        logger.info(f"Downloaded {url} to {self.path(url)}")
+        return True
+
+    def open_partial(self, url, flags, length):
+        """
+        Play the partial copy of url while the rest of it is downloaded
+        with a Range request.
+
+        Arguments:
+            url: http(s) URL.
+            flags: BASS_StreamCreateFile flags.
+            length: Bytes of the complete copy.
+
+        Returns:
+            Stream handle, 0 if no decoder can open the copy.
+        """
+        from scribepy.player import registry
+
+        partial = self.partial(url)
+        reader = PartialFile(partial, length)
+        self.resume_in_background(url, reader)
+        stream, decoder = registry.open(partial, flags, reader)
+        if not stream:
+            reader.close()
+            return 0
+        logger.debug(
+            f"Playing {url} from {partial} with {decoder.name} while it "
+            f"is resumed"
+        )
+        return stream
+
+    def resume(self, url, reader=None):
+        """
+        Download the rest of the partial copy of url with a Range request.
+
+        Servers ignoring the range, or whose file changed since the copy
+        was started (If-Range), send the whole file, which replaces the
+        copy.
+
+        Arguments:
+            url: http(s) URL.
+            reader: PartialFile told about every byte written.
+
+        Returns:
+            True if the copy is complete.
+        """
+        partial = self.partial(url)
+        offset = partial.stat().st_size
+        entry = self.store.get(url_key(url)) or {}
+        headers = {"Range": f"bytes={offset}-"}
+        validator = entry.get("etag") or entry.get("last_modified")
+        if validator:
+            headers["If-Range"] = validator
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+                mode = "wb"
+                total = response.headers.get("Content-Length")
+                if response.status == 206:
+                    # Content-Range: bytes start-end/total
+                    span, _, total = response.headers.get(
+                        "Content-Range", ""
+                    ).partition("/")
+                    if span.split()[-1].split("-")[0] != str(offset):
+                        logger.error(f"{url}: unexpected range {span}")
+                        return False
+                    mode = "ab"
+                with open(partial, mode) as f:
+                    while True:
+                        if reader is not None:
+                            f.flush()
+                            reader.progress(f.tell())
+                        chunk = response.read(CHUNK)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                if total and total.isdigit():
+                    entry["length"] = int(total)
+                self.store.set(url_key(url), dict(entry, url=url))
+        except (OSError, urllib.error.URLError) as error:
+            logger.error(f"Resuming {url} failed: {error}")
+            return False
+        logger.debug(
+            f"Resumed {url} from {offset} B"
+            if mode == "ab"
+            else f"Downloaded {url} again, the server sent all of it"
+        )
+        return self.finish(url, partial.stat().st_size, True)
+
+    def resume_in_background(self, url, reader=None):
+        """
+        Resume the partial copy of url on a worker thread.
+
+        Arguments:
+            url: http(s) URL.
+            reader: PartialFile playing the copy meanwhile.
+
+        Returns:
+            None.
+        """
+        key = url_key(url)
+        with _lock:
+            if key in _active:
+                return
+            _active[key] = None
+
+        def work():
+            try:
+                self.resume(url, reader)
+            finally:
+                with _lock:
+                    _active.pop(key, None)
+                if reader is not None:
+                    reader.progress(None)
+
+        threading.Thread(target=work, daemon=True).start()
+
+
+class PartialFile(UserFile):
+    """
+    Partial copy of a URL read by BASS through BASS_FILEPROCS callbacks
+    while it is resumed. Reads past the bytes written so far wait for
+    them.
+    """
+
+    def __init__(self, path, length):
+        """
+        Arguments:
+            path: Partial copy.
+            length: Bytes of the complete copy.
+        """
+        self.fd = os.open(path, os.O_RDONLY)
+        super().__init__(path, length)
+        self.available = os.fstat(self.fd).st_size
+        self.done = False
+        self._cond = threading.Condition()
+
+    def progress(self, available):
+        """
+        Tell readers how many bytes of the copy are written.
+
+        Arguments:
+            available: Bytes written, None once the resume stopped.
+
+        Returns:
+            None.
+        """
+        with self._cond:
+            if available is None:
+                self.done = True
+            else:
+                self.available = available
+            self._cond.notify_all()
+
+    def read(self, position, buffer, length):
+        end = min(position + length, self.length)
+        with self._cond:
+            while self.available < end and not self.done:
+                self._cond.wait()
+            end = min(end, self.available)
+        if end <= position:
+            return 0
+        data = os.pread(self.fd, end - position, position)
+        ctypes.memmove(buffer, data, len(data))
+        return len(data)
+
+    def close(self):
+        if self.users > 0 or self.fd is None:
+            return
+        os.close(self.fd)
+        self.fd = None
+
+
+class Download:
+    """
+    A DOWNLOADPROC appending what BASS downloads to the partial copy of a
+    URL, and a BASS_SYNC_FREE sync closing it when the stream is freed.
+    """
+
+    def __init__(self, cache, url):
+        self.cache = cache
+        self.url = url
+        self.key = url_key(url)
+        self.stream = 0
+        self.written = 0
+        self.ended = False
+        self.file = open(cache.partial(url), "wb")
+        self.proc = DOWNLOADPROC(self._on_data)
+        self._sync = SYNCPROC(self._on_free)
+        with _lock:
+            _active[self.key] = self
+
+    def attach(self, stream):
+        """
+        Follow the stream downloading the URL.
+
+        Arguments:
+            stream: Stream created with self.proc.
+
+        Returns:
+            None.
+        """
+        self.stream = stream
+        if self.file is None:
+            # Small files can be downloaded before BASS returns the stream.
+            self._finish(self.ended)
+            return
+        if not BASS_ChannelSetSync(
+            stream, BASS_SYNC_FREE | BASS_SYNC_ONETIME, 0, self._sync, None
+        ):
+            # The file would never be closed, stop copying right away.
+            self.close()
+
+    def _on_data(self, buffer, length, user):
+        if self.file is None:
+            return
+        if not buffer:
+            self.close(ended=True)
+            return
+        with _lock:
+            if self.file is not None:
+                self.file.write(ctypes.string_at(buffer, length))
+                self.written += length
+
+    def _on_free(self, sync, channel, data, user):
+        self.close()
+
+    def close(self, ended=False):
+        """
+        Close the partial copy, completing it if every byte is there.
+
+        Arguments:
+            ended: Whether BASS reached the end of the download.
+
+        Returns:
+            None.
+        """
+        with _lock:
+            if self.file is None:
+                return
+            self.file.close()
+            self.file = None
+            _active.pop(self.key, None)
+            _finished.append(self)
+        if not self.stream:
+            # The headers aren't stored yet, attach() finishes.
+            self.ended = ended
+            return
+        self._finish(ended)
+
+    def _finish(self, ended):
+        try:
+            self.cache.finish(self.url, self.written, ended)
+        except OSError as error:
+            logger.error(f"Caching {self.url} failed: {error}")
+
+    def abort(self):
+        """
+        Drop the partial copy of a download that never started.
+
+        Returns:
+            None.
+        """
+        with _lock:
+            if self.file is None:
+                return
+            self.file.close()
+            self.file = None
+            _active.pop(self.key, None)
+        self.cache.partial(self.url).unlink(missing_ok=True)
+
+
+download_cache = DownloadCache()
@@ -0,0 +1,469 @@
+"""
+DSP chain run on the played channel through a single BASS_ChannelSetDSP
+callback.
+
+BASS hands the callback float samples (BASS_CONFIG_FLOATDSP), which are
+wrapped as a NumPy array without copying and processed in place by each
+stage in order. Stages keep their filter state and work buffers in arrays
+allocated by setup(), and write into them with out= arguments, so blocks
+are processed without allocating.
+"""
+
+import ctypes
+import math
+import threading
+from array import array
+from time import perf_counter
+
+import numpy as np
+
+from scribepy import logger
+
+# Largest |a| ** -n (as a natural log) allowed when running a one pole
+# filter in closed form, blocks are split so the powers stay inside float64
+# range. Rounding error doesn't grow with it, only overflow is a concern.
+MAX_GROWTH = 500.0
+# Callback timings kept for the report.
+TIMINGS = 512
+# Longest block work buffers are allocated for by setup(), in seconds. A
+# longer block grows them once.
+BLOCK_SECONDS = 0.5
+
+
+def one_pole(x, a, state, powers, out=None, work=None):
+    """
+    Run y[n] = x[n] + a * y[n - 1] over the first axis of x, vectorized.
+
+    Within a chunk y[k] = a ** k * (a * y[-1] + cumsum(x[j] / a ** j)),
+    chunks are short enough for a ** -k not to overflow.
+
+    Arguments:
+        x: Input array, frames along axis 0.
+        a: Pole, real or complex, 0 < |a| < 1.
+        state: Last output per channel, updated in place.
+        powers: Dictionary caching a ** arange(n), repeated for every
+            channel, per chunk length n.
+        out: Array of x's shape to write the output to, allocated if None.
+            May be x itself.
+        work: Scratch array like out, allocated if None.
+
+    Returns:
+        Output array.
+    """
+    dtype = np.result_type(x, a, state)
+    if out is None:
+        out = np.empty(x.shape, dtype)
+    if abs(a) < 1e-12:
+        out[...] = x
+        state[...] = x[-1]
+        return out
+    if work is None:
+        work = np.empty(x.shape, dtype)
+    chunk = max(int(MAX_GROWTH / -math.log(abs(a))), 1)
+    for start in range(0, len(x), chunk):
+        segment = x[start : start + chunk]
+        n = len(segment)
+        power = powers.get(n)
+        if power is None:
+            # Repeated rather than broadcast, broadcasting ufuncs allocate.
+            power = powers[n] = np.broadcast_to(
+                (a ** np.arange(n))[:, None], segment.shape
+            ).copy()
+        scratch = work[start : start + n]
+        np.divide(segment, power, out=scratch)
+        np.cumsum(scratch, axis=0, out=scratch)
+        # Column by column, adding a broadcast row allocates.
+        for channel, start_value in enumerate((a * state).tolist()):
+            column = scratch[:, channel]
+            column += start_value
+        y = out[start : start + n]
+        np.multiply(power, scratch, out=y)
+        state[...] = y[-1]
+    return out
+
+
+class Stage:
+    """
+    Step of a DSPChain, processing (frames, channels) float32 blocks in
+    place.
+    """
+
+    def setup(self, rate, chans):
+        """
+        Allocate state for a channel format, called before the first block
+        and whenever the format changes.
+
+        Arguments:
+            rate: Sample rate.
+            chans: Number of channels.
+
+        Returns:
+            None.
+        """
+        self.rate = rate
+        self.chans = chans
+        self.frames = int(rate * BLOCK_SECONDS)
+        self.buffers = {}
+
+    def buffer(self, name, frames, dtype=np.float64, channels=True):
+        """
+        Get frames rows of a work buffer, allocated by the first call
+        (from setup()) for self.frames rows and only reallocated for a
+        longer block.
+
+        Arguments:
+            name: Buffer name.
+            frames: Rows needed.
+            dtype: Sample type.
+            channels: Whether rows have one column per channel, else the
+                buffer is 1-D.
+
+        Returns:
+            View of the first frames rows.
+        """
+        array = self.buffers.get(name)
+        if array is None or len(array) < frames:
+            shape = (max(frames, self.frames),)
+            if channels:
+                shape += (self.chans,)
+            array = self.buffers[name] = np.empty(shape, dtype)
+        return array[:frames]
+
+    def process(self, block):
+        raise NotImplementedError
+
+
+class Gain(Stage):
+    """
+    Constant gain in dB.
+    """
+
+    def __init__(self, db=6.0):
+        self.factor = np.float32(10 ** (db / 20))
+
+    def process(self, block):
+        block *= self.factor
+
+
+class HighPass(Stage):
+    """
+    Highpass of order one pole highpass sections (6 dB/octave each) at
+    cutoff Hz, for removing rumble and handling noise.
+    """
+
+    def __init__(self, cutoff=120.0, order=2):
+        self.cutoff = cutoff
+        self.order = order
+
+    def setup(self, rate, chans):
+        super().setup(rate, chans)
+        self.a = math.exp(-2 * math.pi * self.cutoff / rate)
+        self.states = [np.zeros(chans) for _ in range(self.order)]
+        self.powers = {}
+        for name in ("scaled", "low", "work"):
+            self.buffer(name, self.frames)
+        self.buffer("low32", self.frames, np.float32)
+
+    def process(self, block):
+        frames = len(block)
+        scaled = self.buffer("scaled", frames)
+        low = self.buffer("low", frames)
+        work = self.buffer("work", frames)
+        # Cast by copyto, a float32 -= float64 would allocate cast buffers.
+        low32 = self.buffer("low32", frames, np.float32)
+        for state in self.states:
+            # Highpass is the input minus a one pole lowpass of it.
+            np.copyto(scaled, block)
+            scaled *= 1 - self.a
+            one_pole(scaled, self.a, state, self.powers, low, work)
+            np.copyto(low32, low)
+            block -= low32
+
+
+class Biquad(Stage):
+    """
+    Second order IIR filter b / a with coefficients for one sample rate.
+
+    The numerator runs as a 3 tap FIR and the denominator as two one pole
+    filters at its roots (complex for resonant filters), so every step is
+    vectorized.
+    """
+
+    def __init__(self, b, a):
+        a0 = a[0]
+        self.b = [value / a0 for value in b]
+        self.poles = np.roots([value / a0 for value in a])
+        if np.all(np.isreal(self.poles)):
+            self.poles = self.poles.real
+
+    def setup(self, rate, chans):
+        super().setup(rate, chans)
+        self.history = np.zeros((2, chans))
+        self.states = [np.zeros(chans, self.poles.dtype) for _ in self.poles]
+        self.powers = [{} for _ in self.poles]
+        self.dtype = np.result_type(self.poles.dtype, np.float64)
+        self.buffer("padded", self.frames + 2)
+        self.buffer("tap", self.frames)
+        self.buffer("y", self.frames, self.dtype)
+        self.buffer("work", self.frames, self.dtype)
+
+    def filter(self, x):
+        """
+        Filter x, keeping state for the next call.
+
+        Arguments:
+            x: Array of (frames, channels) samples.
+
+        Returns:
+            Filtered float64 array, a view of a work buffer valid until
+            the next call.
+        """
+        b0, b1, b2 = self.b
+        frames = len(x)
+        padded = self.buffer("padded", frames + 2)
+        padded[:2] = self.history
+        padded[2:] = x
+        self.history[...] = padded[-2:]
+        tap = self.buffer("tap", frames)
+        y = self.buffer("y", frames, self.dtype)
+        np.multiply(padded[2:], b0, out=y)
+        np.multiply(padded[1:-1], b1, out=tap)
+        y += tap
+        np.multiply(padded[:-2], b2, out=tap)
+        y += tap
+        work = self.buffer("work", frames, self.dtype)
+        for pole, state, powers in zip(self.poles, self.states, self.powers):
+            one_pole(y, pole, state, powers, y, work)
+        return y.real
+
+    def process(self, block):
+        block[...] = self.filter(block)
+
+
+class Compressor(Stage):
+    """
+    Feed forward compressor working on the RMS of short windows, with gain
+    smoothed by attack and release times and interpolated per sample.
+    """
+
+    def __init__(
+        self,
+        threshold_db=-24.0,
+        ratio=3.0,
+        attack=0.01,
+        release=0.25,
+        makeup_db=0.0,
+        window=64,
+    ):
+        self.threshold_db = threshold_db
+        self.ratio = ratio
+        self.attack = attack
+        self.release = release
+        self.makeup = 10 ** (makeup_db / 20)
+        self.window = window
+
+    def setup(self, rate, chans):
+        super().setup(rate, chans)
+        step = self.window / rate
+        self.attack_coef = math.exp(-step / self.attack)
+        self.release_coef = math.exp(-step / self.release)
+        self.gain_db = 0.0
+        windows = -(-self.frames // self.window)
+        self._grid(windows * self.window)
+        self.buffer("padded", windows * self.window, np.float32)
+        self.buffer("power", windows, np.float32, channels=False)
+        self.buffer("levels", windows, channels=False)
+        self.buffer("gains", windows + 1, channels=False)
+        self.buffer("curve", windows * self.window, channels=False)
+        self.buffer("start", windows * self.window, channels=False)
+        self.buffer("curve32", windows * self.window, np.float32, False)
+
+    def _grid(self, size):
+        """
+        Get, for size samples, the window of every sample and its position
+        between the gains of the previous window (0) and of its own (1).
+        Ufuncs broadcasting per window values would allocate, np.take
+        through these doesn't.
+        """
+        index = self.buffers.get("index")
+        if index is None or len(index) < size:
+            index = self.buffer("index", size, np.intp, channels=False)
+            phase = self.buffer("phase", size, channels=False)
+            np.floor_divide(np.arange(size), self.window, out=index)
+            np.copyto(
+                phase,
+                np.tile(
+                    np.arange(1, self.window + 1), len(phase) // self.window
+                ),
+            )
+            phase /= self.window
+        return self.buffers["index"][:size], self.buffers["phase"][:size]
+
+    def process(self, block):
+        frames = len(block)
+        count = -(-frames // self.window)
+        size = count * self.window
+        padded = self.buffer("padded", size, np.float32)
+        padded[:frames] = block
+        padded[frames:] = 0
+        np.square(padded, out=padded)
+        power = self.buffer("power", count, np.float32, channels=False)
+        np.mean(padded.reshape(count, -1), axis=1, out=power)
+        targets = self.buffer("levels", count, channels=False)
+        np.copyto(targets, power)
+        # Level in dB, then the gain reduction of the part over threshold.
+        targets += 1e-12
+        np.log10(targets, out=targets)
+        targets *= 10
+        targets -= self.threshold_db
+        np.maximum(targets, 0.0, out=targets)
+        targets *= -(1 - 1 / self.ratio)
+
+        # Smoothing is recursive but runs once per window, not per sample.
+        # gains[0] is the gain the previous block ended with.
+        gains = self.buffer("gains", count + 1, channels=False)
+        gains[0] = gain_db = self.gain_db
+        for i, target in enumerate(targets.tolist(), 1):
+            coef = self.attack_coef if target < gain_db else self.release_coef
+            gain_db = target + coef * (gain_db - target)
+            gains[i] = gain_db
+        self.gain_db = gain_db
+
+        # Interpolate linearly from the gain of each window to the next,
+        # then convert from dB with the makeup gain.
+        index, phase = self._grid(size)
+        curve = self.buffer("curve", size, channels=False)
+        start = self.buffer("start", size, channels=False)
+        np.subtract(gains[1:], gains[:-1], out=targets)
+        np.take(targets, index, out=curve, mode="clip")
+        curve *= phase
+        np.take(gains, index, out=start, mode="clip")
+        curve += start
+        curve *= math.log(10) / 20
+        np.exp(curve, out=curve)
+        curve *= self.makeup
+        curve32 = self.buffer("curve32", size, np.float32, channels=False)
+        np.copyto(curve32, curve)
+        # Column by column, broadcasting would allocate.
+        for channel in range(self.chans):
+            column = block[:, channel]
+            np.multiply(column, curve32[:frames], out=column)
+
+
+# Named stage lists for the --dsp option.
+PRESETS = {
+    "phone": lambda: [
+        HighPass(cutoff=150.0),
+        Gain(db=6.0),
+        Compressor(threshold_db=-24.0, ratio=3.0, makeup_db=3.0),
+    ],
+    "rumble": lambda: [HighPass(cutoff=80.0)],
+}
+
+
+class DSPChain:
+    """
+    Ordered stages run by one BASS DSP callback, timing every call.
+    """
+
+    def __init__(self, stages=()):
+        self.stages = tuple(stages)
+        self.format = None
+        self.lock = threading.Lock()
+        self.proc = None
+
+        self.blocks = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.audio_ms = 0.0
+        self.overruns = 0
+        self.timings = array("d", bytes(8 * TIMINGS))
+
+    def set_stages(self, stages):
+        """
+        Replace the stages, keeping the current format.
+
+        Arguments:
+            stages: Stages in processing order.
+
+        Returns:
+            None.
+        """
+        stages = tuple(stages)
+        if self.format is not None:
+            for stage in stages:
+                stage.setup(*self.format)
+        with self.lock:
+            self.stages = stages
+
+    def setup(self, rate, chans):
+        """
+        Prepare the stages for the format of the channel the chain is set
+        on.
+
+        Arguments:
+            rate: Sample rate.
+            chans: Number of channels.
+
+        Returns:
+            None.
+        """
+        with self.lock:
+            if self.format != (rate, chans):
+                for stage in self.stages:
+                    stage.setup(rate, chans)
+                self.format = (rate, chans)
+
+    def __call__(self, handle, channel, buffer, length, user):
+        start = perf_counter()
+        with self.lock:
+            if not self.stages or self.format is None or not buffer:
+                return
+            rate, chans = self.format
+            samples = length // 4
+            data = np.ctypeslib.as_array(
+                ctypes.cast(buffer, ctypes.POINTER(ctypes.c_float)),
+                shape=(samples,),
+            ).reshape(-1, chans)
+            try:
+                for stage in self.stages:
+                    stage.process(data)
+            except Exception as error:
+                logger.exception(error)
+                self.stages = ()
+
+        ms = (perf_counter() - start) * 1000
+        block_ms = 1000 * len(data) / rate
+        self.timings[self.blocks % TIMINGS] = ms
+        self.blocks += 1
+        self.total_ms += ms
+        self.audio_ms += block_ms
+        self.max_ms = max(self.max_ms, ms)
+        if ms > block_ms:
+            self.overruns += 1
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.blocks if self.blocks else 0.0
+
+    @property
+    def load(self):
+        """
+        Share of the audio time spent in the callback.
+        """
+        return self.total_ms / self.audio_ms if self.audio_ms else 0.0
+
+    def report(self):
+        """
+        Format the callback timings as a one line summary.
+
+        Returns:
+            String.
+        """
+        recent = sorted(self.timings[: min(self.blocks, TIMINGS)]) or [0.0]
+        p99 = recent[min(int(len(recent) * 0.99), len(recent) - 1)]
+        return (
+            f"{self.blocks} blocks, mean {self.mean_ms:.3f} ms, "
+            f"p99 {p99:.3f} ms, max {self.max_ms:.3f} ms, "
+            f"load {self.load:.2%}, overruns {self.overruns}"
+        )
@@ -0,0 +1,134 @@
+import queue
+from time import monotonic
+
+from scribepy import logger
+
+ENDED = "ended"
+POSITION_REACHED = "position_reached"
+STALLED = "stalled"
+RESUMED = "resumed"
+SEEKED = "seeked"
+PLAYING = "playing"
+PAUSED = "paused"
+NEXT = "next"
+SILENCE_SKIPPED = "silence_skipped"
+
+
+class PlayerEvent:
+    """
+    Something that happened to the playing stream.
+    """
+
+    __slots__ = ("name", "data", "time")
+
+    def __init__(self, name, data=None):
+        self.name = name
+        self.data = data
+        self.time = monotonic()
+
+    def __repr__(self):
+        return f"<PlayerEvent {self.name} {self.data}>"
+
+
+class EventQueue:
+    """
+    Thread-safe queue of player events.
+
+    BASS sync callbacks run on BASS threads and only put events in the
+    queue. The UI either blocks on get() or calls dispatch() from its own
+    thread to run the callbacks subscribed to each event.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.subscribers = {}
+
+    def put(self, name, data=None):
+        """
+        Add an event to the queue. Safe to call from any thread.
+
+        Arguments:
+            name: Event name.
+            data: Additional event data.
+
+        Returns:
+            None.
+        """
+        self.queue.put(PlayerEvent(name, data))
+
+    def subscribe(self, name, callback):
+        """
+        Call callback with the event every time an event named name is
+        dispatched.
+
+        Arguments:
+            name: Event name.
+            callback: Function taking a PlayerEvent.
+
+        Returns:
+            None.
+        """
+        self.subscribers.setdefault(name, []).append(callback)
+
+    def unsubscribe(self, name, callback):
+        """
+        Stop calling callback for events named name.
+
+        Arguments:
+            name: Event name.
+            callback: Previously subscribed function.
+
+        Returns:
+            None.
+        """
+        if callback in self.subscribers.get(name, []):
+            self.subscribers[name].remove(callback)
+
+    def get(self, timeout=None):
+        """
+        Wait for the next event.
+
+        Arguments:
+            timeout: Seconds to wait, None waits forever and 0 doesn't wait.
+
+        Returns:
+            PlayerEvent or None if no event arrived in time.
+        """
+        try:
+            return self.queue.get(block=timeout != 0, timeout=timeout or None)
+        except queue.Empty:
+            return None
+
+    def drain(self):
+        """
+        Take every event currently in the queue without waiting.
+
+        Returns:
+            List of PlayerEvent.
+        """
+        events = []
+        while True:
+            event = self.get(timeout=0)
+            if event is None:
+                return events
+            events.append(event)
+
+    def dispatch(self, timeout=0):
+        """
+        Run subscribed callbacks for queued events.
+
+        Arguments:
+            timeout: Seconds to wait for the first event.
+
+        Returns:
+            List of dispatched PlayerEvent.
+        """
+        first = self.get(timeout)
+        events = [] if first is None else [first] + self.drain()
+        for event in events:
+            for callback in list(self.subscribers.get(event.name, [])):
+                try:
+                    callback(event)
+                except Exception as error:
+                    logger.exception(error)
+        return events
@@ -0,0 +1,159 @@
+import ctypes
+import threading
+
+from scribepy.clock import PlaybackClock
+from scribepy.pybass.pybass import (
+    BASS_ChannelGetData,
+    BASS_ChannelGetPosition,
+    BASS_ChannelSetPosition,
+    BASS_POS_BYTE,
+    BASS_SAMPLE_8BITS,
+    BASS_SAMPLE_FLOAT,
+    BASS_STREAM_DECODE,
+    BASS_STREAMPROC_END,
+    BASS_StreamCreate,
+    STREAMPROC,
+)
+
+BASS_DATA_ERROR = 0xFFFFFFFF
+
+
+class RewindHistory:
+    """
+    Rolling PCM history of a decoding stream.
+
+    The history is a user stream placed between the decoder and the tempo
+    stream. Everything read from the decoder is copied into a preallocated
+    ring buffer holding the last seconds of audio, so moving back (or
+    forward into audio already decoded) replays the ring buffer instead of
+    seeking the decoder, and reading continues from the live decoder when
+    the replay catches up with it.
+    """
+
+    def __init__(self, source, seconds, start=0.0, ring=None):
+        """
+        Arguments:
+            source: Decoding stream to keep history of.
+            seconds: Seconds of audio to keep.
+            start: Time of the first byte of source in seconds.
+            ring: Ring buffer of a previous history to reuse.
+        """
+        self.source = source
+        self.clock = PlaybackClock(source, start)
+        self.capacity = max(self.clock.bytes(start + seconds), 1)
+        if ring is None or len(ring) < self.capacity:
+            ring = ctypes.create_string_buffer(self.capacity)
+        self.ring = ring
+        self.lock = threading.Lock()
+
+        # Byte positions of the source: end is where the decoder is, cursor
+        # is the next byte handed to the tempo stream.
+        self.end = max(BASS_ChannelGetPosition(source, BASS_POS_BYTE), 0)
+        self.cursor = self.end
+        self.filled = 0
+        self.replayed = 0
+
+        info = self.clock.info
+        flags = BASS_STREAM_DECODE | (
+            info.flags & (BASS_SAMPLE_FLOAT | BASS_SAMPLE_8BITS)
+        )
+        self._proc = STREAMPROC(self._read)
+        self.stream = BASS_StreamCreate(
+            info.freq, info.chans, flags, self._proc, None
+        )
+
+    @property
+    def length(self):
+        return self.clock.length
+
+    @property
+    def seconds(self):
+        """
+        Seconds of audio currently held in the history.
+        """
+        return self.filled / self.clock.bytes_per_second
+
+    def _copy(self, buffer, position, length, to_ring):
+        # Copy between buffer and the ring at source byte position,
+        # wrapping around the end of the ring.
+        done = 0
+        while done < length:
+            index = (position + done) % self.capacity
+            size = min(length - done, self.capacity - index)
+            ring = ctypes.addressof(self.ring) + index
+            if to_ring:
+                ctypes.memmove(ring, buffer + done, size)
+            else:
+                ctypes.memmove(buffer + done, ring, size)
+            done += size
+
+    def _read(self, handle, buffer, length, user):
+        with self.lock:
+            written = 0
+            if self.cursor < self.end:
+                written = min(length, self.end - self.cursor)
+                self._copy(buffer, self.cursor, written, to_ring=False)
+                self.cursor += written
+                self.replayed += written
+
+            if written < length:
+                read = BASS_ChannelGetData(
+                    self.source, buffer + written, length - written
+                )
+                if read == BASS_DATA_ERROR:
+                    read = 0
+                # Keep only the newest capacity bytes of a large read.
+                keep = min(read, self.capacity)
+                self._copy(
+                    buffer + written + read - keep,
+                    self.end + read - keep,
+                    keep,
+                    to_ring=True,
+                )
+                self.end += read
+                self.cursor = self.end
+                self.filled = min(self.filled + read, self.capacity)
+                written += read
+                if not written:
+                    return BASS_STREAMPROC_END
+            return written
+
+    def contains(self, seconds):
+        """
+        Check whether the audio at seconds is held in the history.
+
+        Arguments:
+            seconds: Stream position.
+
+        Returns:
+            True if seconds can be replayed from the history.
+        """
+        position = self.clock.bytes(seconds)
+        return self.end - self.filled <= position <= self.end
+
+    def move_to(self, seconds):
+        """
+        Continue reading at seconds, from the history if it holds that
+        position, else by seeking the decoder and dropping the history.
+
+        The tempo stream must be flushed afterwards so buffered audio from
+        the old position isn't played.
+
+        Arguments:
+            seconds: Position to move to.
+
+        Returns:
+            True if successful else False.
+        """
+        position = self.clock.bytes(seconds)
+        with self.lock:
+            if self.end - self.filled <= position <= self.end:
+                self.cursor = position
+                return True
+            if not BASS_ChannelSetPosition(
+                self.source, position, BASS_POS_BYTE
+            ):
+                return False
+            self.end = self.cursor = position
+            self.filled = 0
+            return True
@@ -0,0 +1,176 @@
+"""
+Key bindings of the player, loaded from a JSON config file.
+
+A keymap maps pynput key names ("f6", "space", or a character) to a
+command and its argument:
+
+    {"f6": ["seek", 10], "f3": ["tempo", 4], "f9": ["play"], "f12": null}
+
+The bindings of $XDG_CONFIG_HOME/scribepy/keymap.json
+(~/.config/scribepy/keymap.json) replace those of DEFAULT_KEYMAP key by
+key, null unbinds a key.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from scribepy import logger
+from scribepy.tempo import TEMPO_STEP
+
+
+def seek(player, seconds):
+    player.seek(seconds)
+
+
+def tempo(player, percent):
+    player.change_tempo(percent)
+
+
+def restore_tempo(player, _):
+    player.restore_tempo()
+
+
+def play(player, _):
+    player.play()
+
+
+def pause(player, seconds):
+    """
+    Pause, and rewind a little so the last words are heard again.
+    """
+    if player.isPlaying():
+        player.pause()
+        player.seek(-(seconds or 0))
+
+
+# Command name to (function called with the player and the argument,
+# whether bursts of the command can be merged into one call by adding
+# their arguments).
+COMMANDS = {
+    "seek": (seek, True),
+    "tempo": (tempo, True),
+    "restore_tempo": (restore_tempo, False),
+    "play": (play, False),
+    "pause": (pause, False),
+}
+
+DEFAULT_KEYMAP = {
+    "f2": ("seek", -10),
+    "f3": ("tempo", TEMPO_STEP),
+    "f4": ("pause", 2),
+    "f5": ("restore_tempo", None),
+    "f6": ("seek", 10),
+    "f7": ("seek", -2),
+    "f8": ("seek", 2),
+    "f9": ("play", None),
+    "f11": ("tempo", -TEMPO_STEP),
+}
+
+
+def describe(command, argument):
+    """
+    Get the help text of a binding.
+
+    Arguments:
+        command: Command name, a key of COMMANDS.
+        argument: Argument of the command.
+
+    Returns:
+        Short description, like "Rewind (-10)".
+    """
+    if command == "seek":
+        if argument < 0:
+            return f"Rewind ({argument:g})"
+        return f"Fast Forward (+{argument:g})"
+    if command == "tempo":
+        if argument < 0:
+            return f"Decrease tempo ({argument:g}%)"
+        return f"Increase tempo (+{argument:g}%)"
+    if command == "pause":
+        return "Pause"
+    if command == "restore_tempo":
+        return "Restore tempo"
+    return "Toggle play/pause"
+
+
+def keymap_help(keymap, width=28):
+    """
+    Get the help text of a keymap, two bindings per line.
+
+    Arguments:
+        keymap: Dictionary of key name to (command, argument).
+        width: Width of the first column.
+
+    Returns:
+        Help text, one "KEY - description" entry per binding.
+    """
+    # Function keys in number order, f2 before f11.
+    keys = sorted(keymap, key=lambda name: (len(name), name))
+    entries = [f"{key.upper()} - {describe(*keymap[key])}" for key in keys]
+    lines = []
+    for i in range(0, len(entries), 2):
+        pair = entries[i : i + 2]
+        lines.append("    " + pair[0].ljust(width) + "".join(pair[1:]))
+    return "\n" + "\n".join(line.rstrip() for line in lines) + "\n"
+
+
+def keymap_path():
+    """
+    Get the path of the keymap config file, which may not exist.
+
+    Returns:
+        Path of keymap.json in the scribepy config directory.
+    """
+    xdg = os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+    return Path(xdg) / "scribepy" / "keymap.json"
+
+
+def load_keymap(path=None):
+    """
+    Load the keymap, the default one updated by a config file.
+
+    Invalid bindings are logged and skipped, an unreadable file is logged
+    and ignored.
+
+    Arguments:
+        path: Keymap file, keymap_path() if None.
+
+    Returns:
+        Dictionary of key name to (command, argument).
+    """
+    keymap = dict(DEFAULT_KEYMAP)
+    path = Path(path or keymap_path())
+    try:
+        with open(path) as f:
+            bindings = json.load(f)
+    except FileNotFoundError:
+        return keymap
+    except (OSError, ValueError) as error:
+        logger.error(f"Can't read keymap {path}: {error}")
+        return keymap
+    if not isinstance(bindings, dict):
+        logger.error(f"Keymap {path} is not a JSON object")
+        return keymap
+
+    for key, binding in bindings.items():
+        if binding is None:
+            keymap.pop(key, None)
+            continue
+        if isinstance(binding, str):
+            binding = [binding]
+        if (
+            not isinstance(binding, list)
+            or not binding
+            or binding[0] not in COMMANDS
+        ):
+            logger.error(f"Keymap {path}: invalid binding {key}: {binding}")
+            continue
+        command = binding[0]
+        argument = binding[1] if len(binding) > 1 else None
+        if COMMANDS[command][1] and not isinstance(argument, (int, float)):
+            logger.error(f"Keymap {path}: {command} needs a number ({key})")
+            continue
+        keymap[key] = (command, argument)
+    logger.debug(f"Loaded keymap {path}")
+    return keymap
@@ -0,0 +1,83 @@
+from bisect import bisect_left
+from time import perf_counter
+
+# Upper bounds in milliseconds of the histogram buckets, the last bucket
+# takes everything slower.
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250)
+
+
+class LatencyHistogram:
+    """
+    Counts of how long actions took, per action, in fixed buckets.
+
+    Recording is a bisect and an increment, cheap enough to run on the
+    keyboard listener thread for every key press.
+    """
+
+    def __init__(self, buckets=BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = {}
+        self.totals = {}
+        self.maxima = {}
+
+    def record(self, name, ms):
+        """
+        Count one action.
+
+        Arguments:
+            name: Action name, e.g. the key pressed.
+            ms: Time the action took in milliseconds.
+
+        Returns:
+            None.
+        """
+        counts = self.counts.get(name)
+        if counts is None:
+            counts = self.counts[name] = [0] * (len(self.buckets) + 1)
+            self.totals[name] = 0.0
+            self.maxima[name] = 0.0
+        counts[bisect_left(self.buckets, ms)] += 1
+        self.totals[name] += ms
+        self.maxima[name] = max(self.maxima[name], ms)
+
+    def time(self, name, start):
+        """
+        Count an action started at a perf_counter() time and ending now.
+
+        Arguments:
+            name: Action name.
+            start: perf_counter() value when the action started.
+
+        Returns:
+            Milliseconds the action took.
+        """
+        ms = (perf_counter() - start) * 1000
+        self.record(name, ms)
+        return ms
+
+    def report(self, extra_ms=0.0):
+        """
+        Per action histogram report.
+
+        Arguments:
+            extra_ms: Latency added after every action, e.g. the output
+                buffer and device latency, shown as the audible mean.
+
+        Returns:
+            Report as a multi line string.
+        """
+        labels = [f"<={bound:g}" for bound in self.buckets]
+        labels.append(f">{self.buckets[-1]:g}")
+        lines = [
+            f"{'action':<14}{'count':>6}{'mean ms':>9}{'max ms':>9}"
+            f"{'heard ms':>10} " + " ".join(f"{label:>6}" for label in labels)
+        ]
+        for name, counts in sorted(self.counts.items()):
+            count = sum(counts)
+            mean = self.totals[name] / count
+            lines.append(
+                f"{name:<14}{count:>6}{mean:>9.2f}{self.maxima[name]:>9.2f}"
+                f"{mean + extra_ms:>10.1f} "
+                + " ".join(f"{n:>6}" for n in counts)
+            )
+        return "\n".join(lines)
@@ -0,0 +1,119 @@
+from scribepy import logger
+from scribepy.pybass.pybass import BASS_StreamFree
+
+IDLE = "idle"
+LOADING = "loading"
+READY = "ready"
+PLAYING = "playing"
+PAUSED = "paused"
+ENDED = "ended"
+ERROR = "error"
+
+# State a player can move to from each state. Any state can go back to
+# IDLE when its stream is destroyed.
+TRANSITIONS = {
+    IDLE: {LOADING},
+    LOADING: {READY, ERROR},
+    READY: {LOADING, PLAYING},
+    PLAYING: {LOADING, READY, PAUSED, ENDED},
+    PAUSED: {LOADING, READY, PLAYING},
+    ENDED: {LOADING, READY, PLAYING},
+    ERROR: {LOADING},
+}
+
+
+def can_move(state, new_state):
+    """
+    Check whether a player in state may move to new_state.
+
+    Arguments:
+        state: Current state.
+        new_state: Requested state.
+
+    Returns:
+        True if the transition is allowed else False.
+    """
+    return new_state == IDLE or new_state in TRANSITIONS[state]
+
+
+class HandleTracker:
+    """
+    Accounting of the BASS streams a player is responsible for freeing.
+
+    Every handle passed to opened() is freed at most once through free();
+    handles handed over to a stream that frees them itself (sources of a
+    tempo stream created with BASS_FX_FREESOURCE) are given up with
+    transfer().
+    """
+
+    def __init__(self):
+        self.live = set()
+        self.opens = 0
+        self.frees = 0
+        self.failures = 0
+        self.transfers = 0
+
+    def opened(self, handle):
+        """
+        Record the result of a stream creation.
+
+        Arguments:
+            handle: Stream handle, 0 if creation failed.
+
+        Returns:
+            handle.
+        """
+        if handle:
+            self.live.add(handle)
+            self.opens += 1
+        else:
+            self.failures += 1
+        return handle
+
+    def transfer(self, handle):
+        """
+        Stop tracking a handle now owned (and freed) by another stream.
+
+        Arguments:
+            handle: Stream handle.
+
+        Returns:
+            handle.
+        """
+        if handle in self.live:
+            self.live.remove(handle)
+            self.transfers += 1
+        return handle
+
+    def free(self, handle):
+        """
+        Free a tracked handle. Handles that aren't live are ignored, so a
+        handle is never freed twice.
+
+        Arguments:
+            handle: Stream handle.
+
+        Returns:
+            True if the handle was freed else False.
+        """
+        if handle not in self.live:
+            return False
+        self.live.remove(handle)
+        self.frees += 1
+        if not BASS_StreamFree(handle):
+            logger.warning(f"BASS_StreamFree failed for handle {handle}")
+            return False
+        return True
+
+    def report(self):
+        """
+        Format the counters as a one line summary.
+
+        Returns:
+            String.
+        """
+        return (
+            f"live {len(self.live)}, opens {self.opens}, "
+            f"frees {self.frees}, transfers {self.transfers}, "
+            f"failures {self.failures}"
+        )
@@ -0,0 +1,280 @@
+"""
+EBU R128 / ITU-R BS.1770 loudness of files, cached per file.
+
+The analysis decodes a file in large blocks, K-weights it with the
+vectorized biquads of scribepy.dsp, and keeps the mean square of every
+100 ms so the gated integrated loudness can be computed at the end. True
+peak is the largest sample of a 4x oversampled copy.
+"""
+import math
+from pathlib import Path
+
+from scribepy import logger
+from scribepy.cache import JsonStore, file_key
+
+# Loudness files are normalized to, in LUFS, and the highest true peak
+# normalization may produce, in dBTP.
+TARGET_LUFS = -18.0
+PEAK_CEILING = -1.0
+MAX_GAIN_DB = 20.0
+# Seconds decoded per BASS_ChannelGetData call.
+BLOCK_SECONDS = 2.0
+# Gating block and step of BS.1770-4.
+GATE_STEPS = 4
+STEP = 0.1
+ABSOLUTE_GATE = -70.0
+RELATIVE_GATE = -10.0
+OVERSAMPLE = 4
+TAPS_PER_PHASE = 16
+
+loudness_cache = JsonStore("loudness.json")
+
+
+def k_weighting(rate):
+    """
+    The two K-weighting biquads (pre filter shelf and RLB highpass) for a
+    sample rate, matching the 48 kHz coefficients of BS.1770.
+
+    Returns:
+        List of (b, a).
+    """
+    # High shelf.
+    k = math.tan(math.pi * 1681.974450955533 / rate)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh**0.4996667741545416
+    shelf = (
+        (vh + vb * k / q + k * k, 2 * (k * k - vh), vh - vb * k / q + k * k),
+        (1 + k / q + k * k, 2 * (k * k - 1), 1 - k / q + k * k),
+    )
+    # Revised low frequency B-curve highpass.
+    k = math.tan(math.pi * 38.13547087602444 / rate)
+    q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    highpass = (
+        (a0, -2 * a0, a0),
+        (a0, 2 * (k * k - 1), 1 - k / q + k * k),
+    )
+    return [shelf, highpass]
+
+
+def interpolation_phases():
+    """
+    Polyphase windowed sinc filters interpolating OVERSAMPLE - 1 samples
+    between every pair of samples.
+
+    Returns:
+        Array of (OVERSAMPLE, TAPS_PER_PHASE) taps.
+    """
+    import numpy as np
+
+    taps = OVERSAMPLE * TAPS_PER_PHASE
+    n = np.arange(taps) - (taps - 1) / 2
+    h = np.sinc(n / OVERSAMPLE) * np.kaiser(taps, 8.0)
+    phases = h.reshape(TAPS_PER_PHASE, OVERSAMPLE).T
+    # Every phase passes DC unchanged.
+    return phases / phases.sum(axis=1, keepdims=True)
+
+
+class LoudnessMeter:
+    """
+    Integrated loudness and true peak of audio fed block by block.
+    """
+
+    def __init__(self, rate, chans):
+        import numpy as np
+        from scribepy.dsp import Biquad
+
+        self.rate = rate
+        self.chans = chans
+        self.filters = [Biquad(b, a) for b, a in k_weighting(rate)]
+        for biquad in self.filters:
+            biquad.setup(rate, chans)
+        self.step = int(rate * STEP)
+        self.pending = np.zeros((0, chans))
+        self.powers = []
+        self.phases = interpolation_phases()
+        self.tail = np.zeros((TAPS_PER_PHASE - 1, chans))
+        self.peak = 0.0
+        self.frames = 0
+
+    def add(self, block):
+        """
+        Feed decoded samples.
+
+        Arguments:
+            block: Array of (frames, channels) float samples.
+
+        Returns:
+            None.
+        """
+        import numpy as np
+
+        self.frames += len(block)
+        self._true_peak(block)
+
+        weighted = block.astype(np.float64)
+        for biquad in self.filters:
+            weighted = biquad.filter(weighted)
+
+        # Mean square per channel of every whole 100 ms step, summed over
+        # channels (all channel weights are 1 for mono and stereo).
+        weighted = np.concatenate((self.pending, weighted))
+        steps = len(weighted) // self.step
+        used = steps * self.step
+        squares = np.square(weighted[:used]).reshape(steps, self.step, -1)
+        self.powers.append(squares.mean(axis=1).sum(axis=1))
+        self.pending = weighted[used:]
+
+    def _true_peak(self, block):
+        import numpy as np
+
+        padded = np.concatenate((self.tail, block))
+        self.tail = padded[len(padded) - (TAPS_PER_PHASE - 1) :]
+        peak = float(np.abs(block).max(initial=0.0))
+        for phase in self.phases:
+            for channel in range(self.chans):
+                values = np.convolve(padded[:, channel], phase, "valid")
+                peak = max(peak, float(np.abs(values).max(initial=0.0)))
+        self.peak = max(self.peak, peak)
+
+    @property
+    def integrated(self):
+        """
+        Gated integrated loudness in LUFS, None for silence.
+        """
+        import numpy as np
+
+        if not self.powers:
+            return None
+        steps = np.concatenate(self.powers)
+        if len(steps) < GATE_STEPS:
+            return None
+        # 400 ms gating blocks overlapping by 75%.
+        blocks = np.lib.stride_tricks.sliding_window_view(
+            steps, GATE_STEPS
+        ).mean(axis=1)
+        with np.errstate(divide="ignore"):
+            loudness = -0.691 + 10 * np.log10(blocks)
+        blocks = blocks[loudness > ABSOLUTE_GATE]
+        if not len(blocks):
+            return None
+        relative = -0.691 + 10 * np.log10(blocks.mean()) + RELATIVE_GATE
+        loudness = -0.691 + 10 * np.log10(blocks)
+        blocks = blocks[loudness > relative]
+        return float(-0.691 + 10 * np.log10(blocks.mean()))
+
+    @property
+    def true_peak(self):
+        """
+        True peak in dBTP.
+        """
+        return 20 * math.log10(self.peak) if self.peak else -math.inf
+
+
+def analyse(file):
+    """
+    Measure the loudness of file.
+
+    Arguments:
+        file: File to analyse.
+
+    Returns:
+        Dictionary with integrated (LUFS, None for silence), true_peak
+        (dBTP) and seconds, or None if file can't be decoded.
+    """
+    import numpy as np
+    from scribepy.player import registry
+    from scribepy.pybass.pybass import (
+        BASS_CHANNELINFO,
+        BASS_ChannelGetData,
+        BASS_ChannelGetInfo,
+        BASS_SAMPLE_FLOAT,
+        BASS_STREAM_DECODE,
+        BASS_StreamFree,
+    )
+
+    stream, _ = registry.open(
+        Path(file), BASS_STREAM_DECODE | BASS_SAMPLE_FLOAT
+    )
+    if not stream:
+        return None
+    try:
+        info = BASS_CHANNELINFO()
+        BASS_ChannelGetInfo(stream, info)
+        meter = LoudnessMeter(info.freq, info.chans)
+        block = np.empty(
+            (int(info.freq * BLOCK_SECONDS), info.chans), np.float32
+        )
+        while True:
+            read = BASS_ChannelGetData(
+                stream, block.ctypes.data, block.nbytes
+            )
+            if read == 0xFFFFFFFF or not read:
+                break
+            meter.add(block[: read // (4 * info.chans)])
+    finally:
+        BASS_StreamFree(stream)
+
+    return {
+        "integrated": meter.integrated,
+        "true_peak": meter.true_peak if meter.peak else None,
+        "seconds": meter.frames / info.freq,
+    }
+
+
+def cached(file):
+    """
+    Get the cached loudness of file without analysing it.
+
+    Arguments:
+        file: File to get loudness of.
+
+    Returns:
+        Dictionary of analyse() or None if not analysed yet.
+    """
+    return loudness_cache.get(file_key(file))
+
+
+def measure(file):
+    """
+    Get the loudness of file, analysing and caching it if needed.
+
+    Arguments:
+        file: File to get loudness of.
+
+    Returns:
+        Dictionary of analyse() or None if file can't be decoded.
+    """
+    key = file_key(file)
+    result = loudness_cache.get(key)
+    if result is None:
+        result = analyse(file)
+        if result is not None:
+            loudness_cache.set(key, result)
+            logger.info(
+                f"{file}: {result['integrated']} LUFS, "
+                f"{result['true_peak']} dBTP"
+            )
+    return result
+
+
+def gain_db(result, target=TARGET_LUFS, ceiling=PEAK_CEILING):
+    """
+    Gain bringing a file to target loudness without pushing its true peak
+    over ceiling.
+
+    Arguments:
+        result: Dictionary of analyse().
+        target: Target loudness in LUFS.
+        ceiling: Highest allowed true peak in dBTP.
+
+    Returns:
+        Gain in dB.
+    """
+    if result is None or result["integrated"] is None:
+        return 0.0
+    gain = target - result["integrated"]
+    if result["true_peak"] is not None:
+        gain = min(gain, ceiling - result["true_peak"])
+    return max(min(gain, MAX_GAIN_DB), -MAX_GAIN_DB)
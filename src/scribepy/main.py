@@ -2,12 +2,25 @@ import sys
 import argparse
 from pathlib import Path
 
-from loguru import logger
-from pynput import keyboard
+from scribepy import custom_logger, logger
+from scribepy.storage import OPEN_AUTO, OPEN_MODES
+from scribepy.tempo import DEFAULT_PROFILE, TEMPO_PROFILES, TEMPO_RAMP_MS
 
-from scribepy import custom_logger
 
-from scribepy.cli import play_file as cli
+class StartupProfileAction(argparse.Action):
+    """
+    Print an import time breakdown and exit, like --help does.
+    """
+
+    def __init__(self, option_strings, dest, help=None):
+        super().__init__(option_strings, dest, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        from scribepy.startup import startup_profile
+
+        startup_profile()
+        parser.exit()
+
 
 def get_parser():
     """
@@ -45,18 +58,200 @@ def get_parser():
         ),
     )
 
+    global_options.add_argument(
+        "--startup-profile",
+        action=StartupProfileAction,
+        help="Show import time breakdown and exit.",
+    )
+
+    global_options.add_argument(
+        "-S",
+        "--precise-seek",
+        action="store_true",
+        help="Seek MP3/AAC files through a cached seek table.",
+    )
+
+    global_options.add_argument(
+        "-R",
+        "--rewind-seconds",
+        type=float,
+        default=0,
+        metavar="",
+        help="Keep this many seconds of audio in memory so rewinds don't "
+        "seek the decoder, e.g. 60 (default 0, off).",
+    )
+
+    global_options.add_argument(
+        "-g",
+        "--gapless",
+        action="store_true",
+        help="Play playlists without gaps between files (needs "
+        "libbassmix.so in BASS_modules).",
+    )
+
+    global_options.add_argument(
+        "-K",
+        "--skip-silence",
+        type=float,
+        default=0,
+        metavar="",
+        help="Skip silences longer than this many seconds "
+        "(default 0, off).",
+    )
+
+    global_options.add_argument(
+        "-N",
+        "--normalize",
+        action="store_true",
+        help="Play every file at the same loudness (EBU R128).",
+    )
+
+    global_options.add_argument(
+        "-l",
+        "--low-latency",
+        action="store_true",
+        help="Use short output buffers so key presses are heard sooner.",
+    )
+
+    global_options.add_argument(
+        "-M",
+        "--open-mode",
+        choices=OPEN_MODES,
+        default=OPEN_AUTO,
+        help="Decode files from memory (map, read), read them ahead on a "
+        "thread (readahead) or let BASS read them (file); auto maps files "
+        "on slow and removable disks and reads network mounts ahead.",
+    )
+
+    global_options.add_argument(
+        "-C",
+        "--transcode-cache",
+        type=float,
+        metavar="",
+        help="Extract the audio of video files to the cache, which later "
+        "opens play, using up to this many MB, e.g. 2048 (default 0, "
+        "off).",
+    )
+
+    global_options.add_argument(
+        "-k",
+        "--keymap",
+        metavar="",
+        help="JSON file of key bindings "
+        "(default ~/.config/scribepy/keymap.json).",
+    )
+
+    global_options.add_argument(
+        "-W",
+        "--waveform",
+        action="store_true",
+        help="Draw a waveform overview above the progress bar, analysing "
+        "the peaks of every file played (cached per file).",
+    )
+
+    global_options.add_argument(
+        "-D",
+        "--dsp",
+        metavar="",
+        help="Process audio with a DSP preset (phone, rumble).",
+    )
+
+    global_options.add_argument(
+        "-T",
+        "--tempo-profile",
+        choices=tuple(TEMPO_PROFILES),
+        default=DEFAULT_PROFILE,
+        help="Time stretching settings used for tempo changes.",
+    )
+
+    global_options.add_argument(
+        "--tempo-ramp",
+        type=int,
+        default=TEMPO_RAMP_MS,
+        metavar="",
+        help=f"Milliseconds tempo changes are slid over "
+        f"(default {TEMPO_RAMP_MS}, 0 jumps).",
+    )
+
     global_options.add_argument(
         "-P",
         "--log-path",
         metavar="",
         help="Log file to use",
     )
-    global_options.add_argument("file", help="File to play")
+    global_options.add_argument(
+        "file", help="File, directory, M3U playlist or http(s) URL to play"
+    )
+
+    return parser
+
+
+def get_render_parser():
+    """
+    Create parser of the render command
 
+    Returns: parser -> ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog="scribepy render",
+        usage="scribepy render [OPTIONS] FILE [FILE ...] OUTPUT",
+        description="Write files at another tempo to WAV files, faster "
+        "than realtime",
+    )
+    parser.add_argument(
+        "-t",
+        "--tempo",
+        type=float,
+        default=0,
+        help="Tempo change in percent, e.g. -20.",
+    )
+    parser.add_argument(
+        "-T",
+        "--tempo-profile",
+        choices=tuple(TEMPO_PROFILES),
+        default=DEFAULT_PROFILE,
+        help="Time stretching settings.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="",
+        help="Worker processes (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "-L",
+        "--log-level",
+        type=str.upper,
+        help="Log level to use",
+        choices=(
+            "TRACE",
+            "DEBUG",
+            "INFO",
+            "SUCCESS",
+            "WARNING",
+            "ERROR",
+            "CRITICAL",
+        ),
+    )
+    parser.add_argument("-P", "--log-path", metavar="", help="Log file to use")
+    parser.add_argument("sources", nargs="+", metavar="FILE")
+    parser.add_argument(
+        "target",
+        metavar="OUTPUT",
+        help="WAV file, or directory when rendering several files",
+    )
     return parser
 
+
 def main(args=None):
-    parser = get_parser()
+    args = sys.argv[1:] if args is None else args
+    render = bool(args) and args[0] == "render"
+    if render:
+        parser = get_render_parser()
+        args = args[1:]
+    else:
+        parser = get_parser()
     opts = parser.parse_args(args=args)
     kwargs = opts.__dict__
 
@@ -71,6 +266,13 @@ def main(args=None):
     elif log_level:
         custom_logger(sink=sys.stderr, level="WARNING")
 
+    if render:
+        from scribepy.render import render_files
+
+        sys.exit(1 if render_files(**kwargs) else 0)
+
+    from scribepy.cli import play_file as cli
+
     try:
         return cli(**kwargs)
     except Exception as error:
@@ -0,0 +1,300 @@
+import struct
+import threading
+from pathlib import Path
+
+from scribepy import logger
+from scribepy.cache import cache_dir, file_key
+
+HEADER = struct.Struct("<4s2sBBII")
+LEVEL = struct.Struct("<QQ")
+MAGIC = b"SPPK"
+
+# Frames per bucket of the finest level and buckets merged per level.
+BUCKET_FRAMES = 256
+FACTOR = 4
+# Coarsest level has at most this many buckets.
+TOP_BUCKETS = 1024
+# Buckets decoded per BASS_ChannelGetData call.
+BLOCK_BUCKETS = 2048
+SCALES = {"i1": 127, "<i2": 32767}
+BARS = " ▁▂▃▄▅▆▇█"
+
+
+class PeakPyramid:
+    """
+    Minimum and maximum sample of every bucket of a file at several zoom
+    levels.
+
+    Level 0 has one (min, max) pair per BUCKET_FRAMES frames and every
+    level above merges FACTOR buckets of the level below. The levels are
+    stored one after another in a cache file and read through
+    numpy.memmap, so reading any range costs O(columns) whatever the
+    length of the file.
+    """
+
+    def __init__(self, path, dtype, rate, levels):
+        """
+        Arguments:
+            path: Pyramid file.
+            dtype: Sample type, "i1" or "<i2".
+            rate: Sample rate of the file.
+            levels: List of (file offset, bucket count) per level.
+        """
+        import numpy as np
+
+        self.path = path
+        self.dtype = dtype
+        self.rate = rate
+        self.levels = [
+            (
+                np.memmap(path, dtype, "r", offset, (count, 2))
+                if count
+                else np.zeros((0, 2), dtype)
+            )
+            for offset, count in levels
+        ]
+
+    @property
+    def duration(self):
+        return len(self.levels[0]) * BUCKET_FRAMES / self.rate
+
+    @staticmethod
+    def path(file):
+        return cache_dir("peaks") / f"{file_key(file)}.pk"
+
+    @classmethod
+    def build(cls, file, dtype="<i2"):
+        """
+        Decode file and write its peak pyramid to the peak cache.
+
+        Arguments:
+            file: File to analyse.
+            dtype: Sample type stored, "<i2" or "i1" for half the size.
+
+        Returns:
+            PeakPyramid or None if file can't be decoded.
+        """
+        import numpy as np
+        from scribepy.player import registry
+        from scribepy.pybass.pybass import (
+            BASS_CHANNELINFO,
+            BASS_ChannelGetData,
+            BASS_ChannelGetInfo,
+            BASS_SAMPLE_FLOAT,
+            BASS_SAMPLE_MONO,
+            BASS_STREAM_DECODE,
+            BASS_StreamFree,
+        )
+
+        flags = BASS_STREAM_DECODE | BASS_SAMPLE_FLOAT | BASS_SAMPLE_MONO
+        stream, _ = registry.open(Path(file), flags)
+        if not stream:
+            return None
+
+        path = cls.path(file)
+        tmp = path.with_suffix(".tmp")
+        scale = SCALES[dtype]
+        info = BASS_CHANNELINFO()
+        BASS_ChannelGetInfo(stream, info)
+        width = BUCKET_FRAMES * info.chans
+        block = np.empty(width * BLOCK_BUCKETS, np.float32)
+        try:
+            with open(tmp, "wb") as f:
+                header_size = HEADER.size
+                f.write(bytes(header_size))
+
+                # Level 0 straight from the decoder.
+                count = 0
+                while True:
+                    read = BASS_ChannelGetData(
+                        stream, block.ctypes.data, block.nbytes
+                    )
+                    if read == 0xFFFFFFFF or not read:
+                        break
+                    samples = block[: read // 4]
+                    # Pad a short last block to whole buckets with zeros.
+                    buckets = -(-len(samples) // width)
+                    if len(samples) < buckets * width:
+                        samples = np.pad(
+                            samples, (0, buckets * width - len(samples))
+                        )
+                    samples = samples.reshape(buckets, width)
+                    peaks = np.empty((buckets, 2), dtype)
+                    peaks[:, 0] = samples.min(axis=1).clip(-1, 1) * scale
+                    peaks[:, 1] = samples.max(axis=1).clip(-1, 1) * scale
+                    peaks.tofile(f)
+                    count += buckets
+                levels = [(header_size, count)]
+
+                # Each higher level from the one below it.
+                f.flush()
+                while count > TOP_BUCKETS:
+                    below = np.memmap(
+                        tmp, dtype, "r", levels[-1][0], (count, 2)
+                    )
+                    full = count // FACTOR * FACTOR
+                    merged = below[:full].reshape(-1, FACTOR, 2)
+                    size = len(merged) + (full < count)
+                    peaks = np.empty((size, 2), dtype)
+                    peaks[: len(merged), 0] = merged[:, :, 0].min(axis=1)
+                    peaks[: len(merged), 1] = merged[:, :, 1].max(axis=1)
+                    if full < count:
+                        peaks[-1, 0] = below[full:, 0].min()
+                        peaks[-1, 1] = below[full:, 1].max()
+                    del below, merged
+                    levels.append((f.tell(), len(peaks)))
+                    peaks.tofile(f)
+                    f.flush()
+                    count = len(peaks)
+
+                table = b"".join(LEVEL.pack(*level) for level in levels)
+                f.write(table)
+                f.seek(0)
+                f.write(
+                    HEADER.pack(
+                        MAGIC,
+                        dtype[-2:].encode(),
+                        len(levels),
+                        FACTOR,
+                        BUCKET_FRAMES,
+                        info.freq,
+                    )
+                )
+            tmp.replace(path)
+        except OSError as error:
+            logger.exception(error)
+            return None
+        finally:
+            BASS_StreamFree(stream)
+        return cls(path, dtype, info.freq, levels)
+
+    @classmethod
+    def load(cls, file):
+        """
+        Get the cached peak pyramid of file.
+
+        Arguments:
+            file: File to get pyramid of.
+
+        Returns:
+            PeakPyramid or None if none is cached for this version of file.
+        """
+        path = cls.path(file)
+        try:
+            with open(path, "rb") as f:
+                magic, code, count, factor, frames, rate = HEADER.unpack(
+                    f.read(HEADER.size)
+                )
+                if magic != MAGIC or factor != FACTOR:
+                    return None
+                if frames != BUCKET_FRAMES:
+                    return None
+                f.seek(-LEVEL.size * count, 2)
+                levels = [
+                    LEVEL.unpack(f.read(LEVEL.size)) for _ in range(count)
+                ]
+        except (OSError, struct.error):
+            return None
+        dtype = "i1" if code == b"i1" else "<i2"
+        return cls(path, dtype, rate, levels)
+
+    def read(self, start, end, columns):
+        """
+        Get the peaks of a time range, one (min, max) per column.
+
+        Reads the coarsest level that still has a bucket per column, so at
+        most FACTOR * columns buckets are touched.
+
+        Arguments:
+            start: Range start in seconds.
+            end: Range end in seconds.
+            columns: Number of columns.
+
+        Returns:
+            Tuple of arrays (mins, maxs) of length columns, scaled to -1..1.
+        """
+        import numpy as np
+
+        bucket = BUCKET_FRAMES / self.rate
+        level = 0
+        while (
+            level + 1 < len(self.levels)
+            and (end - start) / (bucket * FACTOR ** (level + 1)) >= columns
+        ):
+            level += 1
+        peaks = self.levels[level]
+        size = bucket * FACTOR**level
+
+        first = min(max(int(start / size), 0), len(peaks))
+        last = min(max(int(np.ceil(end / size)), first + 1), len(peaks))
+        data = np.asarray(peaks[first:last], np.float32)
+        if not len(data):
+            zeros = np.zeros(columns, np.float32)
+            return zeros, zeros.copy()
+
+        # Column i covers the buckets from edges[i] up to edges[i + 1].
+        edges = np.linspace(0, len(data), columns + 1).astype(int)[:-1]
+        edges = np.minimum(edges, len(data) - 1)
+        scale = SCALES[self.dtype]
+        mins = np.minimum.reduceat(data[:, 0], edges) / scale
+        maxs = np.maximum.reduceat(data[:, 1], edges) / scale
+        return mins, maxs
+
+    def render(self, columns, start=0.0, end=None):
+        """
+        Draw the peaks of a time range as a line of block characters.
+
+        Arguments:
+            columns: Width of the line.
+            start: Range start in seconds.
+            end: Range end in seconds, the end of the file if None.
+
+        Returns:
+            String of columns characters.
+        """
+        import numpy as np
+
+        end = self.duration if end is None else end
+        mins, maxs = self.read(start, end, columns)
+        height = np.maximum(np.abs(mins), np.abs(maxs))
+        index = np.minimum((height * (len(BARS) - 1)).round(), len(BARS) - 1)
+        return "".join(BARS[int(i)] for i in index)
+
+
+class PeakLoader:
+    """
+    Peak pyramids of the files a UI shows, loaded from the cache or built
+    on a worker thread the first time a file is asked for.
+    """
+
+    def __init__(self):
+        self.pyramids = {}
+        self.lock = threading.Lock()
+
+    def get(self, file):
+        """
+        Get the pyramid of file without waiting.
+
+        Arguments:
+            file: File to get pyramid of.
+
+        Returns:
+            PeakPyramid or None while it is being built (or can't be).
+        """
+        if file is None:
+            return None
+        with self.lock:
+            if file in self.pyramids:
+                return self.pyramids[file]
+            pyramid = PeakPyramid.load(file)
+            self.pyramids[file] = pyramid
+            if pyramid is not None:
+                return pyramid
+
+        def work():
+            pyramid = PeakPyramid.build(file)
+            with self.lock:
+                self.pyramids[file] = pyramid
+
+        threading.Thread(target=work, daemon=True).start()
+        return None
@@ -1,60 +1,313 @@
 import sys
 import time
+import threading
 from pathlib import Path
-from loguru import logger
-
-from magic import from_file
-
+from scribepy import logger
+
+from scribepy.archive import read_head
+from scribepy.archive import split as split_archive
+from scribepy.cache import JsonStore, file_key
+from scribepy.download import download_cache, is_url
+from scribepy.clock import ClockSnapshot, PlaybackClock, format_time
+from scribepy import events
+from scribepy.events import EventQueue
+from scribepy.history import RewindHistory
+from scribepy import lifecycle
+from scribepy.lifecycle import HandleTracker
+from scribepy import loudness
+from scribepy.registry import Decoder, FormatRegistry
+from scribepy.seektable import SeekTable
+from scribepy.silence import SilenceMap
+from scribepy.storage import OPEN_AUTO, open_source
+from scribepy.tempo import (
+    BASS_ATTRIB_TEMPO,
+    DEFAULT_PROFILE,
+    TEMPO_RAMP_MS,
+    tempo_options,
+)
+from scribepy.transcode import (
+    TRANSCODE_MIMES,
+    TranscodeCache,
+    has_video,
+)
 from scribepy.pybass.pybass import *
 from scribepy.pybass.pybass_aac import (
     BASS_AAC_StreamCreateFile,
+    BASS_AAC_StreamCreateFileUser,
     BASS_MP4_StreamCreateFile,
+    BASS_MP4_StreamCreateFileUser,
+)
+from scribepy.pybass.pybassflac import (
+    BASS_FLAC_StreamCreateFile,
+    BASS_FLAC_StreamCreateFileUser,
+)
+from scribepy.pybass.pybass_tta import (
+    BASS_TTA_StreamCreateFile,
+    BASS_TTA_StreamCreateFileUser,
+)
+from scribepy.pybass.pybass_alac import (
+    BASS_ALAC_StreamCreateFile,
+    BASS_ALAC_StreamCreateFileUser,
+)
+from scribepy.pybass.pybass_ac3 import (
+    BASS_AC3_StreamCreateFile,
+    BASS_AC3_StreamCreateFileUser,
+)
+from scribepy.pybass.pybassmix import (
+    BASS_MIXER_BUFFER,
+    BASS_MIXER_DOWNMIX,
+    BASS_MIXER_NONSTOP,
+    BASS_MIXER_NORAMPIN,
+    BASS_Mixer_ChannelGetPosition,
+    BASS_Mixer_ChannelRemove,
+    BASS_Mixer_ChannelRemoveSync,
+    BASS_Mixer_ChannelSetPosition,
+    BASS_Mixer_ChannelSetSync,
+    BASS_Mixer_StreamAddChannel,
+    BASS_Mixer_StreamCreate,
 )
-from scribepy.pybass.pybassflac import BASS_FLAC_StreamCreateFile
-from scribepy.pybass.pybass_tta import BASS_TTA_StreamCreateFile
-from scribepy.pybass.pybass_alac import BASS_ALAC_StreamCreateFile
-from scribepy.pybass.pybass_ac3 import BASS_AC3_StreamCreateFile
 
 player_module = Path(__file__).parent
-fx_module = ctypes.CDLL(f"{player_module}/BASS_modules/libbass_fx.so")
+fx_module = LazyLibrary(f"{player_module}/BASS_modules/libbass_fx.so")
 fx_func_type = ctypes.CFUNCTYPE
-BASS_ATTRIB_TEMPO = 0x10000
 BASS_FX_FREESOURCE = 0x10000
-BASS_FX_TempoCreate = func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong)(
-    ("BASS_FX_TempoCreate", fx_module)
+BASS_FX_TempoCreate = fx_module.bind(
+    "BASS_FX_TempoCreate", HSTREAM, ctypes.c_ulong, ctypes.c_ulong
+)
+
+# Header signatures checked before falling back to libmagic. Each entry is
+# (mime type, ((offset, bytes), ...)) and matches if every part matches.
+SIGNATURES = (
+    ("audio/x-wav", ((0, b"RIFF"), (8, b"WAVE"))),
+    ("audio/flac", ((0, b"fLaC"),)),
+    ("audio/ogg", ((0, b"OggS"),)),
+    ("audio/x-tta", ((0, b"TTA1"),)),
+    *(
+        ("audio/x-m4a", ((4, b"ftyp"), (8, brand)))
+        for brand in (b"M4A ", b"M4B ", b"M4P ", b"F4A ", b"F4B ")
+    ),
+    ("video/mp4", ((4, b"ftyp"),)),
+    ("audio/mpeg", ((0, b"ID3"),)),
+    ("audio/vnd.dolby.dd-raw", ((0, b"\x0b\x77"),)),
+)
+SNIFF_SIZE = 64
+
+# Files made of self-delimiting frames that SeekTable can index.
+SEEK_TABLE_MIMES = ("audio/mpeg", "audio/x-hx-aac-adts")
+# Seconds decoded before a seek target so MP3 frames relying on the bit
+# reservoir of previous frames decode correctly.
+SEEK_PREROLL = 0.25
+# Seconds of decoded audio kept for rewinds by the CLI and TUI.
+REWIND_SECONDS = 60
+# Seconds of a skipped silence still played on each side of it.
+SILENCE_KEEP = 0.3
+# Milliseconds a normalization gain measured during playback fades in over.
+GAIN_FADE_MS = 500
+# Update period and shortest playback buffer in milliseconds of the low
+# latency mode, the buffer is raised to the device minimum plus
+# LOW_LATENCY_MARGIN when the device needs more.
+LOW_LATENCY_UPDATE_PERIOD = 5
+LOW_LATENCY_BUFFER = 20
+LOW_LATENCY_MARGIN = 5
+# Mixer output format, sources are resampled and downmixed to it.
+MIXER_FREQ = 44100
+MIXER_CHANS = 2
+MIXER_SOURCE_FLAGS = (
+    BASS_MIXER_BUFFER | BASS_MIXER_DOWNMIX | BASS_MIXER_NORAMPIN
 )
 
-def get_module_to_use(ext):
+probe_cache = JsonStore("probe.json")
+
+
+def sniff_mime(header):
+    """
+    Guess mime type of a file from its first bytes.
+
+    Arguments:
+        header: First SNIFF_SIZE bytes of the file.
+
+    Returns:
+        Mime type string or None if no signature matched.
+    """
+    for mime, parts in SIGNATURES:
+        if all(
+            header[offset : offset + len(signature)] == signature
+            for offset, signature in parts
+        ):
+            return mime
+
+    # MPEG audio / ADTS frame sync (11 set bits), layer 0 is ADTS AAC.
+    if len(header) > 1 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0:
+        layer = (header[1] >> 1) & 0x03
+        return "audio/x-hx-aac-adts" if layer == 0 else "audio/mpeg"
+    return None
+
+
+def probe_mime(file):
     """
-    Get module to use according to file extension.
+    Get mime type of file.
+
+    Results are cached on disk by (path, inode, size, mtime) so a file is
+    only probed once. The header signature table is tried first and
+    libmagic is only loaded when no signature matches.
 
     Arguments:
-        ext: Extension of the file.
+        file: File to probe.
 
     Returns:
-        BASS module to use to create stream
+        Mime type string.
+    """
+    key = file_key(file)
+    mime = probe_cache.get(key)
+    if mime is None:
+        member = split_archive(file) is not None
+        if member:
+            header = read_head(file, SNIFF_SIZE)
+        else:
+            with open(file, "rb") as f:
+                header = f.read(SNIFF_SIZE)
+        mime = sniff_mime(header)
+        if mime is None and member:
+            from magic import from_buffer
+
+            mime = from_buffer(header, mime=True)
+        elif mime is None:
+            from magic import from_file
+
+            mime = from_file(str(file), mime=True)
+        # Generic MP4 brands (mp42, isom) hold audio-only files too.
+        if mime in TRANSCODE_MIMES and not has_video(file):
+            mime = "audio/mp4"
+        probe_cache.set(key, mime)
+    return mime
+
+
+DECODERS = (
+    Decoder(
+        "bass",
+        BASS_StreamCreateFile,
+        mimes=(
+            "audio/x-wav",
+            "audio/ogg",
+            "audio/mpeg",
+            "audio/mpegapplication/octet-stream",
+        ),
+        extensions=("wav", "ogg", "mp3", "mp2", "mp1", "aiff"),
+        create_user=BASS_StreamCreateFileUser,
+    ),
+    Decoder(
+        "aac",
+        BASS_AAC_StreamCreateFile,
+        plugin="libbass_aac.so",
+        mimes=("audio/x-hx-aac-adts",),
+        extensions=("aac",),
+        create_user=BASS_AAC_StreamCreateFileUser,
+    ),
+    Decoder(
+        "alac",
+        BASS_ALAC_StreamCreateFile,
+        plugin="libbassalac.so",
+        mimes=("audio/x-m4a",),
+        extensions=("m4a",),
+        create_user=BASS_ALAC_StreamCreateFileUser,
+    ),
+    Decoder(
+        "mp4",
+        BASS_MP4_StreamCreateFile,
+        plugin="libbass_aac.so",
+        mimes=("video/mp4", "audio/x-m4a", "audio/mp4"),
+        extensions=("mp4", "m4a", "m4b"),
+        create_user=BASS_MP4_StreamCreateFileUser,
+    ),
+    Decoder(
+        "flac",
+        BASS_FLAC_StreamCreateFile,
+        plugin="libbassflac.so",
+        mimes=("audio/flac",),
+        extensions=("flac",),
+        create_user=BASS_FLAC_StreamCreateFileUser,
+    ),
+    Decoder(
+        "tta",
+        BASS_TTA_StreamCreateFile,
+        plugin="libbass_tta.so",
+        mimes=("audio/x-tta", "application/octet-stream"),
+        extensions=("tta",),
+        create_user=BASS_TTA_StreamCreateFileUser,
+    ),
+    Decoder(
+        "ac3",
+        BASS_AC3_StreamCreateFile,
+        plugin="libbass_ac3.so",
+        mimes=("audio/vnd.dolby.dd-raw",),
+        extensions=("ac3",),
+        create_user=BASS_AC3_StreamCreateFileUser,
+    ),
+)
+
+registry = FormatRegistry(DECODERS, probe=probe_mime)
+
+
+class OpenedFile:
+    """
+    Decoding stream of a file, opened but not yet attached to a player.
+
+    file is what was asked for (a path or URL), path the local file
+    actually decoded: the same path, or the cached copy of a URL or of
+    the audio of a video file.
     """
-    return {
-        "audio/x-hx-aac-adts": BASS_AAC_StreamCreateFile,
-        "audio/flac": BASS_FLAC_StreamCreateFile,
-        "audio/x-m4a": BASS_ALAC_StreamCreateFile,
-        "audio/x-wav": BASS_StreamCreateFile,
-        "audio/ogg": BASS_StreamCreateFile,
-        "audio/mpegapplication/octet-stream": BASS_StreamCreateFile,
-        "video/mp4": BASS_MP4_StreamCreateFile,
-        "application/octet-stream": BASS_TTA_StreamCreateFile,
-        "audio/vnd.dolby.dd-raw": BASS_AC3_StreamCreateFile,
-    }[ext]
+
+    def __init__(
+        self, file, source, decoder, seek_table=None, storage=None, path=None
+    ):
+        self.file = file
+        self.path = file if path is None else path
+        self.source = source
+        self.decoder = decoder
+        self.seek_table = seek_table
+        self.storage = storage
+
 
 class Player:
     """
     A class to interact with pybass module.
+
+    The player moves through the lifecycle states IDLE, LOADING, READY,
+    PLAYING, PAUSED, ENDED and ERROR (see scribepy.lifecycle); every stream
+    it creates is recorded in self.handles and freed exactly once.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        precise_seek=False,
+        rewind_seconds=0,
+        gapless=False,
+        tempo_profile=DEFAULT_PROFILE,
+        tempo_ramp=TEMPO_RAMP_MS,
+        device=-1,
+        decode=False,
+        skip_silence=0,
+        normalize=False,
+        low_latency=False,
+        open_mode=OPEN_AUTO,
+        transcode_budget=0,
+    ):
+
+        # Low latency output updates the playback buffers more often and
+        # keeps them as short as the device allows, so key presses are
+        # heard sooner. It has to be configured before BASS_Init and
+        # before the streams are created.
+        self.low_latency = low_latency
+        flags = 0
+        if low_latency:
+            BASS_SetConfig(BASS_CONFIG_UPDATEPERIOD, LOW_LATENCY_UPDATE_PERIOD)
+            flags |= BASS_DEVICE_LATENCY
 
         logger.debug("Try to initialize BASS")
-        if not BASS_Init(-1, 44100, 0, 0, 0):
+        if (
+            not BASS_Init(device, 44100, flags, 0, 0)
+            and BASS_ErrorGetCode() != BASS_ERROR_ALREADY
+        ):
             logger.exception(
                 f"BASS INITIALIZATION ERROR { get_error_description(BASS_ErrorGetCode()) }"
             )
@@ -65,28 +318,159 @@ class Player:
             )
             sys.exit(0)
 
+        self.device_latency = 0
+        self.min_buffer = 0
+        info = BASS_INFO()
+        if BASS_GetInfo(info):
+            self.device_latency = info.latency
+            self.min_buffer = info.minbuf
+        if low_latency:
+            BASS_SetConfig(
+                BASS_CONFIG_BUFFER,
+                max(
+                    LOW_LATENCY_BUFFER,
+                    self.min_buffer
+                    + LOW_LATENCY_UPDATE_PERIOD
+                    + LOW_LATENCY_MARGIN,
+                ),
+            )
+        logger.info(
+            f"Output latency {self.output_latency} ms (device "
+            f"{self.device_latency} ms, buffer {self.buffer_ms} ms, "
+            f"minimum buffer {self.min_buffer} ms)"
+        )
+
         self.stream = None
         self.tempo = 0
+        # Decoding players don't play, their stream is read with
+        # BASS_ChannelGetData (see scribepy.render).
+        self.decode = decode
+        # Tempo changes are slid over tempo_ramp milliseconds, the time
+        # stretching is tuned by the BASS_FX options of tempo_profile.
+        self.tempo_ramp = tempo_ramp
+        self.tempo_profile = tempo_profile
+        self.tempo_attributes = tempo_options(tempo_profile)
+        self._clock = None
+        self.events = EventQueue()
+        self._syncs = {}
+        self.state = lifecycle.IDLE
+        self._state_lock = threading.RLock()
+        self.handles = HandleTracker()
+
+        # Sample accurate seeking in MP3/AAC files through a cached seek
+        # table instead of BASS bitrate estimates.
+        self.precise_seek = precise_seek
+        self.file = None
+        self.path = None
+        self.decoder = None
+        self.seek_table = None
+        self._offset = 0.0
+
+        # Files on slow storage are decoded from memory, mapped or read
+        # whole, and files on network mounts are read ahead by a thread,
+        # depending on open_mode (see scribepy.storage).
+        self.open_mode = open_mode
+        self.storage = None
+
+        # The audio of video files is extracted once to a WAV file, played
+        # by later opens, in a cache of transcode_budget bytes (see
+        # scribepy.transcode).
+        self.transcoder = (
+            TranscodeCache(transcode_budget) if transcode_budget else None
+        )
+
+        # Keep the last rewind_seconds of decoded audio so short rewinds
+        # don't seek the decoder.
+        self.rewind_seconds = rewind_seconds
+        self.history = None
+        self._ring = None
+
+        # Jump over silences of at least skip_silence seconds. Silences are
+        # found by a background analysis cached per file, and the next one
+        # is announced by a position sync.
+        self.skip_silence = skip_silence
+        self.silence = None
+        self._silence_sync = 0
+
+        # NumPy processing of the played channel (see scribepy.dsp).
+        self.dsp = None
+        self._dsp_channel = None
+
+        # Per file gain bringing every file to the same loudness, from an
+        # analysis cached per file (see scribepy.loudness).
+        self.normalize = normalize
+        self.gain_db = 0.0
+
+        # Gapless playback plays every file through one mixer stream; the
+        # next file is attached by the end sync of the current one.
+        self.mixer = None
+        self.queued = None
+        self._retired = []
+        if gapless:
+            self._create_mixer()
 
     def __del__(self):
         self.destruct()
+        if self.mixer:
+            self.handles.free(self.mixer)
+
+    @property
+    def buffer_ms(self):
+        """
+        Length of the playback buffer in milliseconds.
+        """
+        return BASS_GetConfig(BASS_CONFIG_BUFFER)
+
+    @property
+    def output_latency(self):
+        """
+        Milliseconds between a change to the played stream and hearing it,
+        the playback buffer plus the device latency. The device latency is
+        only measured in low latency mode and 0 otherwise.
+        """
+        return self.buffer_ms + self.device_latency
 
     @property
     def handle(self):
         """
-        Return a file stream if exists or create one if it doesn't already exist.
+        Return the current tempo stream.
 
         Returns:
-            BASS channel stream.
+            BASS channel stream, None if no file is loaded.
         """
-        if self.stream is None:
-            self.create_file_stream("")
         return self.stream
 
     @handle.deleter
     def handle(self):
         self.destruct()
 
+    def _set_state(self, state, expected=None):
+        """
+        Move to a lifecycle state if the transition is allowed.
+
+        The state is changed by the dispatcher thread, BASS sync callbacks
+        and the TUI, so checking and changing it happen under a lock.
+
+        Arguments:
+            state: New state.
+            expected: States the player has to be in to move, None for any
+                state the transition is allowed from.
+
+        Returns:
+            True if the state changed else False.
+        """
+        with self._state_lock:
+            if expected is not None and self.state not in expected:
+                return False
+            if not lifecycle.can_move(self.state, state):
+                logger.warning(
+                    f"Invalid player transition {self.state} -> {state}"
+                )
+                return False
+            logger.debug(f"Player {self.state} -> {state}")
+            self.state = state
+            return True
+
     def create_file_stream(self, file):
         """
         Create sample stream from file and add Tempo effect to it.
@@ -100,45 +484,665 @@ class Player:
         """
         # stream = BASS_StreamCreateFile(False, bytes(file), 0, 0, BASS_STREAM_DECODE)
 
+        self._set_state(lifecycle.LOADING)
+        opened = self.open_file(file)
+        if isinstance(opened, dict):
+            self._free_streams()
+            # Nothing is loaded, don't report the previous file.
+            self.file = self.path = self.decoder = None
+            self._set_state(lifecycle.ERROR)
+            return opened
+        self.attach(opened)
+        self.release()
+        self._set_state(lifecycle.READY)
+
+    def open_file(self, file):
+        """
+        Probe file and open its decoding stream. Safe to call from a worker
+        thread, so the next file of a playlist can be opened ahead of time.
+
+        Arguments:
+            file: File or http(s) URL to open. URLs are played from the
+                download cache once fully downloaded.
+
+        Returns:
+            OpenedFile if successful or error dictionary if unsuccessful.
+        """
         logger.debug("Try to create BASS stream from file")
+        name = file
+        if is_url(file):
+            cached = download_cache.lookup(file)
+            if cached is None:
+                return self._open_url(file)
+            logger.debug(f"Playing {file} from {cached}")
+            file = cached
+        else:
+            name = Path(file)
         try:
             f = Path(file)
-            file_extension = from_file(str(f), mime=True)
-            module = get_module_to_use(file_extension)
-            stream = module(
-                False, bytes(f), 0, 0, BASS_STREAM_DECODE or BASS_UNICODE
+            flags = BASS_STREAM_DECODE or BASS_UNICODE
+            seek_table = None
+            # Seek tables are built by parsing files, not archive members.
+            if (
+                self.precise_seek
+                and split_archive(f) is None
+                and probe_mime(f) in SEEK_TABLE_MIMES
+            ):
+                seek_table = SeekTable.load(f)
+                if seek_table is None:
+                    # Pay for one accurate prescan now, later opens use
+                    # the cached table.
+                    flags |= BASS_STREAM_PRESCAN
+                    self._build_seek_table(f)
+            source = f
+            if self.transcoder and probe_mime(f) in TRANSCODE_MIMES:
+                source = self._transcoded(f)
+            storage = open_source(source, self.open_mode)
+            stream, decoder = registry.open(source, flags, storage)
+            if not self.handles.opened(stream):
+                if storage is not None:
+                    storage.close()
+                return {"error": f"{Path(f).suffix} files are not supported"}
+            logger.success(
+                f"Created stream from {source} with {decoder.name}"
+            )
+            return OpenedFile(
+                name, stream, decoder, seek_table, storage, source
             )
-            # stream = BASS_AAC_StreamCreateFile(False, bytes(file), 0, 0, 0)
-            self.stream = BASS_FX_TempoCreate(stream, BASS_FX_FREESOURCE)
-            logger.success(f"Created stream from {f}")
-        except KeyError as error:
-            logger.exception(error)
-            self.destruct()
-            return {"error": f"{Path(f).suffix} files are not supported"}
 
-        except IsADirectoryError as error:
+        except (IsADirectoryError, FileNotFoundError) as error:
             logger.exception(error)
+            self.handles.opened(0)
+            if isinstance(error, FileNotFoundError):
+                return {"error": f"{Path(f)} does not exist"}
             return {"error": f"{Path(f)} is a directory"}
 
-    def destruct(self):
+    def _transcoded(self, file):
+        """
+        Get the file to decode a video file from, its extracted audio if
+        there is one yet.
+
+        Arguments:
+            file: Video file.
+
+        Returns:
+            Path of the WAV copy of file, or file while it is extracted.
+        """
+        cached = self.transcoder.lookup(file)
+        if cached is None:
+            self.transcoder.build_in_background(file)
+            return file
+        logger.debug(f"Playing {file} from {cached}")
+        return cached
+
+    def _open_url(self, url):
+        """
+        Stream a URL not in the download cache yet, caching it meanwhile.
+
+        Arguments:
+            url: http(s) URL.
+
+        Returns:
+            OpenedFile if successful or error dictionary if unsuccessful.
         """
-        Stop stream if playing or paused and free the sample stream's resources.
+        # BASS_StreamCreateURL only tries the add-ons already loaded.
+        for decoder in registry.decoders:
+            registry.load_plugin(decoder)
+        stream = download_cache.open(url, BASS_STREAM_DECODE)
+        if not self.handles.opened(stream):
+            return {"error": f"Can't stream {url}"}
+        logger.success(f"Created stream from {url}")
+        return OpenedFile(url, stream, None)
+
+    def attach(self, opened):
+        """
+        Make an opened file the current stream, replacing the previous one.
+
+        Arguments:
+            opened: OpenedFile from open_file.
 
         Returns:
             None.
         """
+        self._retire()
+        self._clock = None
+        self._offset = 0.0
+        self.file, self.decoder = opened.file, opened.decoder
+        self.path = opened.path
+        self.seek_table = opened.seek_table
+        self.storage = opened.storage
+        self.stream = self._create_tempo_stream(opened.source)
+        BASS_ChannelSetAttribute(self.stream, BASS_ATTRIB_TEMPO, self.tempo)
+        self._add_to_mixer()
+        self._set_dsp()
+        self._set_syncs()
+        self.silence = None
+        self._silence_sync = 0
+        if self.skip_silence:
+            self._load_silence(opened.file)
+        self.gain_db = 0.0
+        if self.normalize:
+            self._load_gain(opened.file)
+
+    def queue(self, opened):
+        """
+        Set the file attached when the current stream ends.
+
+        Arguments:
+            opened: OpenedFile from open_file, None to clear the queue.
+
+        Returns:
+            None.
+        """
+        previous, self.queued = self.queued, opened
+        if previous is not None:
+            self.discard(previous)
+
+    def discard(self, opened):
+        """
+        Free a file opened with open_file that won't be attached.
+
+        Arguments:
+            opened: OpenedFile from open_file.
+
+        Returns:
+            True if successful else False.
+        """
+        return self.handles.free(opened.source)
+
+    def _retire(self):
+        # Streams can't be freed from their own sync callback, so replaced
+        # streams are kept until release() is called.
+        if self.stream is not None:
+            self._retired.append((self.stream, self.history, self._syncs))
+        self.stream = None
+        self.history = None
+        self._syncs = {}
+
+    def release(self):
+        """
+        Free streams replaced by attach and by seek table seeks.
+
+        Returns:
+            None.
+        """
+        while self._retired:
+            stream, history, _ = self._retired.pop()
+            self.handles.free(stream)
+            if history is not None:
+                self.handles.free(history.source)
+
+    def _free_streams(self):
+        """
+        Free the current, retired and queued streams, whatever their state.
+
+        Returns:
+            None.
+        """
+        if self.stream is not None:
+            BASS_ChannelStop(self.output)
+        self._retire()
+        self.release()
+        self.queue(None)
+        self._clock = None
+        self.seek_table = None
+        self.storage = None
+
+    def _create_mixer(self):
+        """
+        Create the mixer stream every file is played through.
+
+        Returns:
+            True if successful else False.
+        """
         try:
-            status = BASS_ChannelIsActive(self.handle)
+            self.mixer = self.handles.opened(
+                BASS_Mixer_StreamCreate(
+                    MIXER_FREQ, MIXER_CHANS, BASS_MIXER_NONSTOP
+                )
+            )
+        except OSError as error:
+            logger.warning(f"BASSmix unavailable, gapless disabled: {error}")
+            self.mixer = None
+        return bool(self.mixer)
+
+    def _add_to_mixer(self):
+        if self.mixer and not BASS_Mixer_StreamAddChannel(
+            self.mixer, self.stream, MIXER_SOURCE_FLAGS
+        ):
+            logger.error(
+                f"BASS_Mixer_StreamAddChannel error "
+                f"{get_error_description(BASS_ErrorGetCode())}"
+            )
 
-            if status == BASS_ACTIVE_PLAYING or status == BASS_ACTIVE_PAUSED:
-                self.stop()
-                retval = BASS_StreamFree(self.handle)
+    def set_dsp(self, stages):
+        """
+        Process the played audio with DSP stages, replacing the previous
+        ones. The stages run in order inside one BASS DSP callback.
 
-            self.stream = None
+        Arguments:
+            stages: scribepy.dsp.Stage instances, empty to stop processing.
 
-        except ctypes.ArgumentError as error:
-            logger.exception(error)
-            self.stream = None
+        Returns:
+            DSPChain, whose report() shows the callback time per block.
+        """
+        from scribepy.dsp import DSPChain
+
+        if self.dsp is None:
+            BASS_SetConfig(BASS_CONFIG_FLOATDSP, True)
+            self.dsp = DSPChain(stages)
+        else:
+            self.dsp.set_stages(stages)
+        self._set_dsp()
+        return self.dsp
+
+    def _set_dsp(self):
+        """
+        Set the DSP chain callback on the played channel, once per channel.
+
+        Returns:
+            None.
+        """
+        channel = self.output
+        if self.dsp is None or not channel or channel == self._dsp_channel:
+            return
+        info = BASS_CHANNELINFO()
+        BASS_ChannelGetInfo(channel, info)
+        self.dsp.setup(info.freq, info.chans)
+        if self.dsp.proc is None:
+            self.dsp.proc = DSPPROC(self.dsp)
+        if BASS_ChannelSetDSP(channel, self.dsp.proc, None, 0):
+            self._dsp_channel = channel
+        else:
+            logger.error(
+                f"BASS_ChannelSetDSP error "
+                f"{get_error_description(BASS_ErrorGetCode())}"
+            )
+
+    def _load_gain(self, file):
+        """
+        Apply the normalization gain of file from the loudness cache, or
+        measure file on a worker thread and fade the gain in once known.
+
+        Arguments:
+            file: File of the current stream.
+
+        Returns:
+            None.
+        """
+        if is_url(file):
+            # Measured from the cached copy on the next listen.
+            return
+        result = loudness.cached(file)
+        if result is not None:
+            self.gain_db = loudness.gain_db(result)
+            self._apply_gain()
+            return
+
+        def work():
+            result = loudness.measure(file)
+            if result is not None and self.file == file:
+                self.gain_db = loudness.gain_db(result)
+                self._apply_gain(GAIN_FADE_MS)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _apply_gain(self, fade=0):
+        """
+        Set the volume of the tempo stream to self.gain_db.
+
+        Arguments:
+            fade: Milliseconds to slide the volume over.
+
+        Returns:
+            True if successful else False.
+        """
+        if self.stream is None:
+            return False
+        volume = 10 ** (self.gain_db / 20)
+        if fade:
+            return BASS_ChannelSlideAttribute(
+                self.stream, BASS_ATTRIB_VOL, volume, fade
+            )
+        return BASS_ChannelSetAttribute(self.stream, BASS_ATTRIB_VOL, volume)
+
+    @property
+    def output(self):
+        """
+        Channel that is actually played: the mixer or the tempo stream.
+
+        Returns:
+            BASS channel handle.
+        """
+        return self.mixer or self.stream
+
+    def destruct(self):
+        """
+        Stop and free the stream, whether it is playing, paused or stopped,
+        and go back to the IDLE state.
+
+        Returns:
+            None.
+        """
+        self._free_streams()
+        self._set_state(lifecycle.IDLE)
+
+    def _create_tempo_stream(self, source, start=0.0):
+        """
+        Create the tempo stream played from a decoding stream, reading
+        through a rewind history if enabled.
+
+        Arguments:
+            source: Decoding stream, freed with the tempo stream.
+            start: Time of the first byte of source in seconds.
+
+        Returns:
+            Tempo stream handle.
+        """
+        if self.rewind_seconds:
+            # The history reads the decoder, which stays ours to free.
+            self.history = RewindHistory(
+                source, self.rewind_seconds, start, self._ring
+            )
+            self._ring = self.history.ring
+            source = self.handles.opened(self.history.stream)
+        # Mixer sources have to be decoding channels.
+        flags = BASS_FX_FREESOURCE
+        if self.mixer or self.decode:
+            flags |= BASS_STREAM_DECODE
+        stream = self.handles.opened(BASS_FX_TempoCreate(source, flags))
+        if stream:
+            self.handles.transfer(source)
+            for attribute, value in self.tempo_attributes.items():
+                BASS_ChannelSetAttribute(stream, attribute, value)
+        return stream
+
+    def _seek_with_history(self, pos):
+        """
+        Move the rewind history to pos and flush the tempo stream, which
+        restarts counting its position from 0.
+
+        Arguments:
+            pos: Position to set to (using seconds as units).
+
+        Returns:
+            True if successful else False.
+        """
+        pos = min(max(pos, 0), self.length)
+        if not self.history.move_to(pos):
+            return False
+        self._offset = pos
+        self._clock = None
+        return self._set_position(0)
+
+    def _set_position(self, position):
+        """
+        Set the byte position of the tempo stream, flushing buffered audio.
+
+        Arguments:
+            position: Position in bytes.
+
+        Returns:
+            True if successful else False.
+        """
+        if self.mixer:
+            return BASS_Mixer_ChannelSetPosition(
+                self.stream, position, BASS_POS_BYTE
+            )
+        return BASS_ChannelSetPosition(self.stream, position, BASS_POS_BYTE)
+
+    def _build_seek_table(self, file):
+        """
+        Build and cache the seek table of file on a background thread.
+
+        Arguments:
+            file: MPEG audio or ADTS AAC file.
+
+        Returns:
+            None.
+        """
+
+        def build():
+            try:
+                table = SeekTable.build(file)
+                if table is not None:
+                    table.save(file)
+                    logger.debug(f"Cached seek table of {file}")
+            except Exception as error:
+                logger.exception(error)
+
+        threading.Thread(target=build, daemon=True).start()
+
+    def _seek_with_table(self, pos):
+        """
+        Seek by reopening the file at the frame the seek table maps pos to
+        and decoding up to pos, keeping play state and tempo.
+
+        Arguments:
+            pos: Position to set to (using seconds as units).
+
+        Returns:
+            True if successful else False.
+        """
+        pos = min(max(pos, 0), self.seek_table.duration)
+        start, offset = self.seek_table.lookup(max(pos - SEEK_PREROLL, 0))
+        source = self.handles.opened(
+            self.decoder.open(
+                self.path, BASS_STREAM_DECODE, offset, self.storage
+            )
+        )
+        if not source:
+            return False
+
+        skip = PlaybackClock(source).bytes(pos - start)
+        BASS_ChannelSetPosition(source, skip, BASS_POS_DECODETO)
+
+        playing = self.isPlaying()
+        # Silence skips seek from a sync callback of the stream, which
+        # can't free it: it is silenced and retired until release().
+        if self.mixer:
+            BASS_Mixer_ChannelRemove(self.stream)
+        else:
+            BASS_ChannelStop(self.stream)
+        self._retire()
+        self.stream = self._create_tempo_stream(source, start)
+        BASS_ChannelSetAttribute(self.stream, BASS_ATTRIB_TEMPO, self.tempo)
+        self._add_to_mixer()
+        self._set_dsp()
+        self._apply_gain()
+        # A tempo stream reports the position of its source, the history
+        # stream counts from 0 at pos.
+        self._offset = pos if self.history else start
+        self._clock = None
+        self._set_syncs()
+        if playing and not self.mixer:
+            BASS_ChannelPlay(self.stream, False)
+        self.events.put(events.SEEKED)
+        return True
+
+    def _set_syncs(self):
+        """
+        Forward end, stall and position change notifications of the stream
+        to the event queue.
+
+        Returns:
+            None.
+        """
+        self._syncs = {}
+        # The next file has to be added to the mixer as soon as the current
+        # one is decoded to the end, not once it has been heard.
+        end = BASS_SYNC_END | (BASS_SYNC_MIXTIME if self.mixer else 0)
+        self._add_sync(end, 0, self._on_end)
+        self._add_sync(BASS_SYNC_STALL, 0, self._on_stall)
+        self._add_sync(BASS_SYNC_SETPOS, 0, self._on_setpos)
+
+    def _add_sync(self, sync_type, param, callback):
+        """
+        Set a sync on the stream, keeping its callback alive.
+
+        Arguments:
+            sync_type: BASS_SYNC_xxx type and flags.
+            param: Sync type parameter.
+            callback: Function called as callback(sync, channel, data, user).
+
+        Returns:
+            Sync handle, 0 if unsuccessful.
+        """
+        proc = SYNCPROC(callback)
+        if self.mixer:
+            set_sync = BASS_Mixer_ChannelSetSync
+        else:
+            set_sync = BASS_ChannelSetSync
+        sync = set_sync(self.stream, sync_type, param, proc, None)
+        if sync:
+            self._syncs[sync] = proc
+        else:
+            logger.error(
+                f"BASS_ChannelSetSync error "
+                f"{get_error_description(BASS_ErrorGetCode())}"
+            )
+        return sync
+
+    def _on_end(self, sync, channel, data, user):
+        if channel != self.stream:
+            return
+        if self.queued is None:
+            self._set_state(lifecycle.ENDED)
+            self.events.put(events.ENDED)
+            return
+        opened, self.queued = self.queued, None
+        self.attach(opened)
+        if not self.mixer:
+            BASS_ChannelPlay(self.stream, False)
+        self.events.put(events.NEXT, opened.file)
+
+    def _on_stall(self, sync, channel, data, user):
+        self.events.put(events.RESUMED if data else events.STALLED)
+
+    def _on_setpos(self, sync, channel, data, user):
+        self.events.put(events.SEEKED)
+
+    def add_position_sync(self, seconds, name=events.POSITION_REACHED):
+        """
+        Put an event in the event queue whenever playback reaches seconds.
+
+        Syncs belong to the current stream and are dropped when a seek
+        table seek replaces it.
+
+        Arguments:
+            seconds: Stream position to notify at.
+            name: Name of the event to put.
+
+        Returns:
+            Sync handle, 0 if unsuccessful.
+        """
+
+        def on_position(sync, channel, data, user):
+            self.events.put(name, seconds)
+
+        return self._add_sync(
+            BASS_SYNC_POS, self.clock.bytes(seconds), on_position
+        )
+
+    def set_skip_silence(self, seconds):
+        """
+        Turn skipping silences on or off.
+
+        Arguments:
+            seconds: Shortest silence skipped, 0 turns skipping off.
+
+        Returns:
+            None.
+        """
+        self.skip_silence = seconds
+        if seconds and self.silence is None and self.file is not None:
+            self._load_silence(self.file)
+        else:
+            self._arm_silence_sync()
+
+    def _load_silence(self, file):
+        """
+        Get the silence map of file from the cache, or analyse file on a
+        worker thread, and arm the skip sync once the map is known.
+
+        Arguments:
+            file: File of the current stream.
+
+        Returns:
+            None.
+        """
+        if is_url(file):
+            return
+        silence = SilenceMap.load(file)
+        if silence is not None:
+            self.silence = silence
+            self._arm_silence_sync()
+            return
+
+        def work():
+            silence = SilenceMap.build(file)
+            if silence is None:
+                return
+            silence.save(file)
+            logger.info(
+                f"{file}: {silence.silent_seconds:.0f}s of silence in "
+                f"{len(silence.intervals)} intervals"
+            )
+            if self.file == file:
+                self.silence = silence
+                self._arm_silence_sync()
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _arm_silence_sync(self):
+        """
+        Set a position sync at the next skippable silence after the current
+        position, replacing the previous one. Called again after every
+        move, so the sync always matches the current stream and offset.
+
+        Returns:
+            None.
+        """
+        if self._silence_sync:
+            self.remove_sync(self._silence_sync)
+            self._silence_sync = 0
+        if not self.skip_silence or self.silence is None or not self.stream:
+            return
+
+        intervals = self.silence.skippable(
+            max(self.skip_silence, 2 * SILENCE_KEEP)
+        )
+        starts = intervals[:, 0] + SILENCE_KEEP
+        index = starts.searchsorted(self.position, "right")
+        if index == len(intervals):
+            return
+        start = float(starts[index])
+        end = float(intervals[index, 1]) - SILENCE_KEEP
+
+        def on_silence(sync, channel, data, user):
+            if channel != self.stream:
+                return
+            self._move_to(end)
+            self.events.put(events.SILENCE_SKIPPED, (start, end))
+
+        self._silence_sync = self._add_sync(
+            BASS_SYNC_POS, self.clock.bytes(start), on_silence
+        )
+
+    def remove_sync(self, sync):
+        """
+        Remove a sync set with add_position_sync.
+
+        Arguments:
+            sync: Sync handle.
+
+        Returns:
+            True if successful else False.
+        """
+        self._syncs.pop(sync, None)
+        if self.mixer:
+            return BASS_Mixer_ChannelRemoveSync(self.stream, sync)
+        return BASS_ChannelRemoveSync(self.stream, sync)
 
     def play(self, restart=False):
         """
@@ -151,8 +1155,18 @@ class Player:
             True if successful else False.
         """
         logger.debug("Play stream")
+        if not lifecycle.can_move(self.state, lifecycle.PLAYING):
+            return False
         try:
-            return BASS_ChannelPlay(self.stream, restart)
+            if restart and (self.history is not None or self.mixer):
+                # Restarting the played channel can't rewind the decoder.
+                self.move_to_position_seconds(0)
+                restart = False
+            played = BASS_ChannelPlay(self.output, restart)
+            if played:
+                self._set_state(lifecycle.PLAYING)
+                self.events.put(events.PLAYING)
+            return played
         except Exception as error:
             logger.exception(error)
             return False
@@ -165,8 +1179,14 @@ class Player:
             True if successful else False.
         """
         logger.debug("Pause Stream")
+        if self.state != lifecycle.PLAYING:
+            return False
         try:
-            return BASS_ChannelPause(self.handle)
+            paused = BASS_ChannelPause(self.output)
+            if paused:
+                self._set_state(lifecycle.PAUSED, (lifecycle.PLAYING,))
+                self.events.put(events.PAUSED)
+            return paused
         except Exception as error:
             # Log errors
             logger.exception(error)
@@ -180,12 +1200,52 @@ class Player:
             True if successful else False.
         """
         logger.debug("Stop Stream")
+        if self.stream is None:
+            return False
         try:
-            return BASS_ChannelStop(self.handle)
+            stopped = BASS_ChannelStop(self.output)
+            if stopped:
+                self._set_state(
+                    lifecycle.READY, (lifecycle.PLAYING, lifecycle.PAUSED)
+                )
+            return stopped
         except Exception as error:
             logger.exception(error)
             return False
 
+    @property
+    def clock(self):
+        """
+        Playback clock of the current stream, created once per stream.
+
+        Returns:
+            PlaybackClock instance.
+        """
+        if self._clock is None or self._clock.handle != self.handle:
+            length = None
+            if self.seek_table is not None:
+                length = self.seek_table.duration
+            elif self.history is not None:
+                length = self.history.length
+            get_position = (
+                BASS_Mixer_ChannelGetPosition if self.mixer else None
+            )
+            self._clock = PlaybackClock(
+                self.handle, self._offset, length, get_position
+            )
+        return self._clock
+
+    def snapshot(self):
+        """
+        Sample the stream position once and derive every time value from it.
+
+        Returns:
+            ClockSnapshot with position, length, remaining and percent.
+        """
+        if self.stream is None:
+            return ClockSnapshot(0.0, 0.0)
+        return self.clock.sample()
+
     @property
     def length(self):
         """
@@ -194,9 +1254,9 @@ class Player:
         Returns:
             Length of stream.
         """
-        _len = BASS_ChannelGetLength(self.handle, BASS_POS_BYTE)
-        slen = BASS_ChannelBytes2Seconds(self.handle, _len)
-        return slen
+        if self.stream is None:
+            return 0.0
+        return self.clock.length
 
     @property
     def length_time(self):
@@ -206,10 +1266,7 @@ class Player:
         Returns:
             Length of stream.
         """
-        seconds = int(self.length % 60)
-        minutes = int(self.length // 60)
-
-        return f"{minutes:02}:{seconds:02}"
+        return format_time(self.length)
 
     @property
     def position(self):
@@ -220,9 +1277,7 @@ class Player:
             Position of stream.
         """
         try:
-            buf = BASS_ChannelGetPosition(self.handle, BASS_POS_BYTE)
-            sbuf = BASS_ChannelBytes2Seconds(self.handle, buf)
-            return sbuf
+            return self.snapshot().position
         except Exception as error:
             logger.debug("Get position of stream")
             logger.exception(error)
@@ -236,10 +1291,7 @@ class Player:
         Returns:
             Position of stream.
         """
-        seconds = int(self.position % 60)
-        minutes = int(self.position // 60)
-
-        return f"{minutes:02}:{seconds:02}"
+        return format_time(self.position)
 
     @property
     def position_bytes(self):
@@ -249,7 +1301,9 @@ class Player:
         Returns:
             Position of stream in bytes.
         """
-        return BASS_ChannelGetPosition(self.handle, BASS_POS_BYTE)
+        if self.stream is None:
+            return 0
+        return self.clock.get_position(self.handle, BASS_POS_BYTE)
 
     @property
     def remaining(self):
@@ -259,7 +1313,7 @@ class Player:
         Return:
             Remaining time in seconds
         """
-        return self.length - self.position
+        return self.snapshot().remaining
 
     @property
     def remaining_time(self):
@@ -269,18 +1323,13 @@ class Player:
         Return:
             Remaining time in human readable format (MM:SS)
         """
-        seconds = int(self.remaining % 60)
-        minutes = int(self.remaining // 60)
-
-        return f"{minutes:02}:{seconds:02}"
+        return format_time(self.remaining)
 
     def isPaused(self):
-        status = BASS_ChannelIsActive(self.handle)
-        return status == BASS_ACTIVE_PAUSED
+        return self.state == lifecycle.PAUSED
 
     def isPlaying(self):
-        status = BASS_ChannelIsActive(self.handle)
-        return status == BASS_ACTIVE_PLAYING
+        return self.state == lifecycle.PLAYING
 
     def pause_play_toggle(self):
         """
@@ -289,10 +1338,9 @@ class Player:
         Returns:
             None.
         """
-        status = BASS_ChannelIsActive(self.handle)
-        if status == BASS_ACTIVE_PAUSED:
+        if self.state == lifecycle.PAUSED:
             self.play()
-        elif status == BASS_ACTIVE_PLAYING:
+        elif self.state == lifecycle.PLAYING:
             self.pause()
 
     def move_to_position_bytes(self, pos):
@@ -307,7 +1355,7 @@ class Player:
         """
         logger.debug("Move to position 'pos' in stream (using bytes)")
         try:
-            return BASS_ChannelSetPosition(self.handle, pos, BASS_POS_BYTE)
+            return self.move_to_position_seconds(self.clock.seconds(pos))
         except Exception as error:
             logger.exception(error)
             return False
@@ -323,9 +1371,36 @@ class Player:
             True if successful else False.
         """
         logger.debug("Move to position 'pos' in stream (using seconds)")
+        moved = self._move_to(pos)
+        self.release()
+        return moved
+
+    def _move_to(self, pos):
+        """
+        Set the playback position without freeing replaced streams, so it
+        can be called from a sync callback.
+
+        Arguments:
+            pos: Position to set to (using seconds as units).
+
+        Returns:
+            True if successful else False.
+        """
+        if self.stream is None:
+            return False
         try:
-            bytes = BASS_ChannelSeconds2Bytes(self.handle, pos)
-            return BASS_ChannelSetPosition(self.handle, bytes, BASS_POS_BYTE)
+            if self.history is not None and self.history.contains(pos):
+                moved = self._seek_with_history(pos)
+            elif self.seek_table is not None:
+                moved = self._seek_with_table(pos)
+            elif self.history is not None:
+                moved = self._seek_with_history(pos)
+            else:
+                moved = self._set_position(self.clock.bytes(max(pos, 0)))
+            if moved:
+                self._set_state(lifecycle.READY, (lifecycle.ENDED,))
+                self._arm_silence_sync()
+            return moved
         except Exception as error:
             logger.exception(error)
             return False
@@ -354,11 +1429,9 @@ class Player:
             None.
 
         """
-        if (s < 0 and abs(s) > self.position):
-            self.seek(s/2)
-        elif (self.remaining > 0 and s > self.remaining):
-            self.seek(s/2)
-        self.move_to_position_seconds(self.position + s)
+        snapshot = self.snapshot()
+        position = min(max(snapshot.position + s, 0), snapshot.length)
+        self.move_to_position_seconds(position)
 
     def change_tempo(self, s):
         """
@@ -373,14 +1446,7 @@ class Player:
         logger.debug("Change stream tempo/speed")
 
         self.tempo += s
-        try:
-            return BASS_ChannelSetAttribute(
-                self.stream, BASS_ATTRIB_TEMPO, self.tempo
-            )
-        except Exception as error:
-            # Log error
-            logger.exception(error)
-            return False
+        return self._apply_tempo()
 
     def restore_tempo(self):
         """
@@ -391,7 +1457,23 @@ class Player:
         """
         logger.debug("Restore original stream tempo")
         self.tempo = 0
+        return self._apply_tempo()
+
+    def _apply_tempo(self):
+        """
+        Move the stream tempo to self.tempo, sliding over tempo_ramp
+        milliseconds while playing so the change is heard as a ramp.
+
+        Returns:
+            True if successful else False.
+        """
+        if self.stream is None:
+            return False
         try:
+            if self.tempo_ramp and self.state == lifecycle.PLAYING:
+                return BASS_ChannelSlideAttribute(
+                    self.stream, BASS_ATTRIB_TEMPO, self.tempo, self.tempo_ramp
+                )
             return BASS_ChannelSetAttribute(
                 self.stream, BASS_ATTRIB_TEMPO, self.tempo
             )
@@ -399,6 +1481,35 @@ class Player:
             logger.exception(error)
             return False
 
+    def set_tempo_options(self, profile=None, **options):
+        """
+        Change the BASS_FX time stretching options of the current and
+        future streams.
+
+        Arguments:
+            profile: Name of a profile in scribepy.tempo.TEMPO_PROFILES,
+                the current profile if None.
+            options: Tempo options overriding the profile (aa_filter,
+                aa_filter_length, quick_algorithm, sequence_ms,
+                seek_window_ms, overlap_ms, prevent_click).
+
+        Returns:
+            True if successful else False.
+        """
+        try:
+            profile = profile or self.tempo_profile
+            self.tempo_attributes = tempo_options(profile, **options)
+            self.tempo_profile = profile
+        except ValueError as error:
+            logger.exception(error)
+            return False
+        if self.stream is None:
+            return True
+        return all(
+            BASS_ChannelSetAttribute(self.stream, attribute, value)
+            for attribute, value in self.tempo_attributes.items()
+        )
+
     @property
     def volume(self):
         """
@@ -0,0 +1,186 @@
+import os
+import threading
+from pathlib import Path
+
+from scribepy import logger
+from scribepy import archive
+from scribepy import events
+from scribepy.download import is_url
+from scribepy.player import registry
+
+PLAYLIST_EXTENSIONS = (".m3u", ".m3u8")
+
+
+def read_m3u(file):
+    """
+    Read the entries of an M3U/M3U8 playlist.
+
+    Arguments:
+        file: Playlist file.
+
+    Returns:
+        List of Path, relative entries resolved against the playlist, and
+        http(s) URLs.
+    """
+    entries = []
+    with open(file, encoding="utf-8-sig", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if is_url(line):
+                entries.append(line)
+                continue
+            if "://" in line:
+                logger.warning(f"Skipping URL {line} in {file}")
+                continue
+            entries.append(Path(file).parent / Path(line).expanduser())
+    return entries
+
+
+def expand(path, extensions=None):
+    """
+    Turn a file, directory or M3U playlist into the files to play.
+
+    Directories are walked recursively in name order and only files with a
+    supported extension are kept. Zip and tar archives, and directories
+    inside them, are expanded to their members like directories.
+
+    Arguments:
+        path: File, directory or playlist.
+        extensions: Extensions (without dot) to keep from directories,
+            every extension known to the decoder registry if None.
+
+    Returns:
+        List of Path, and http(s) URLs.
+    """
+    if is_url(path):
+        return [path]
+    path = Path(path).expanduser()
+    if extensions is None:
+        extensions = registry.extensions
+
+    if path.is_dir():
+        files = []
+        for root, dirs, names in os.walk(path):
+            dirs.sort()
+            for name in sorted(names):
+                if Path(name).suffix.lower().lstrip(".") in extensions:
+                    files.append(Path(root, name))
+                elif archive.is_archive(Path(root, name)):
+                    files.extend(archive.walk(Path(root, name), extensions))
+        return files
+
+    if archive.is_dir(path):
+        return archive.walk(path, extensions)
+
+    if path.suffix.lower() in PLAYLIST_EXTENSIONS:
+        files = []
+        for entry in read_m3u(path):
+            files.extend(expand(entry, extensions))
+        return files
+
+    return [path]
+
+
+class Playlist:
+    """
+    Files played one after another by a Player.
+
+    While a file plays, the next one is probed and opened on a worker
+    thread and queued on the player, which attaches it as soon as the
+    current file ends.
+    """
+
+    def __init__(self, player, paths=()):
+        self.player = player
+        self.items = []
+        self.index = -1
+        self._queued_index = None
+        self._generation = 0
+        for path in paths:
+            self.extend(path)
+
+    def extend(self, path):
+        """
+        Add a file, directory or M3U playlist to the end of the playlist.
+
+        Arguments:
+            path: File, directory or playlist.
+
+        Returns:
+            Number of files added.
+        """
+        files = expand(path)
+        self.items.extend(files)
+        return len(files)
+
+    @property
+    def current(self):
+        if 0 <= self.index < len(self.items):
+            return self.items[self.index]
+        return None
+
+    def play(self, index=0):
+        """
+        Play item index now and start preloading the item after it.
+
+        Arguments:
+            index: Index of the item to play.
+
+        Returns:
+            None if successful or error dictionary if unsuccessful.
+        """
+        if not 0 <= index < len(self.items):
+            return {"error": "Nothing to play"}
+        self._generation += 1
+        self.player.queue(None)
+
+        error = self.player.create_file_stream(self.items[index])
+        if error is not None:
+            return error
+        self.index = index
+        self.player.play()
+        self.preload()
+
+    def preload(self):
+        """
+        Open the next playable item on a worker thread and queue it on the
+        player.
+
+        Returns:
+            None.
+        """
+        generation = self._generation
+
+        def work():
+            for index in range(self.index + 1, len(self.items)):
+                opened = self.player.open_file(self.items[index])
+                if isinstance(opened, dict):
+                    logger.warning(f"Skipping {self.items[index]}: {opened}")
+                    continue
+                if generation != self._generation:
+                    # play() was called meanwhile, this file isn't next.
+                    self.player.discard(opened)
+                    return
+                self._queued_index = index
+                self.player.queue(opened)
+                return
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def handle(self, event):
+        """
+        Follow player events, call for every event taken from the player's
+        event queue.
+
+        Arguments:
+            event: PlayerEvent.
+
+        Returns:
+            None.
+        """
+        if event.name == events.NEXT:
+            self.index = self._queued_index
+            self.player.release()
+            self.preload()
@@ -55,18 +55,95 @@ Main Features
 
 import sys, ctypes, platform
 from pathlib import Path
+from time import perf_counter
 
 pybass_module = Path(__file__).parent
 
 if sys.hexversion < 0x02060000:
     ctypes.c_bool = ctypes.c_byte
 
+
+class LazyLibrary:
+    """
+    Shared library that is only loaded when one of its functions is first
+    called. Every instance is kept in LazyLibrary.libraries so load times
+    can be reported.
+    """
+
+    libraries = []
+
+    def __init__(
+        self, name, loader=ctypes.CDLL, prototype=ctypes.CFUNCTYPE, **kwargs
+    ):
+        self.name = name
+        self.loader = loader
+        self.prototype = prototype
+        self.kwargs = kwargs
+        self.load_ms = None
+        self._dll = None
+        LazyLibrary.libraries.append(self)
+
+    @property
+    def dll(self):
+        if self._dll is None:
+            start = perf_counter()
+            self._dll = self.loader(self.name, **self.kwargs)
+            self.load_ms = (perf_counter() - start) * 1000
+        return self._dll
+
+    @property
+    def loaded(self):
+        return self._dll is not None
+
+    def bind(self, name, restype, *argtypes):
+        """
+        Declare a function of the library without resolving it.
+
+        Arguments:
+            name: Exported symbol name.
+            restype: ctypes result type.
+            argtypes: ctypes argument types.
+
+        Returns:
+            LazyFunction resolving the symbol on first call.
+        """
+        return LazyFunction(self, name, restype, argtypes)
+
+
+class LazyFunction:
+    """
+    Foreign function that loads its library and resolves its symbol on
+    first call.
+    """
+
+    __slots__ = ("library", "name", "restype", "argtypes", "func")
+
+    def __init__(self, library, name, restype, argtypes):
+        self.library = library
+        self.name = name
+        self.restype = restype
+        self.argtypes = argtypes
+        self.func = None
+
+    def resolve(self):
+        if self.func is None:
+            prototype = self.library.prototype(self.restype, *self.argtypes)
+            self.func = prototype((self.name, self.library.dll))
+        return self.func
+
+    def __call__(self, *args):
+        return (self.func or self.resolve())(*args)
+
+    def __repr__(self):
+        return f"<LazyFunction {self.name} of {self.library.name}>"
+
+
 if platform.system().lower() == "windows":
-    bass_module = ctypes.WinDLL("bass")
+    bass_module = LazyLibrary("bass", ctypes.WinDLL, ctypes.WINFUNCTYPE)
     func_type = ctypes.WINFUNCTYPE
 else:
     # correct by Wasylews (sabov.97@mail.ru), thank him
-    bass_module = ctypes.CDLL(
+    bass_module = LazyLibrary(
         f"{pybass_module}/../BASS_modules/libbass.so", mode=ctypes.RTLD_GLOBAL
     )
     func_type = ctypes.CFUNCTYPE
@@ -280,41 +357,41 @@ BASS_DEVICE_INIT = 4
 
 class BASS_INFO(ctypes.Structure):
     _fields_ = [
-        ("flags", ctypes.c_ulong),  # device capabilities (DSCAPS_xxx flags)
-        ("hwsize", ctypes.c_ulong),  # size of total device hardware memory
-        ("hwfree", ctypes.c_ulong),  # size of free device hardware memory
+        ("flags", ctypes.c_uint32),  # device capabilities (DSCAPS_xxx flags)
+        ("hwsize", ctypes.c_uint32),  # size of total device hardware memory
+        ("hwfree", ctypes.c_uint32),  # size of free device hardware memory
         (
             "freesam",
-            ctypes.c_ulong,
+            ctypes.c_uint32,
         ),  # number of free sample slots in the hardware
         (
             "free3d",
-            ctypes.c_ulong,
+            ctypes.c_uint32,
         ),  # number of free 3D sample slots in the hardware
         (
             "minrate",
-            ctypes.c_ulong,
+            ctypes.c_uint32,
         ),  # min sample rate supported by the hardware
         (
             "maxrate",
-            ctypes.c_ulong,
+            ctypes.c_uint32,
         ),  # max sample rate supported by the hardware
         (
             "eax",
-            ctypes.c_bool,
+            ctypes.c_int32,
         ),  # device supports EAX? (always FALSE if BASS_DEVICE_3D was not used)
         (
             "minbuf",
-            ctypes.c_ulong,
+            ctypes.c_uint32,
         ),  # recommended minimum buffer length in ms (requires BASS_DEVICE_LATENCY)
-        ("dsver", ctypes.c_ulong),  # DirectSound version
+        ("dsver", ctypes.c_uint32),  # DirectSound version
         (
             "latency",
-            ctypes.c_ulong,
+            ctypes.c_uint32,
         ),  # delay (in ms) before start of playback (requires BASS_DEVICE_LATENCY)
-        ("initflags", ctypes.c_ulong),  # BASS_Init "flags" parameter
-        ("speakers", ctypes.c_ulong),  # number of speakers available
-        ("freq", ctypes.c_ulong),  # current output rate (Vista/OSX only)
+        ("initflags", ctypes.c_uint32),  # BASS_Init "flags" parameter
+        ("speakers", ctypes.c_uint32),  # number of speakers available
+        ("freq", ctypes.c_uint32),  # current output rate (Vista/OSX only)
     ]
 
 
@@ -508,18 +585,19 @@ BASS_VAM_TERM_DIST = 8
 BASS_VAM_TERM_PRIO = 16
 
 # Channel info structure
+# DWORD is 32 bits on every platform, unlike c_ulong on 64 bit Linux.
 class BASS_CHANNELINFO(ctypes.Structure):
     _fields_ = [
-        ("freq", ctypes.c_ulong),  # DWORD freq;// default playback rate
-        ("chans", ctypes.c_ulong),  # DWORD chans;// channels
+        ("freq", ctypes.c_uint32),  # DWORD freq;// default playback rate
+        ("chans", ctypes.c_uint32),  # DWORD chans;// channels
         (
             "flags",
-            ctypes.c_ulong,
+            ctypes.c_uint32,
         ),  # DWORD flags;// BASS_SAMPLE/STREAM/MUSIC/SPEAKER flags
-        ("ctype", ctypes.c_ulong),  # DWORD ctype;// type of channel
-        ("origres", ctypes.c_ulong),  # DWORD origres;// original resolution
-        ("plugin", HPLUGIN),  # HPLUGIN plugin;// plugin
-        ("sample", HSAMPLE),  # HSAMPLE sample;// sample
+        ("ctype", ctypes.c_uint32),  # DWORD ctype;// type of channel
+        ("origres", ctypes.c_uint32),  # DWORD origres;// original resolution
+        ("plugin", ctypes.c_uint32),  # HPLUGIN plugin;// plugin
+        ("sample", ctypes.c_uint32),  # HSAMPLE sample;// sample
         ("filename", ctypes.c_char_p),  # const char *filename;// filename
     ]
 
@@ -1262,114 +1340,122 @@ BASS_IOSNOTIFY_INTERRUPT = 1  # interruption started
 BASS_IOSNOTIFY_INTERRUPT_END = 2  # interruption ended
 
 # BOOL BASSDEF(BASS_SetConfig)(DWORD option, DWORD value);
-BASS_SetConfig = func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong)(
-    ("BASS_SetConfig", bass_module)
+BASS_SetConfig = bass_module.bind(
+    "BASS_SetConfig", ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong
 )
 # DWORD BASSDEF(BASS_GetConfig)(DWORD option);
-BASS_GetConfig = func_type(ctypes.c_ulong, ctypes.c_ulong)(
-    ("BASS_GetConfig", bass_module)
+BASS_GetConfig = bass_module.bind(
+    "BASS_GetConfig", ctypes.c_ulong, ctypes.c_ulong
 )
 # BOOL BASSDEF(BASS_SetConfigPtr)(DWORD option, void *value);
-BASS_SetConfigPtr = func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_void_p)(
-    ("BASS_SetConfigPtr", bass_module)
+BASS_SetConfigPtr = bass_module.bind(
+    "BASS_SetConfigPtr", ctypes.c_bool, ctypes.c_ulong, ctypes.c_void_p
 )
 # void *BASSDEF(BASS_GetConfigPtr)(DWORD option);
-BASS_GetConfigPtr = func_type(ctypes.c_void_p, ctypes.c_ulong)(
-    ("BASS_GetConfigPtr", bass_module)
+BASS_GetConfigPtr = bass_module.bind(
+    "BASS_GetConfigPtr", ctypes.c_void_p, ctypes.c_ulong
 )
 # DWORD BASSDEF(BASS_GetVersion)();
-BASS_GetVersion = func_type(ctypes.c_ulong)(("BASS_GetVersion", bass_module))
+BASS_GetVersion = bass_module.bind("BASS_GetVersion", ctypes.c_ulong)
 # int BASSDEF(BASS_ErrorGetCode)();
-BASS_ErrorGetCode = func_type(ctypes.c_int)(("BASS_ErrorGetCode", bass_module))
+BASS_ErrorGetCode = bass_module.bind("BASS_ErrorGetCode", ctypes.c_int)
 # BOOL BASSDEF(BASS_GetDeviceInfo)(DWORD device, BASS_DEVICEINFO *info);
-BASS_GetDeviceInfo = func_type(
-    ctypes.c_bool, ctypes.c_ulong, ctypes.POINTER(BASS_DEVICEINFO)
-)(("BASS_GetDeviceInfo", bass_module))
+BASS_GetDeviceInfo = bass_module.bind(
+    "BASS_GetDeviceInfo",
+    ctypes.c_bool,
+    ctypes.c_ulong,
+    ctypes.POINTER(BASS_DEVICEINFO),
+)
 # BOOL BASSDEF(BASS_Init)(int device, DWORD freq, DWORD flags, void *win, void *dsguid);
-BASS_Init = func_type(
+BASS_Init = bass_module.bind(
+    "BASS_Init",
     ctypes.c_bool,
     ctypes.c_int,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.c_void_p,
     ctypes.c_void_p,
-)(("BASS_Init", bass_module))
+)
 # BOOL BASSDEF(BASS_SetDevice)(DWORD device);
-BASS_SetDevice = func_type(ctypes.c_bool, ctypes.c_ulong)(
-    ("BASS_SetDevice", bass_module)
+BASS_SetDevice = bass_module.bind(
+    "BASS_SetDevice", ctypes.c_bool, ctypes.c_ulong
 )
 # DWORD BASSDEF(BASS_GetDevice)();
-BASS_GetDevice = func_type(ctypes.c_ulong)(("BASS_GetDevice", bass_module))
+BASS_GetDevice = bass_module.bind("BASS_GetDevice", ctypes.c_ulong)
 # BOOL BASSDEF(BASS_Free)();
-BASS_Free = func_type(ctypes.c_bool)(("BASS_Free", bass_module))
+BASS_Free = bass_module.bind("BASS_Free", ctypes.c_bool)
 # BOOL BASSDEF(BASS_GetInfo)(BASS_INFO *info);
-BASS_GetInfo = func_type(ctypes.c_bool, ctypes.POINTER(BASS_INFO))(
-    ("BASS_GetInfo", bass_module)
+BASS_GetInfo = bass_module.bind(
+    "BASS_GetInfo", ctypes.c_bool, ctypes.POINTER(BASS_INFO)
 )
 # BOOL BASSDEF(BASS_Update)(DWORD length);
-BASS_Update = func_type(ctypes.c_bool, ctypes.c_ulong)(
-    ("BASS_Update", bass_module)
-)
+BASS_Update = bass_module.bind("BASS_Update", ctypes.c_bool, ctypes.c_ulong)
 # float BASSDEF(BASS_GetCPU)();
-BASS_GetCPU = func_type(ctypes.c_float)(("BASS_GetCPU", bass_module))
+BASS_GetCPU = bass_module.bind("BASS_GetCPU", ctypes.c_float)
 # BOOL BASSDEF(BASS_Start)();
-BASS_Start = func_type(ctypes.c_bool)(("BASS_Start", bass_module))
+BASS_Start = bass_module.bind("BASS_Start", ctypes.c_bool)
 # BOOL BASSDEF(BASS_Stop)();
-BASS_Stop = func_type(ctypes.c_bool)(("BASS_Stop", bass_module))
+BASS_Stop = bass_module.bind("BASS_Stop", ctypes.c_bool)
 # BOOL BASSDEF(BASS_Pause)();
-BASS_Pause = func_type(ctypes.c_bool)(("BASS_Pause", bass_module))
+BASS_Pause = bass_module.bind("BASS_Pause", ctypes.c_bool)
 # BOOL BASSDEF(BASS_SetVolume)(float volume);
-BASS_SetVolume = func_type(ctypes.c_bool, ctypes.c_float)(
-    ("BASS_SetVolume", bass_module)
+BASS_SetVolume = bass_module.bind(
+    "BASS_SetVolume", ctypes.c_bool, ctypes.c_float
 )
 # float BASSDEF(BASS_GetVolume)();
-BASS_GetVolume = func_type(ctypes.c_float)(("BASS_GetVolume", bass_module))
+BASS_GetVolume = bass_module.bind("BASS_GetVolume", ctypes.c_float)
 
 # HPLUGIN BASSDEF(BASS_PluginLoad)(const char *file, DWORD flags);
-BASS_PluginLoad = func_type(HPLUGIN, ctypes.c_char_p, ctypes.c_ulong)(
-    ("BASS_PluginLoad", bass_module)
+BASS_PluginLoad = bass_module.bind(
+    "BASS_PluginLoad", HPLUGIN, ctypes.c_char_p, ctypes.c_ulong
 )
 # BOOL BASSDEF(BASS_PluginFree)(HPLUGIN handle);
-BASS_PluginFree = func_type(ctypes.c_bool, HPLUGIN)(
-    ("BASS_PluginFree", bass_module)
-)
+BASS_PluginFree = bass_module.bind("BASS_PluginFree", ctypes.c_bool, HPLUGIN)
 # const BASS_PLUGININFO *BASSDEF(BASS_PluginGetInfo)(HPLUGIN handle);
-BASS_PluginGetInfo = func_type(ctypes.POINTER(BASS_PLUGININFO), HPLUGIN)(
-    ("BASS_PluginGetInfo", bass_module)
+BASS_PluginGetInfo = bass_module.bind(
+    "BASS_PluginGetInfo", ctypes.POINTER(BASS_PLUGININFO), HPLUGIN
 )
 
 # BOOL BASSDEF(BASS_Set3DFactors)(float distf, float rollf, float doppf);
-BASS_Set3DFactors = func_type(
-    ctypes.c_bool, ctypes.c_float, ctypes.c_float, ctypes.c_float
-)(("BASS_Set3DFactors", bass_module))
+BASS_Set3DFactors = bass_module.bind(
+    "BASS_Set3DFactors",
+    ctypes.c_bool,
+    ctypes.c_float,
+    ctypes.c_float,
+    ctypes.c_float,
+)
 # BOOL BASSDEF(BASS_Get3DFactors)(float *distf, float *rollf, float *doppf);
-BASS_Get3DFactors = func_type(
+BASS_Get3DFactors = bass_module.bind(
+    "BASS_Get3DFactors",
     ctypes.c_bool,
     ctypes.POINTER(ctypes.c_float),
     ctypes.POINTER(ctypes.c_float),
     ctypes.POINTER(ctypes.c_float),
-)(("BASS_Get3DFactors", bass_module))
+)
 # BOOL BASSDEF(BASS_Set3DPosition)(const BASS_3DVECTOR *pos, const BASS_3DVECTOR *vel, const BASS_3DVECTOR *front, const BASS_3DVECTOR *top);
-BASS_Set3DPosition = func_type(
+BASS_Set3DPosition = bass_module.bind(
+    "BASS_Set3DPosition",
     ctypes.c_bool,
     ctypes.POINTER(BASS_3DVECTOR),
     ctypes.POINTER(BASS_3DVECTOR),
     ctypes.POINTER(BASS_3DVECTOR),
     ctypes.POINTER(BASS_3DVECTOR),
-)(("BASS_Set3DPosition", bass_module))
+)
 # BOOL BASSDEF(BASS_Get3DPosition)(BASS_3DVECTOR *pos, BASS_3DVECTOR *vel, BASS_3DVECTOR *front, BASS_3DVECTOR *top);
-BASS_Get3DPosition = func_type(
+BASS_Get3DPosition = bass_module.bind(
+    "BASS_Get3DPosition",
     ctypes.c_bool,
     ctypes.POINTER(BASS_3DVECTOR),
     ctypes.POINTER(BASS_3DVECTOR),
     ctypes.POINTER(BASS_3DVECTOR),
     ctypes.POINTER(BASS_3DVECTOR),
-)(("BASS_Get3DPosition", bass_module))
+)
 # void BASSDEF(BASS_Apply3D)();
-BASS_Apply3D = func_type(None)(("BASS_Apply3D", bass_module))
+BASS_Apply3D = bass_module.bind("BASS_Apply3D", None)
 
 # HMUSIC BASSDEF(BASS_MusicLoad)(BOOL mem, const void *file, QWORD offset, DWORD length, DWORD flags, DWORD freq);
-BASS_MusicLoad = func_type(
+BASS_MusicLoad = bass_module.bind(
+    "BASS_MusicLoad",
     HMUSIC,
     ctypes.c_bool,
     ctypes.c_void_p,
@@ -1377,14 +1463,13 @@ BASS_MusicLoad = func_type(
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.c_ulong,
-)(("BASS_MusicLoad", bass_module))
-# BOOL BASSDEF(BASS_MusicFree)(HMUSIC handle);
-BASS_MusicFree = func_type(ctypes.c_bool, HMUSIC)(
-    ("BASS_MusicFree", bass_module)
 )
+# BOOL BASSDEF(BASS_MusicFree)(HMUSIC handle);
+BASS_MusicFree = bass_module.bind("BASS_MusicFree", ctypes.c_bool, HMUSIC)
 
 # HSAMPLE BASSDEF(BASS_SampleLoad)(BOOL mem, const void *file, QWORD offset, DWORD length, DWORD max, DWORD flags);
-BASS_SampleLoad = func_type(
+BASS_SampleLoad = bass_module.bind(
+    "BASS_SampleLoad",
     HSAMPLE,
     ctypes.c_bool,
     ctypes.c_void_p,
@@ -1392,218 +1477,250 @@ BASS_SampleLoad = func_type(
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.c_ulong,
-)(("BASS_SampleLoad", bass_module))
+)
 # HSAMPLE BASSDEF(BASS_SampleCreate)(DWORD length, DWORD freq, DWORD chans, DWORD max, DWORD flags);
-BASS_SampleCreate = func_type(
+BASS_SampleCreate = bass_module.bind(
+    "BASS_SampleCreate",
     HSAMPLE,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.c_ulong,
-)(("BASS_SampleCreate", bass_module))
-# BOOL BASSDEF(BASS_SampleFree)(HSAMPLE handle);
-BASS_SampleFree = func_type(ctypes.c_bool, HSAMPLE)(
-    ("BASS_SampleFree", bass_module)
 )
+# BOOL BASSDEF(BASS_SampleFree)(HSAMPLE handle);
+BASS_SampleFree = bass_module.bind("BASS_SampleFree", ctypes.c_bool, HSAMPLE)
 # BOOL BASSDEF(BASS_SampleSetData)(HSAMPLE handle, const void *buffer);
-BASS_SampleSetData = func_type(ctypes.c_bool, HSAMPLE, ctypes.c_void_p)(
-    ("BASS_SampleSetData", bass_module)
+BASS_SampleSetData = bass_module.bind(
+    "BASS_SampleSetData", ctypes.c_bool, HSAMPLE, ctypes.c_void_p
 )
 # BOOL BASSDEF(BASS_SampleGetData)(HSAMPLE handle, void *buffer);
-BASS_SampleGetData = func_type(ctypes.c_bool, HSAMPLE, ctypes.c_void_p)(
-    ("BASS_SampleGetData", bass_module)
+BASS_SampleGetData = bass_module.bind(
+    "BASS_SampleGetData", ctypes.c_bool, HSAMPLE, ctypes.c_void_p
 )
 # BOOL BASSDEF(BASS_SampleGetInfo)(HSAMPLE handle, BASS_SAMPLE *info);
-BASS_SampleGetInfo = func_type(
-    ctypes.c_bool, HSAMPLE, ctypes.POINTER(BASS_SAMPLE)
-)(("BASS_SampleGetInfo", bass_module))
+BASS_SampleGetInfo = bass_module.bind(
+    "BASS_SampleGetInfo", ctypes.c_bool, HSAMPLE, ctypes.POINTER(BASS_SAMPLE)
+)
 # BOOL BASSDEF(BASS_SampleSetInfo)(HSAMPLE handle, const BASS_SAMPLE *info);
-BASS_SampleSetInfo = func_type(
-    ctypes.c_bool, HSAMPLE, ctypes.POINTER(BASS_SAMPLE)
-)(("BASS_SampleSetInfo", bass_module))
+BASS_SampleSetInfo = bass_module.bind(
+    "BASS_SampleSetInfo", ctypes.c_bool, HSAMPLE, ctypes.POINTER(BASS_SAMPLE)
+)
 # HCHANNEL BASSDEF(BASS_SampleGetChannel)(HSAMPLE handle, BOOL onlynew);
-BASS_SampleGetChannel = func_type(HCHANNEL, HSAMPLE, ctypes.c_bool)(
-    ("BASS_SampleGetChannel", bass_module)
+BASS_SampleGetChannel = bass_module.bind(
+    "BASS_SampleGetChannel", HCHANNEL, HSAMPLE, ctypes.c_bool
 )
 # DWORD BASSDEF(BASS_SampleGetChannels)(HSAMPLE handle, HCHANNEL *channels);
-BASS_SampleGetChannels = func_type(
-    ctypes.c_ulong, HSAMPLE, ctypes.POINTER(HCHANNEL)
-)(("BASS_SampleGetChannels", bass_module))
-# BOOL BASSDEF(BASS_SampleStop)(HSAMPLE handle);
-BASS_SampleStop = func_type(ctypes.c_bool, HSAMPLE)(
-    ("BASS_SampleStop", bass_module)
+BASS_SampleGetChannels = bass_module.bind(
+    "BASS_SampleGetChannels", ctypes.c_ulong, HSAMPLE, ctypes.POINTER(HCHANNEL)
 )
+# BOOL BASSDEF(BASS_SampleStop)(HSAMPLE handle);
+BASS_SampleStop = bass_module.bind("BASS_SampleStop", ctypes.c_bool, HSAMPLE)
 
 # HSTREAM BASSDEF(BASS_StreamCreate)(DWORD freq, DWORD chans, DWORD flags, STREAMPROC *proc, void *user);
-BASS_StreamCreate = func_type(
+BASS_StreamCreate = bass_module.bind(
+    "BASS_StreamCreate",
     HSTREAM,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.c_ulong,
     STREAMPROC,
     ctypes.c_void_p,
-)(("BASS_StreamCreate", bass_module))
+)
 # HSTREAM BASSDEF(BASS_StreamCreateFile)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags);
-BASS_StreamCreateFile = func_type(
-    HSTREAM, ctypes.c_bool, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong
-)(("BASS_StreamCreateFile", bass_module))
+BASS_StreamCreateFile = bass_module.bind(
+    "BASS_StreamCreateFile",
+    HSTREAM,
+    ctypes.c_bool,
+    ctypes.c_void_p,
+    QWORD,
+    QWORD,
+    ctypes.c_ulong,
+)
 # HSTREAM BASSDEF(BASS_StreamCreateURL)(const char *url, DWORD offset, DWORD flags, DOWNLOADPROC *proc, void *user);
-BASS_StreamCreateURL = func_type(
+BASS_StreamCreateURL = bass_module.bind(
+    "BASS_StreamCreateURL",
     HSTREAM,
     ctypes.c_char_p,
     ctypes.c_ulong,
     ctypes.c_ulong,
     DOWNLOADPROC,
     ctypes.c_void_p,
-)(("BASS_StreamCreateURL", bass_module))
+)
 # HSTREAM BASSDEF(BASS_StreamCreateFileUser)(DWORD system, DWORD flags, const BASS_FILEPROCS *proc, void *user);
-BASS_StreamCreateFileUser = func_type(
+BASS_StreamCreateFileUser = bass_module.bind(
+    "BASS_StreamCreateFileUser",
     HSTREAM,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.POINTER(BASS_FILEPROCS),
     ctypes.c_void_p,
-)(("BASS_StreamCreateFileUser", bass_module))
-# BOOL BASSDEF(BASS_StreamFree)(HSTREAM handle);
-BASS_StreamFree = func_type(ctypes.c_bool, HSTREAM)(
-    ("BASS_StreamFree", bass_module)
 )
+# BOOL BASSDEF(BASS_StreamFree)(HSTREAM handle);
+BASS_StreamFree = bass_module.bind("BASS_StreamFree", ctypes.c_bool, HSTREAM)
 # QWORD BASSDEF(BASS_StreamGetFilePosition)(HSTREAM handle, DWORD mode);
-BASS_StreamGetFilePosition = func_type(QWORD, HSTREAM, ctypes.c_ulong)(
-    ("BASS_StreamGetFilePosition", bass_module)
+BASS_StreamGetFilePosition = bass_module.bind(
+    "BASS_StreamGetFilePosition", QWORD, HSTREAM, ctypes.c_ulong
 )
 # DWORD BASSDEF(BASS_StreamPutData)(HSTREAM handle, const void *buffer, DWORD length);
-BASS_StreamPutData = func_type(
-    ctypes.c_ulong, HSTREAM, ctypes.c_void_p, ctypes.c_ulong
-)(("BASS_StreamPutData", bass_module))
+BASS_StreamPutData = bass_module.bind(
+    "BASS_StreamPutData",
+    ctypes.c_ulong,
+    HSTREAM,
+    ctypes.c_void_p,
+    ctypes.c_ulong,
+)
 # DWORD BASSDEF(BASS_StreamPutFileData)(HSTREAM handle, const void *buffer, DWORD length);
-BASS_StreamPutFileData = func_type(
-    ctypes.c_ulong, HSTREAM, ctypes.c_void_p, ctypes.c_ulong
-)(("BASS_StreamPutFileData", bass_module))
+BASS_StreamPutFileData = bass_module.bind(
+    "BASS_StreamPutFileData",
+    ctypes.c_ulong,
+    HSTREAM,
+    ctypes.c_void_p,
+    ctypes.c_ulong,
+)
 
 # BOOL BASSDEF(BASS_RecordGetDeviceInfo)(DWORD device, BASS_DEVICEINFO *info);
-BASS_RecordGetDeviceInfo = func_type(
-    ctypes.c_bool, ctypes.c_ulong, ctypes.POINTER(BASS_DEVICEINFO)
-)(("BASS_RecordGetDeviceInfo", bass_module))
+BASS_RecordGetDeviceInfo = bass_module.bind(
+    "BASS_RecordGetDeviceInfo",
+    ctypes.c_bool,
+    ctypes.c_ulong,
+    ctypes.POINTER(BASS_DEVICEINFO),
+)
 # BOOL BASSDEF(BASS_RecordInit)(int device);
-BASS_RecordInit = func_type(ctypes.c_bool, ctypes.c_int)(
-    ("BASS_RecordInit", bass_module)
+BASS_RecordInit = bass_module.bind(
+    "BASS_RecordInit", ctypes.c_bool, ctypes.c_int
 )
 # BOOL BASSDEF(BASS_RecordSetDevice)(DWORD device);
-BASS_RecordSetDevice = func_type(ctypes.c_bool, ctypes.c_ulong)(
-    ("BASS_RecordSetDevice", bass_module)
+BASS_RecordSetDevice = bass_module.bind(
+    "BASS_RecordSetDevice", ctypes.c_bool, ctypes.c_ulong
 )
 # DWORD BASSDEF(BASS_RecordGetDevice)();
-BASS_RecordGetDevice = func_type(ctypes.c_ulong)(
-    ("BASS_RecordGetDevice", bass_module)
-)
+BASS_RecordGetDevice = bass_module.bind("BASS_RecordGetDevice", ctypes.c_ulong)
 # BOOL BASSDEF(BASS_RecordFree)();
-BASS_RecordFree = func_type(ctypes.c_bool)(("BASS_RecordFree", bass_module))
+BASS_RecordFree = bass_module.bind("BASS_RecordFree", ctypes.c_bool)
 # BOOL BASSDEF(BASS_RecordGetInfo)(BASS_RECORDINFO *info);
-BASS_RecordGetInfo = func_type(ctypes.c_bool, ctypes.POINTER(BASS_RECORDINFO))(
-    ("BASS_RecordGetInfo", bass_module)
+BASS_RecordGetInfo = bass_module.bind(
+    "BASS_RecordGetInfo", ctypes.c_bool, ctypes.POINTER(BASS_RECORDINFO)
 )
 # const char *BASSDEF(BASS_RecordGetInputName)(int input);
-BASS_RecordGetInputName = func_type(ctypes.c_char_p, ctypes.c_int)(
-    ("BASS_RecordGetInputName", bass_module)
+BASS_RecordGetInputName = bass_module.bind(
+    "BASS_RecordGetInputName", ctypes.c_char_p, ctypes.c_int
 )
 # BOOL BASSDEF(BASS_RecordSetInput)(int input, DWORD flags, float volume);
-BASS_RecordSetInput = func_type(
-    ctypes.c_bool, ctypes.c_int, ctypes.c_ulong, ctypes.c_float
-)(("BASS_RecordSetInput", bass_module))
+BASS_RecordSetInput = bass_module.bind(
+    "BASS_RecordSetInput",
+    ctypes.c_bool,
+    ctypes.c_int,
+    ctypes.c_ulong,
+    ctypes.c_float,
+)
 # DWORD BASSDEF(BASS_RecordGetInput)(int input, float *volume);
-BASS_RecordGetInput = func_type(ctypes.c_ulong, ctypes.c_int, ctypes.c_float)(
-    ("BASS_RecordGetInput", bass_module)
+BASS_RecordGetInput = bass_module.bind(
+    "BASS_RecordGetInput", ctypes.c_ulong, ctypes.c_int, ctypes.c_float
 )
 # HRECORD BASSDEF(BASS_RecordStart)(DWORD freq, DWORD chans, DWORD flags, RECORDPROC *proc, void *user);
-BASS_RecordStart = func_type(
+BASS_RecordStart = bass_module.bind(
+    "BASS_RecordStart",
     HRECORD,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.c_ulong,
     RECORDPROC,
     ctypes.c_void_p,
-)(("BASS_RecordStart", bass_module))
+)
 
 # double BASSDEF(BASS_ChannelBytes2Seconds)(DWORD handle, QWORD pos);
-BASS_ChannelBytes2Seconds = func_type(ctypes.c_double, ctypes.c_ulong, QWORD)(
-    ("BASS_ChannelBytes2Seconds", bass_module)
+BASS_ChannelBytes2Seconds = bass_module.bind(
+    "BASS_ChannelBytes2Seconds", ctypes.c_double, ctypes.c_ulong, QWORD
 )
 # QWORD BASSDEF(BASS_ChannelSeconds2Bytes)(DWORD handle, double pos);
-BASS_ChannelSeconds2Bytes = func_type(QWORD, ctypes.c_ulong, ctypes.c_double)(
-    ("BASS_ChannelSeconds2Bytes", bass_module)
+BASS_ChannelSeconds2Bytes = bass_module.bind(
+    "BASS_ChannelSeconds2Bytes", QWORD, ctypes.c_ulong, ctypes.c_double
 )
 # DWORD BASSDEF(BASS_ChannelGetDevice)(DWORD handle);
-BASS_ChannelGetDevice = func_type(ctypes.c_ulong, ctypes.c_ulong)(
-    ("BASS_ChannelGetDevice", bass_module)
+BASS_ChannelGetDevice = bass_module.bind(
+    "BASS_ChannelGetDevice", ctypes.c_ulong, ctypes.c_ulong
 )
 # BOOL BASSDEF(BASS_ChannelSetDevice)(DWORD handle, DWORD device);
-BASS_ChannelSetDevice = func_type(
-    ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong
-)(("BASS_ChannelSetDevice", bass_module))
+BASS_ChannelSetDevice = bass_module.bind(
+    "BASS_ChannelSetDevice", ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong
+)
 # DWORD BASSDEF(BASS_ChannelIsActive)(DWORD handle);
-BASS_ChannelIsActive = func_type(ctypes.c_ulong, ctypes.c_ulong)(
-    ("BASS_ChannelIsActive", bass_module)
+BASS_ChannelIsActive = bass_module.bind(
+    "BASS_ChannelIsActive", ctypes.c_ulong, ctypes.c_ulong
 )
 # BOOL BASSDEF(BASS_ChannelGetInfo)(DWORD handle, BASS_CHANNELINFO *info);
-BASS_ChannelGetInfo = func_type(
-    ctypes.c_bool, ctypes.c_ulong, ctypes.POINTER(BASS_CHANNELINFO)
-)(("BASS_ChannelGetInfo", bass_module))
+BASS_ChannelGetInfo = bass_module.bind(
+    "BASS_ChannelGetInfo",
+    ctypes.c_bool,
+    ctypes.c_ulong,
+    ctypes.POINTER(BASS_CHANNELINFO),
+)
 # const char *BASSDEF(BASS_ChannelGetTags)(DWORD handle, DWORD tags);
 # ~ BASS_ChannelGetTags = func_type(ctypes.c_char_p, ctypes.c_ulong, ctypes.c_ulong)(('BASS_ChannelGetTags', bass_module))
-BASS_ChannelGetTags = func_type(
-    ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong
-)(("BASS_ChannelGetTags", bass_module))
+BASS_ChannelGetTags = bass_module.bind(
+    "BASS_ChannelGetTags", ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong
+)
 # DWORD BASSDEF(BASS_ChannelFlags)(DWORD handle, DWORD flags, DWORD mask);
-BASS_ChannelFlags = func_type(
-    ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong
-)(("BASS_ChannelFlags", bass_module))
+BASS_ChannelFlags = bass_module.bind(
+    "BASS_ChannelFlags",
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+)
 # BOOL BASSDEF(BASS_ChannelUpdate)(DWORD handle, DWORD length);
-BASS_ChannelUpdate = func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong)(
-    ("BASS_ChannelUpdate", bass_module)
+BASS_ChannelUpdate = bass_module.bind(
+    "BASS_ChannelUpdate", ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong
 )
 # BOOL BASSDEF(BASS_ChannelLock)(DWORD handle, BOOL lock);
-BASS_ChannelLock = func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_bool)(
-    ("BASS_ChannelLock", bass_module)
+BASS_ChannelLock = bass_module.bind(
+    "BASS_ChannelLock", ctypes.c_bool, ctypes.c_ulong, ctypes.c_bool
 )
 # BOOL BASSDEF(BASS_ChannelPlay)(DWORD handle, BOOL restart);
-BASS_ChannelPlay = func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_bool)(
-    ("BASS_ChannelPlay", bass_module)
+BASS_ChannelPlay = bass_module.bind(
+    "BASS_ChannelPlay", ctypes.c_bool, ctypes.c_ulong, ctypes.c_bool
 )
 # BOOL BASSDEF(BASS_ChannelStop)(DWORD handle);
-BASS_ChannelStop = func_type(ctypes.c_bool, ctypes.c_ulong)(
-    ("BASS_ChannelStop", bass_module)
+BASS_ChannelStop = bass_module.bind(
+    "BASS_ChannelStop", ctypes.c_bool, ctypes.c_ulong
 )
 # BOOL BASSDEF(BASS_ChannelPause)(DWORD handle);
-BASS_ChannelPause = func_type(ctypes.c_bool, ctypes.c_ulong)(
-    ("BASS_ChannelPause", bass_module)
+BASS_ChannelPause = bass_module.bind(
+    "BASS_ChannelPause", ctypes.c_bool, ctypes.c_ulong
 )
 # BOOL BASSDEF(BASS_ChannelSetAttribute)(DWORD handle, DWORD attrib, float value);
-BASS_ChannelSetAttribute = func_type(
-    ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_float
-)(("BASS_ChannelSetAttribute", bass_module))
+BASS_ChannelSetAttribute = bass_module.bind(
+    "BASS_ChannelSetAttribute",
+    ctypes.c_bool,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    ctypes.c_float,
+)
 # BOOL BASSDEF(BASS_ChannelGetAttribute)(DWORD handle, DWORD attrib, float *value);
-BASS_ChannelGetAttribute = func_type(
+BASS_ChannelGetAttribute = bass_module.bind(
+    "BASS_ChannelGetAttribute",
     ctypes.c_bool,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.POINTER(ctypes.c_float),
-)(("BASS_ChannelGetAttribute", bass_module))
+)
 # BOOL BASSDEF(BASS_ChannelSlideAttribute)(DWORD handle, DWORD attrib, float value, DWORD time);
-BASS_ChannelSlideAttribute = func_type(
+BASS_ChannelSlideAttribute = bass_module.bind(
+    "BASS_ChannelSlideAttribute",
     ctypes.c_bool,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.c_float,
     ctypes.c_ulong,
-)(("BASS_ChannelSlideAttribute", bass_module))
+)
 # BOOL BASSDEF(BASS_ChannelIsSliding)(DWORD handle, DWORD attrib);
-BASS_ChannelIsSliding = func_type(
-    ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong
-)(("BASS_ChannelIsSliding", bass_module))
+BASS_ChannelIsSliding = bass_module.bind(
+    "BASS_ChannelIsSliding", ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong
+)
 # BOOL BASSDEF(BASS_ChannelSet3DAttributes)(DWORD handle, int mode, float min, float max, int iangle, int oangle, float outvol);
-BASS_ChannelSet3DAttributes = func_type(
+BASS_ChannelSet3DAttributes = bass_module.bind(
+    "BASS_ChannelSet3DAttributes",
     ctypes.c_bool,
     ctypes.c_ulong,
     ctypes.c_int,
@@ -1612,9 +1729,10 @@ BASS_ChannelSet3DAttributes = func_type(
     ctypes.c_int,
     ctypes.c_int,
     ctypes.c_float,
-)(("BASS_ChannelSet3DAttributes", bass_module))
+)
 # BOOL BASSDEF(BASS_ChannelGet3DAttributes)(DWORD handle, DWORD *mode, float *min, float *max, DWORD *iangle, DWORD *oangle, float *outvol);
-BASS_ChannelGet3DAttributes = func_type(
+BASS_ChannelGet3DAttributes = bass_module.bind(
+    "BASS_ChannelGet3DAttributes",
     ctypes.c_bool,
     ctypes.c_ulong,
     ctypes.POINTER(ctypes.c_ulong),
@@ -1623,117 +1741,141 @@ BASS_ChannelGet3DAttributes = func_type(
     ctypes.POINTER(ctypes.c_ulong),
     ctypes.POINTER(ctypes.c_ulong),
     ctypes.POINTER(ctypes.c_float),
-)(("BASS_ChannelGet3DAttributes", bass_module))
+)
 # BOOL BASSDEF(BASS_ChannelSet3DPosition)(DWORD handle, const BASS_3DVECTOR *pos, const BASS_3DVECTOR *orient, const BASS_3DVECTOR *vel);
-BASS_ChannelSet3DPosition = func_type(
+BASS_ChannelSet3DPosition = bass_module.bind(
+    "BASS_ChannelSet3DPosition",
     ctypes.c_bool,
     ctypes.c_ulong,
     ctypes.POINTER(BASS_3DVECTOR),
     ctypes.POINTER(BASS_3DVECTOR),
     ctypes.POINTER(BASS_3DVECTOR),
-)(("BASS_ChannelSet3DPosition", bass_module))
+)
 # BOOL BASSDEF(BASS_ChannelGet3DPosition)(DWORD handle, BASS_3DVECTOR *pos, BASS_3DVECTOR *orient, BASS_3DVECTOR *vel);
-BASS_ChannelGet3DPosition = func_type(
+BASS_ChannelGet3DPosition = bass_module.bind(
+    "BASS_ChannelGet3DPosition",
     ctypes.c_bool,
     ctypes.c_ulong,
     ctypes.POINTER(BASS_3DVECTOR),
     ctypes.POINTER(BASS_3DVECTOR),
     ctypes.POINTER(BASS_3DVECTOR),
-)(("BASS_ChannelGet3DPosition", bass_module))
+)
 # QWORD BASSDEF(BASS_ChannelGetLength)(DWORD handle, DWORD mode);
-BASS_ChannelGetLength = func_type(QWORD, ctypes.c_ulong, ctypes.c_ulong)(
-    ("BASS_ChannelGetLength", bass_module)
+BASS_ChannelGetLength = bass_module.bind(
+    "BASS_ChannelGetLength", QWORD, ctypes.c_ulong, ctypes.c_ulong
 )
 # BOOL BASSDEF(BASS_ChannelSetPosition)(DWORD handle, QWORD pos, DWORD mode);
-BASS_ChannelSetPosition = func_type(
-    ctypes.c_bool, ctypes.c_ulong, QWORD, ctypes.c_ulong
-)(("BASS_ChannelSetPosition", bass_module))
+BASS_ChannelSetPosition = bass_module.bind(
+    "BASS_ChannelSetPosition",
+    ctypes.c_bool,
+    ctypes.c_ulong,
+    QWORD,
+    ctypes.c_ulong,
+)
 # QWORD BASSDEF(BASS_ChannelGetPosition)(DWORD handle, DWORD mode);
-BASS_ChannelGetPosition = func_type(QWORD, ctypes.c_ulong, ctypes.c_ulong)(
-    ("BASS_ChannelGetPosition", bass_module)
+BASS_ChannelGetPosition = bass_module.bind(
+    "BASS_ChannelGetPosition", QWORD, ctypes.c_ulong, ctypes.c_ulong
 )
 # DWORD BASSDEF(BASS_ChannelGetLevel)(DWORD handle);
-BASS_ChannelGetLevel = func_type(ctypes.c_ulong, ctypes.c_ulong)(
-    ("BASS_ChannelGetLevel", bass_module)
+BASS_ChannelGetLevel = bass_module.bind(
+    "BASS_ChannelGetLevel", ctypes.c_ulong, ctypes.c_ulong
 )
 # DWORD BASSDEF(BASS_ChannelGetData)(DWORD handle, void *buffer, DWORD length);
-BASS_ChannelGetData = func_type(
-    ctypes.c_ulong, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong
-)(("BASS_ChannelGetData", bass_module))
+BASS_ChannelGetData = bass_module.bind(
+    "BASS_ChannelGetData",
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    ctypes.c_void_p,
+    ctypes.c_ulong,
+)
 # HSYNC BASSDEF(BASS_ChannelSetSync)(DWORD handle, DWORD type, QWORD param, SYNCPROC *proc, void *user);
-BASS_ChannelSetSync = func_type(
-    HSYNC, ctypes.c_ulong, ctypes.c_ulong, QWORD, SYNCPROC, ctypes.c_void_p
-)(("BASS_ChannelSetSync", bass_module))
+BASS_ChannelSetSync = bass_module.bind(
+    "BASS_ChannelSetSync",
+    HSYNC,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    QWORD,
+    SYNCPROC,
+    ctypes.c_void_p,
+)
 # BOOL BASSDEF(BASS_ChannelRemoveSync)(DWORD handle, HSYNC sync);
-BASS_ChannelRemoveSync = func_type(ctypes.c_bool, ctypes.c_ulong, HSYNC)(
-    ("BASS_ChannelRemoveSync", bass_module)
+BASS_ChannelRemoveSync = bass_module.bind(
+    "BASS_ChannelRemoveSync", ctypes.c_bool, ctypes.c_ulong, HSYNC
 )
 # HDSP BASSDEF(BASS_ChannelSetDSP)(DWORD handle, DSPPROC *proc, void *user, int priority);
-BASS_ChannelSetDSP = func_type(
-    HDSP, ctypes.c_ulong, DSPPROC, ctypes.c_void_p, ctypes.c_int
-)(("BASS_ChannelSetDSP", bass_module))
+BASS_ChannelSetDSP = bass_module.bind(
+    "BASS_ChannelSetDSP",
+    HDSP,
+    ctypes.c_ulong,
+    DSPPROC,
+    ctypes.c_void_p,
+    ctypes.c_int,
+)
 # BOOL BASSDEF(BASS_ChannelRemoveDSP)(DWORD handle, HDSP dsp);
-BASS_ChannelRemoveDSP = func_type(ctypes.c_bool, ctypes.c_ulong, HDSP)(
-    ("BASS_ChannelRemoveDSP", bass_module)
+BASS_ChannelRemoveDSP = bass_module.bind(
+    "BASS_ChannelRemoveDSP", ctypes.c_bool, ctypes.c_ulong, HDSP
 )
 # BOOL BASSDEF(BASS_ChannelSetLink)(DWORD handle, DWORD chan);
-BASS_ChannelSetLink = func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong)(
-    ("BASS_ChannelSetLink", bass_module)
+BASS_ChannelSetLink = bass_module.bind(
+    "BASS_ChannelSetLink", ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong
 )
 # BOOL BASSDEF(BASS_ChannelRemoveLink)(DWORD handle, DWORD chan);
-BASS_ChannelRemoveLink = func_type(
-    ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong
-)(("BASS_ChannelRemoveLink", bass_module))
+BASS_ChannelRemoveLink = bass_module.bind(
+    "BASS_ChannelRemoveLink", ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong
+)
 # HFX BASSDEF(BASS_ChannelSetFX)(DWORD handle, DWORD type, int priority);
-BASS_ChannelSetFX = func_type(
-    HFX, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_int
-)(("BASS_ChannelSetFX", bass_module))
+BASS_ChannelSetFX = bass_module.bind(
+    "BASS_ChannelSetFX", HFX, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_int
+)
 # BOOL BASSDEF(BASS_ChannelRemoveFX)(DWORD handle, HFX fx);
-BASS_ChannelRemoveFX = func_type(ctypes.c_bool, ctypes.c_ulong, HFX)(
-    ("BASS_ChannelRemoveFX", bass_module)
+BASS_ChannelRemoveFX = bass_module.bind(
+    "BASS_ChannelRemoveFX", ctypes.c_bool, ctypes.c_ulong, HFX
 )
 
 # BOOL BASSDEF(BASS_FXSetParameters)(HFX handle, const void *params);
-BASS_FXSetParameters = func_type(ctypes.c_bool, HFX, ctypes.c_void_p)(
-    ("BASS_FXSetParameters", bass_module)
+BASS_FXSetParameters = bass_module.bind(
+    "BASS_FXSetParameters", ctypes.c_bool, HFX, ctypes.c_void_p
 )
 # BOOL BASSDEF(BASS_FXGetParameters)(HFX handle, void *params);
-BASS_FXGetParameters = func_type(ctypes.c_bool, HFX, ctypes.c_void_p)(
-    ("BASS_FXGetParameters", bass_module)
+BASS_FXGetParameters = bass_module.bind(
+    "BASS_FXGetParameters", ctypes.c_bool, HFX, ctypes.c_void_p
 )
 # BOOL BASSDEF(BASS_FXReset)(HFX handle);
-BASS_FXReset = func_type(ctypes.c_bool, HFX)(("BASS_FXReset", bass_module))
+BASS_FXReset = bass_module.bind("BASS_FXReset", ctypes.c_bool, HFX)
 
 if platform.system().lower() == "windows":
     # BOOL BASSDEF(BASS_Init)(int device, DWORD freq, DWORD flags, HWND win, const GUID *dsguid);
-    BASS_Init = func_type(
+    BASS_Init = bass_module.bind(
+        "BASS_Init",
         ctypes.c_bool,
         ctypes.c_int,
         ctypes.c_ulong,
         ctypes.c_ulong,
         ctypes.c_ulong,
         ctypes.c_void_p,
-    )(("BASS_Init", bass_module))
+    )
     # void *BASSDEF(BASS_GetDSoundObject)(DWORD object);
-    BASS_GetDSoundObject = func_type(ctypes.c_void_p, ctypes.c_ulong)(
-        ("BASS_GetDSoundObject", bass_module)
+    BASS_GetDSoundObject = bass_module.bind(
+        "BASS_GetDSoundObject", ctypes.c_void_p, ctypes.c_ulong
     )
     # BOOL BASSDEF(BASS_SetEAXParameters)(int env, float vol, float decay, float damp);
-    BASS_SetEAXParameters = func_type(
+    BASS_SetEAXParameters = bass_module.bind(
+        "BASS_SetEAXParameters",
         ctypes.c_bool,
         ctypes.c_int,
         ctypes.c_float,
         ctypes.c_float,
         ctypes.c_float,
-    )(("BASS_SetEAXParameters", bass_module))
+    )
     # BOOL BASSDEF(BASS_GetEAXParameters)(DWORD *env, float *vol, float *decay, float *damp);
-    BASS_GetEAXParameters = func_type(
+    BASS_GetEAXParameters = bass_module.bind(
+        "BASS_GetEAXParameters",
         ctypes.c_bool,
         ctypes.POINTER(ctypes.c_ulong),
         ctypes.POINTER(ctypes.c_float),
         ctypes.POINTER(ctypes.c_float),
         ctypes.POINTER(ctypes.c_float),
-    )(("BASS_GetEAXParameters", bass_module))
+    )
 
 
 def bass_ord(symbol):
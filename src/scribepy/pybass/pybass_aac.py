@@ -23,10 +23,12 @@ DOWNLOADPROC = pybass.DOWNLOADPROC
 BASS_FILEPROCS = pybass.BASS_FILEPROCS
 
 if platform.system().lower() == "windows":
-    bass_aac_module = ctypes.WinDLL("bass_aac")
+    bass_aac_module = pybass.LazyLibrary(
+        "bass_aac", ctypes.WinDLL, ctypes.WINFUNCTYPE
+    )
     func_type = ctypes.WINFUNCTYPE
 else:
-    bass_aac_module = ctypes.CDLL(
+    bass_aac_module = pybass.LazyLibrary(
         f"{pybass_module}/../BASS_modules/libbass_aac.so"
     )
     func_type = ctypes.CFUNCTYPE
@@ -44,38 +46,53 @@ BASS_CTYPE_STREAM_AAC = 0x10B00  # AAC
 BASS_CTYPE_STREAM_MP4 = 0x10B01  # MP4
 
 # HSTREAM BASSAACDEF(BASS_AAC_StreamCreateFile)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags);
-BASS_AAC_StreamCreateFile = func_type(
-    HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong
-)(("BASS_AAC_StreamCreateFile", bass_aac_module))
+BASS_AAC_StreamCreateFile = bass_aac_module.bind(
+    "BASS_AAC_StreamCreateFile",
+    HSTREAM,
+    ctypes.c_byte,
+    ctypes.c_void_p,
+    QWORD,
+    QWORD,
+    ctypes.c_ulong,
+)
 # HSTREAM BASSAACDEF(BASS_AAC_StreamCreateURL)(const char *url, DWORD offset, DWORD flags, DOWNLOADPROC *proc, void *user);
-BASS_AAC_StreamCreateURL = func_type(
+BASS_AAC_StreamCreateURL = bass_aac_module.bind(
+    "BASS_AAC_StreamCreateURL",
     HSTREAM,
     ctypes.c_char_p,
     ctypes.c_ulong,
     ctypes.c_ulong,
     DOWNLOADPROC,
     ctypes.c_void_p,
-)(("BASS_AAC_StreamCreateURL", bass_aac_module))
+)
 # HSTREAM BASSAACDEF(BASS_AAC_StreamCreateFileUser)(DWORD system, DWORD flags, const BASS_FILEPROCS *procs, void *user);
-BASS_AAC_StreamCreateFileUser = func_type(
+BASS_AAC_StreamCreateFileUser = bass_aac_module.bind(
+    "BASS_AAC_StreamCreateFileUser",
     HSTREAM,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.POINTER(BASS_FILEPROCS),
     ctypes.c_void_p,
-)(("BASS_AAC_StreamCreateFileUser", bass_aac_module))
+)
 # HSTREAM BASSAACDEF(BASS_MP4_StreamCreateFile)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags);
-BASS_MP4_StreamCreateFile = func_type(
-    HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong
-)(("BASS_MP4_StreamCreateFile", bass_aac_module))
+BASS_MP4_StreamCreateFile = bass_aac_module.bind(
+    "BASS_MP4_StreamCreateFile",
+    HSTREAM,
+    ctypes.c_byte,
+    ctypes.c_void_p,
+    QWORD,
+    QWORD,
+    ctypes.c_ulong,
+)
 # HSTREAM BASSAACDEF(BASS_MP4_StreamCreateFileUser)(DWORD system, DWORD flags, const BASS_FILEPROCS *procs, void *user);
-BASS_MP4_StreamCreateFileUser = func_type(
+BASS_MP4_StreamCreateFileUser = bass_aac_module.bind(
+    "BASS_MP4_StreamCreateFileUser",
     HSTREAM,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.POINTER(BASS_FILEPROCS),
     ctypes.c_void_p,
-)(("BASS_MP4_StreamCreateFileUser", bass_aac_module))
+)
 
 if __name__ == "__main__":
     if not pybass.BASS_Init(-1, 44100, 0, 0, 0):
@@ -23,10 +23,12 @@ DOWNLOADPROC = pybass.DOWNLOADPROC
 BASS_FILEPROCS = pybass.BASS_FILEPROCS
 
 if platform.system().lower() == "windows":
-    bass_ac3_module = ctypes.WinDLL("bass_ac3")
+    bass_ac3_module = pybass.LazyLibrary(
+        "bass_ac3", ctypes.WinDLL, ctypes.WINFUNCTYPE
+    )
     func_type = ctypes.WINFUNCTYPE
 else:
-    bass_ac3_module = ctypes.CDLL(
+    bass_ac3_module = pybass.LazyLibrary(
         f"{pybass_module}/../BASS_modules/libbass_ac3.so"
     )
     func_type = ctypes.CFUNCTYPE
@@ -41,26 +43,34 @@ BASS_AC3_DYNAMIC_RANGE = 0x800  # enable dynamic range compression
 BASS_CTYPE_STREAM_AC3 = 0x11000
 
 # HSTREAM BASSAC3DEF(BASS_AC3_StreamCreateFile)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags);
-BASS_AC3_StreamCreateFile = func_type(
-    HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong
-)(("BASS_AC3_StreamCreateFile", bass_ac3_module))
+BASS_AC3_StreamCreateFile = bass_ac3_module.bind(
+    "BASS_AC3_StreamCreateFile",
+    HSTREAM,
+    ctypes.c_byte,
+    ctypes.c_void_p,
+    QWORD,
+    QWORD,
+    ctypes.c_ulong,
+)
 # HSTREAM BASSAC3DEF(BASS_AC3_StreamCreateURL)(const char *url, DWORD offset, DWORD flags, DOWNLOADPROC *proc, void *user);
-BASS_AC3_StreamCreateURL = func_type(
+BASS_AC3_StreamCreateURL = bass_ac3_module.bind(
+    "BASS_AC3_StreamCreateURL",
     HSTREAM,
     ctypes.c_char_p,
     ctypes.c_ulong,
     ctypes.c_ulong,
     DOWNLOADPROC,
     ctypes.c_void_p,
-)(("BASS_AC3_StreamCreateURL", bass_ac3_module))
+)
 # HSTREAM BASSAC3DEF(BASS_AC3_StreamCreateFileUser)(DWORD system, DWORD flags, const BASS_FILEPROCS *procs, void *user);
-BASS_AC3_StreamCreateFileUser = func_type(
+BASS_AC3_StreamCreateFileUser = bass_ac3_module.bind(
+    "BASS_AC3_StreamCreateFileUser",
     HSTREAM,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.POINTER(BASS_FILEPROCS),
     ctypes.c_void_p,
-)(("BASS_AC3_StreamCreateFileUser", bass_ac3_module))
+)
 
 if __name__ == "__main__":
     if not pybass.BASS_Init(-1, 44100, 0, 0, 0):
@@ -22,10 +22,12 @@ DOWNLOADPROC = pybass.DOWNLOADPROC
 BASS_FILEPROCS = pybass.BASS_FILEPROCS
 
 if platform.system().lower() == "windows":
-    bass_alac_module = ctypes.WinDLL("bass_alac")
+    bass_alac_module = pybass.LazyLibrary(
+        "bass_alac", ctypes.WinDLL, ctypes.WINFUNCTYPE
+    )
     func_type = ctypes.WINFUNCTYPE
 else:
-    bass_alac_module = ctypes.CDLL(
+    bass_alac_module = pybass.LazyLibrary(
         f"{pybass_module}/../BASS_modules/libbassalac.so"
     )
     func_type = ctypes.CFUNCTYPE
@@ -36,26 +38,34 @@ BASS_TAG_MP4 = 7
 BASS_CTYPE_STREAM_ALAC = 0x10E00
 
 # HSTREAM BASSALACDEF(BASS_ALAC_StreamCreateFile)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags);
-BASS_ALAC_StreamCreateFile = func_type(
-    HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong
-)(("BASS_ALAC_StreamCreateFile", bass_alac_module))
+BASS_ALAC_StreamCreateFile = bass_alac_module.bind(
+    "BASS_ALAC_StreamCreateFile",
+    HSTREAM,
+    ctypes.c_byte,
+    ctypes.c_void_p,
+    QWORD,
+    QWORD,
+    ctypes.c_ulong,
+)
 # HSTREAM BASSALACDEF(BASS_ALAC_StreamCreateURL)(const char *url, DWORD offset, DWORD flags, DOWNLOADPROC *proc, void *user);
-BASS_ALAC_StreamCreateURL = func_type(
+BASS_ALAC_StreamCreateURL = bass_alac_module.bind(
+    "BASS_ALAC_StreamCreateURL",
     HSTREAM,
     ctypes.c_char_p,
     ctypes.c_ulong,
     ctypes.c_ulong,
     DOWNLOADPROC,
     ctypes.c_void_p,
-)(("BASS_ALAC_StreamCreateURL", bass_alac_module))
+)
 # HSTREAM BASSALACDEF(BASS_ALAC_StreamCreateFileUser)(DWORD system, DWORD flags, const BASS_FILEPROCS *procs, void *user);
-BASS_ALAC_StreamCreateFileUser = func_type(
+BASS_ALAC_StreamCreateFileUser = bass_alac_module.bind(
+    "BASS_ALAC_StreamCreateFileUser",
     HSTREAM,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.POINTER(BASS_FILEPROCS),
     ctypes.c_void_p,
-)(("BASS_ALAC_StreamCreateFileUser", bass_alac_module))
+)
 
 if __name__ == "__main__":
     if not pybass.BASS_Init(-1, 44100, 0, 0, 0):
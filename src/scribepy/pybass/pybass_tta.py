@@ -22,10 +22,12 @@ HSTREAM = pybass.HSTREAM
 BASS_FILEPROCS = pybass.BASS_FILEPROCS
 
 if platform.system().lower() == "windows":
-    bass_tta_module = ctypes.WinDLL("bass_tta")
+    bass_tta_module = pybass.LazyLibrary(
+        "bass_tta", ctypes.WinDLL, ctypes.WINFUNCTYPE
+    )
     func_type = ctypes.WINFUNCTYPE
 else:
-    bass_tta_module = ctypes.CDLL(
+    bass_tta_module = pybass.LazyLibrary(
         f"{pybass_module}/../BASS_modules/libbass_tta.so"
     )
     func_type = ctypes.CFUNCTYPE
@@ -34,17 +36,24 @@ else:
 BASS_CTYPE_STREAM_TTA = 0x10F00
 
 # HSTREAM BASSTTADEF(BASS_TTA_StreamCreateFile)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags);
-BASS_TTA_StreamCreateFile = func_type(
-    HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong
-)(("BASS_TTA_StreamCreateFile", bass_tta_module))
+BASS_TTA_StreamCreateFile = bass_tta_module.bind(
+    "BASS_TTA_StreamCreateFile",
+    HSTREAM,
+    ctypes.c_byte,
+    ctypes.c_void_p,
+    QWORD,
+    QWORD,
+    ctypes.c_ulong,
+)
 # HSTREAM BASSTTADEF(BASS_TTA_StreamCreateFileUser)(DWORD system, DWORD flags, const BASS_FILEPROCS *procs, void *user);
-BASS_TTA_StreamCreateFileUser = func_type(
+BASS_TTA_StreamCreateFileUser = bass_tta_module.bind(
+    "BASS_TTA_StreamCreateFileUser",
     HSTREAM,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.POINTER(BASS_FILEPROCS),
     ctypes.c_void_p,
-)(("BASS_TTA_StreamCreateFileUser", bass_tta_module))
+)
 
 if __name__ == "__main__":
     if not pybass.BASS_Init(-1, 44100, 0, 0, 0):
@@ -23,11 +23,13 @@ DOWNLOADPROC = pybass.DOWNLOADPROC
 BASS_FILEPROCS = pybass.BASS_FILEPROCS
 
 if platform.system().lower() == "windows":
-    bassflac_module = ctypes.WinDLL("bass_flac.dll")
+    bassflac_module = pybass.LazyLibrary(
+        "bass_flac.dll", ctypes.WinDLL, ctypes.WINFUNCTYPE
+    )
     func_type = ctypes.WINFUNCTYPE
 else:
     # correct by Wasylews (sabov.97@mail.ru), thank him
-    bassflac_module = ctypes.CDLL(
+    bassflac_module = pybass.LazyLibrary(
         f"{pybass_module}/../BASS_modules/libbassflac.so",
         mode=ctypes.RTLD_GLOBAL,
     )
@@ -38,26 +40,34 @@ BASS_CTYPE_STREAM_FLAC = 0x10900
 BASS_CTYPE_STREAM_FLAC_OGG = 0x10901
 
 # HSTREAM BASSFLACDEF(BASS_FLAC_StreamCreateFile)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags);
-BASS_FLAC_StreamCreateFile = func_type(
-    HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong
-)(("BASS_FLAC_StreamCreateFile", bassflac_module))
+BASS_FLAC_StreamCreateFile = bassflac_module.bind(
+    "BASS_FLAC_StreamCreateFile",
+    HSTREAM,
+    ctypes.c_byte,
+    ctypes.c_void_p,
+    QWORD,
+    QWORD,
+    ctypes.c_ulong,
+)
 # HSTREAM BASSFLACDEF(BASS_FLAC_StreamCreateURL)(const char *url, DWORD offset, DWORD flags, DOWNLOADPROC *proc, void *user);
-BASS_FLAC_StreamCreateURL = func_type(
+BASS_FLAC_StreamCreateURL = bassflac_module.bind(
+    "BASS_FLAC_StreamCreateURL",
     HSTREAM,
     ctypes.c_char_p,
     ctypes.c_ulong,
     ctypes.c_ulong,
     DOWNLOADPROC,
     ctypes.c_void_p,
-)(("BASS_FLAC_StreamCreateURL", bassflac_module))
+)
 # HSTREAM BASSFLACDEF(BASS_FLAC_StreamCreateFileUser)(DWORD system, DWORD flags, const BASS_FILEPROCS *procs, void *user);
-BASS_FLAC_StreamCreateFileUser = func_type(
+BASS_FLAC_StreamCreateFileUser = bassflac_module.bind(
+    "BASS_FLAC_StreamCreateFileUser",
     HSTREAM,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.POINTER(BASS_FILEPROCS),
     ctypes.c_void_p,
-)(("BASS_FLAC_StreamCreateFileUser", bassflac_module))
+)
 
 if __name__ == "__main__":
     if not pybass.BASS_Init(-1, 44100, 0, 0, 0):
@@ -13,7 +13,11 @@ features. It also provides the ability to go the other way and split a
 BASS channel into multiple channels.
 """
 
-import sys, ctypes, platform, pybass
+import sys, ctypes, platform
+from scribepy.pybass import pybass
+from pathlib import Path
+
+pybass_module = Path(__file__).parent
 
 QWORD = pybass.QWORD
 HSYNC = pybass.HSYNC
@@ -23,10 +27,14 @@ SYNCPROC = pybass.SYNCPROC
 BASS_FILEPROCS = pybass.BASS_FILEPROCS
 
 if platform.system().lower() == "windows":
-    bassmix_module = ctypes.WinDLL("bassmix")
+    bassmix_module = pybass.LazyLibrary(
+        "bassmix", ctypes.WinDLL, ctypes.WINFUNCTYPE
+    )
     func_type = ctypes.WINFUNCTYPE
 else:
-    bassmix_module = ctypes.CDLL("bassmix")
+    bassmix_module = pybass.LazyLibrary(
+        f"{pybass_module}/../BASS_modules/libbassmix.so"
+    )
     func_type = ctypes.CFUNCTYPE
 
 # additional BASS_SetConfig option
@@ -74,95 +82,146 @@ BASS_CTYPE_STREAM_MIXER = 0x10800
 BASS_CTYPE_STREAM_SPLIT = 0x10801
 
 # DWORD BASSMIXDEF(BASS_Mixer_GetVersion)();
-BASS_Mixer_GetVersion = func_type(ctypes.c_ulong)(
-    ("BASS_Mixer_GetVersion", bassmix_module)
+BASS_Mixer_GetVersion = bassmix_module.bind(
+    "BASS_Mixer_GetVersion", ctypes.c_ulong
 )
 
 # HSTREAM BASSMIXDEF(BASS_Mixer_StreamCreate)(DWORD freq, DWORD chans, DWORD flags);
-BASS_Mixer_StreamCreate = func_type(
-    HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong
-)(("BASS_Mixer_StreamCreate", bassmix_module))
+BASS_Mixer_StreamCreate = bassmix_module.bind(
+    "BASS_Mixer_StreamCreate",
+    HSTREAM,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+)
 # BOOL BASSMIXDEF(BASS_Mixer_StreamAddChannel)(HSTREAM handle, DWORD channel, DWORD flags);
-BASS_Mixer_StreamAddChannel = func_type(
-    ctypes.c_byte, HSTREAM, ctypes.c_ulong, ctypes.c_ulong
-)(("BASS_Mixer_StreamAddChannel", bassmix_module))
+BASS_Mixer_StreamAddChannel = bassmix_module.bind(
+    "BASS_Mixer_StreamAddChannel",
+    ctypes.c_byte,
+    HSTREAM,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+)
 # BOOL BASSMIXDEF(BASS_Mixer_StreamAddChannelEx)(HSTREAM handle, DWORD channel, DWORD flags, QWORD start, QWORD length);
-BASS_Mixer_StreamAddChannelEx = func_type(
-    ctypes.c_byte, HSTREAM, ctypes.c_ulong, ctypes.c_ulong, QWORD, QWORD
-)(("BASS_Mixer_StreamAddChannelEx", bassmix_module))
+BASS_Mixer_StreamAddChannelEx = bassmix_module.bind(
+    "BASS_Mixer_StreamAddChannelEx",
+    ctypes.c_byte,
+    HSTREAM,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    QWORD,
+    QWORD,
+)
 
 # HSTREAM BASSMIXDEF(BASS_Mixer_ChannelGetMixer)(DWORD handle);
-BASS_Mixer_ChannelGetMixer = func_type(HSTREAM, ctypes.c_ulong)(
-    ("BASS_Mixer_ChannelGetMixer", bassmix_module)
+BASS_Mixer_ChannelGetMixer = bassmix_module.bind(
+    "BASS_Mixer_ChannelGetMixer", HSTREAM, ctypes.c_ulong
 )
 # DWORD BASSMIXDEF(BASS_Mixer_ChannelFlags)(DWORD handle, DWORD flags, DWORD mask);
-BASS_Mixer_ChannelFlags = func_type(
-    ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong
-)(("BASS_Mixer_ChannelFlags", bassmix_module))
+BASS_Mixer_ChannelFlags = bassmix_module.bind(
+    "BASS_Mixer_ChannelFlags",
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+)
 # BOOL BASSMIXDEF(BASS_Mixer_ChannelRemove)(DWORD handle);
-BASS_Mixer_ChannelRemove = func_type(ctypes.c_byte, ctypes.c_ulong)(
-    ("BASS_Mixer_ChannelRemove", bassmix_module)
+BASS_Mixer_ChannelRemove = bassmix_module.bind(
+    "BASS_Mixer_ChannelRemove", ctypes.c_byte, ctypes.c_ulong
 )
 # BOOL BASSMIXDEF(BASS_Mixer_ChannelSetPosition)(DWORD handle, QWORD pos, DWORD mode);
-BASS_Mixer_ChannelSetPosition = func_type(
-    ctypes.c_byte, ctypes.c_ulong, QWORD, ctypes.c_ulong
-)(("BASS_Mixer_ChannelSetPosition", bassmix_module))
+BASS_Mixer_ChannelSetPosition = bassmix_module.bind(
+    "BASS_Mixer_ChannelSetPosition",
+    ctypes.c_byte,
+    ctypes.c_ulong,
+    QWORD,
+    ctypes.c_ulong,
+)
 # QWORD BASSMIXDEF(BASS_Mixer_ChannelGetPosition)(DWORD handle, DWORD mode);
-BASS_Mixer_ChannelGetPosition = func_type(
-    QWORD, ctypes.c_ulong, ctypes.c_ulong
-)(("BASS_Mixer_ChannelGetPosition", bassmix_module))
+BASS_Mixer_ChannelGetPosition = bassmix_module.bind(
+    "BASS_Mixer_ChannelGetPosition", QWORD, ctypes.c_ulong, ctypes.c_ulong
+)
 # DWORD BASSMIXDEF(BASS_Mixer_ChannelGetLevel)(DWORD handle);
-BASS_Mixer_ChannelGetLevel = func_type(ctypes.c_ulong, ctypes.c_ulong)(
-    ("BASS_Mixer_ChannelGetLevel", bassmix_module)
+BASS_Mixer_ChannelGetLevel = bassmix_module.bind(
+    "BASS_Mixer_ChannelGetLevel", ctypes.c_ulong, ctypes.c_ulong
 )
 # DWORD BASSMIXDEF(BASS_Mixer_ChannelGetData)(DWORD handle, void *buffer, DWORD length);
-BASS_Mixer_ChannelGetData = func_type(
-    ctypes.c_ulong, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong
-)(("BASS_Mixer_ChannelGetData", bassmix_module))
+BASS_Mixer_ChannelGetData = bassmix_module.bind(
+    "BASS_Mixer_ChannelGetData",
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    ctypes.c_void_p,
+    ctypes.c_ulong,
+)
 # HSYNC BASSMIXDEF(BASS_Mixer_ChannelSetSync)(DWORD handle, DWORD type, QWORD param, SYNCPROC *proc, void *user);
-BASS_Mixer_ChannelSetSync = func_type(
-    HSYNC, ctypes.c_ulong, ctypes.c_ulong, QWORD, SYNCPROC, ctypes.c_void_p
-)(("BASS_Mixer_ChannelSetSync", bassmix_module))
+BASS_Mixer_ChannelSetSync = bassmix_module.bind(
+    "BASS_Mixer_ChannelSetSync",
+    HSYNC,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    QWORD,
+    SYNCPROC,
+    ctypes.c_void_p,
+)
 # BOOL BASSMIXDEF(BASS_Mixer_ChannelRemoveSync)(DWORD channel, HSYNC sync);
-BASS_Mixer_ChannelRemoveSync = func_type(ctypes.c_byte, ctypes.c_ulong, HSYNC)(
-    ("BASS_Mixer_ChannelRemoveSync", bassmix_module)
+BASS_Mixer_ChannelRemoveSync = bassmix_module.bind(
+    "BASS_Mixer_ChannelRemoveSync", ctypes.c_byte, ctypes.c_ulong, HSYNC
 )
 # BOOL BASSMIXDEF(BASS_Mixer_ChannelSetMatrix)(DWORD handle, const float *matrix);
-BASS_Mixer_ChannelSetMatrix = func_type(
-    ctypes.c_byte, ctypes.c_ulong, ctypes.POINTER(ctypes.c_float)
-)(("BASS_Mixer_ChannelSetMatrix", bassmix_module))
+BASS_Mixer_ChannelSetMatrix = bassmix_module.bind(
+    "BASS_Mixer_ChannelSetMatrix",
+    ctypes.c_byte,
+    ctypes.c_ulong,
+    ctypes.POINTER(ctypes.c_float),
+)
 # BOOL BASSMIXDEF(BASS_Mixer_ChannelGetMatrix)(DWORD handle, float *matrix);
-BASS_Mixer_ChannelGetMatrix = func_type(
-    ctypes.c_byte, ctypes.c_ulong, ctypes.POINTER(ctypes.c_float)
-)(("BASS_Mixer_ChannelGetMatrix", bassmix_module))
+BASS_Mixer_ChannelGetMatrix = bassmix_module.bind(
+    "BASS_Mixer_ChannelGetMatrix",
+    ctypes.c_byte,
+    ctypes.c_ulong,
+    ctypes.POINTER(ctypes.c_float),
+)
 # BOOL BASSMIXDEF(BASS_Mixer_ChannelSetEnvelope)(DWORD handle, DWORD type, const BASS_MIXER_NODE *nodes, DWORD count);
-BASS_Mixer_ChannelSetEnvelope = func_type(
+BASS_Mixer_ChannelSetEnvelope = bassmix_module.bind(
+    "BASS_Mixer_ChannelSetEnvelope",
     ctypes.c_byte,
     ctypes.c_ulong,
     ctypes.c_ulong,
     ctypes.POINTER(BASS_MIXER_NODE),
     ctypes.c_ulong,
-)(("BASS_Mixer_ChannelSetEnvelope", bassmix_module))
+)
 # BOOL BASSMIXDEF(BASS_Mixer_ChannelSetEnvelopePos)(DWORD handle, DWORD type, QWORD pos);
-BASS_Mixer_ChannelSetEnvelopePos = func_type(
-    ctypes.c_byte, ctypes.c_ulong, ctypes.c_ulong, QWORD
-)(("BASS_Mixer_ChannelSetEnvelopePos", bassmix_module))
+BASS_Mixer_ChannelSetEnvelopePos = bassmix_module.bind(
+    "BASS_Mixer_ChannelSetEnvelopePos",
+    ctypes.c_byte,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    QWORD,
+)
 # QWORD BASSMIXDEF(BASS_Mixer_ChannelGetEnvelopePos)(DWORD handle, DWORD type, float *value);
-BASS_Mixer_ChannelGetEnvelopePos = func_type(
-    QWORD, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_float
-)(("BASS_Mixer_ChannelGetEnvelopePos", bassmix_module))
+BASS_Mixer_ChannelGetEnvelopePos = bassmix_module.bind(
+    "BASS_Mixer_ChannelGetEnvelopePos",
+    QWORD,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    ctypes.c_float,
+)
 
 # HSTREAM BASSMIXDEF(BASS_Split_StreamCreate)(DWORD channel, DWORD flags, int *chanmap);
-BASS_Split_StreamCreate = func_type(
-    HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_int
-)(("BASS_Split_StreamCreate", bassmix_module))
+BASS_Split_StreamCreate = bassmix_module.bind(
+    "BASS_Split_StreamCreate",
+    HSTREAM,
+    ctypes.c_ulong,
+    ctypes.c_ulong,
+    ctypes.c_int,
+)
 # DWORD BASSMIXDEF(BASS_Split_StreamGetSource)(HSTREAM handle);
-BASS_Split_StreamGetSource = func_type(ctypes.c_ulong, HSTREAM)(
-    ("BASS_Split_StreamGetSource", bassmix_module)
+BASS_Split_StreamGetSource = bassmix_module.bind(
+    "BASS_Split_StreamGetSource", ctypes.c_ulong, HSTREAM
 )
 # BOOL BASSMIXDEF(BASS_Split_StreamReset)(DWORD handle);
-BASS_Split_StreamReset = func_type(ctypes.c_byte, ctypes.c_ulong)(
-    ("BASS_Split_StreamReset", bassmix_module)
+BASS_Split_StreamReset = bassmix_module.bind(
+    "BASS_Split_StreamReset", ctypes.c_byte, ctypes.c_ulong
 )
 
 if __name__ == "__main__":
@@ -0,0 +1,238 @@
+from pathlib import Path
+from time import perf_counter
+from scribepy import logger
+
+from scribepy.archive import ArchiveError, ArchiveMember
+from scribepy.archive import split as split_archive
+from scribepy.cache import JsonStore
+from scribepy.pybass.pybass import (
+    BASS_PluginLoad,
+    BASS_ErrorGetCode,
+    get_error_description,
+)
+
+modules_dir = Path(__file__).parent / "BASS_modules"
+
+
+class Decoder:
+    """
+    A BASS stream constructor and the formats it is expected to handle.
+
+    create has the signature of BASS_StreamCreateFile, create_user (if
+    any) that of BASS_StreamCreateFileUser.
+    """
+
+    def __init__(
+        self,
+        name,
+        create,
+        plugin=None,
+        mimes=(),
+        extensions=(),
+        create_user=None,
+    ):
+        self.name = name
+        self.create = create
+        self.create_user = create_user
+        self.plugin = plugin
+        self.mimes = tuple(mimes)
+        self.extensions = tuple(extensions)
+
+        self.opens = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+
+    def open(self, file, flags, offset=0, storage=None):
+        """
+        Try to create a stream from file, recording open latency.
+
+        Arguments:
+            file: Path of file to open.
+            flags: BASS_StreamCreateFile flags.
+            offset: File offset to start decoding at.
+            storage: MemoryFile or ReadaheadFile of file to decode from
+                instead of reading the file (see scribepy.storage).
+
+        Returns:
+            Stream handle, 0 if the decoder can't open the file.
+        """
+        start = perf_counter()
+        if storage is None:
+            stream = self.create(False, bytes(file), offset, 0, flags)
+        else:
+            stream = storage.create(self, flags, offset)
+        self.last_ms = (perf_counter() - start) * 1000
+        self.total_ms += self.last_ms
+        self.opens += 1
+        if not stream:
+            self.failures += 1
+        return stream
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.opens if self.opens else 0.0
+
+
+class FormatRegistry:
+    """
+    Open files by trying decoders in a priority order learned per extension.
+
+    Every successful open is counted against the file extension, so later
+    opens of the same kind of file go straight to the decoder that worked.
+    The counts are written to disk when the order of the decoders changes.
+    Files are only probed when no learned decoder succeeds.
+    """
+
+    def __init__(self, decoders, probe):
+        self.decoders = list(decoders)
+        self.probe = probe
+        self.learned = JsonStore("decoders.json")
+        self.plugins = {}
+
+    def load_plugin(self, decoder):
+        """
+        Load the BASS add-on of decoder through BASS_PluginLoad.
+
+        Add-ons are only loaded the first time their decoder is tried, so
+        opening a file only pays for the add-ons it actually needs.
+
+        Arguments:
+            decoder: Decoder whose plugin to load.
+
+        Returns:
+            Plugin handle, 0 if loading failed or decoder has no plugin.
+        """
+        if decoder.plugin is None:
+            return 0
+        if decoder.plugin not in self.plugins:
+            path = modules_dir / decoder.plugin
+            handle = BASS_PluginLoad(bytes(path), 0)
+            if not handle:
+                logger.warning(
+                    f"Could not load plugin {decoder.plugin}: "
+                    f"{get_error_description(BASS_ErrorGetCode())}"
+                )
+            self.plugins[decoder.plugin] = handle
+        return self.plugins[decoder.plugin]
+
+    def _learned(self, ext):
+        counts = self.learned.get(ext, {})
+        by_name = {d.name: d for d in self.decoders}
+        return [
+            by_name[name]
+            for name in sorted(counts, key=counts.get, reverse=True)
+            if name in by_name
+        ]
+
+    def _learn(self, ext, decoder):
+        """
+        Count a successful open of an ext file by decoder.
+
+        decoders.json is only rewritten when the order decoders are tried
+        in changes, not on every open.
+        """
+        before = self._learned(ext)
+        counts = dict(self.learned.get(ext, {}))
+        counts[decoder.name] = counts.get(decoder.name, 0) + 1
+        self.learned.set(ext, counts, save=False)
+        if self._learned(ext) != before:
+            self.learned.save()
+
+    @property
+    def extensions(self):
+        """
+        File extensions (without dot) of every registered decoder.
+        """
+        return {ext for decoder in self.decoders for ext in decoder.extensions}
+
+    def candidates(self, file):
+        """
+        Yield decoders to try for file, most likely first.
+
+        Decoders learned for the extension come first, the file is then
+        probed and decoders claiming its mime type or extension follow, and
+        every other decoder is tried last.
+
+        Arguments:
+            file: Path of file to open.
+
+        Yields:
+            Decoder instances, each at most once.
+        """
+        ext = file.suffix.lower().lstrip(".")
+        tried = set()
+
+        for decoder in self._learned(ext):
+            tried.add(decoder.name)
+            yield decoder
+
+        mime = self.probe(file)
+        preferred = [d for d in self.decoders if mime in d.mimes]
+        preferred += [d for d in self.decoders if ext in d.extensions]
+        for decoder in preferred + self.decoders:
+            if decoder.name not in tried:
+                tried.add(decoder.name)
+                yield decoder
+
+    def open(self, file, flags, storage=None):
+        """
+        Create a stream from file with the first decoder that accepts it.
+
+        Arguments:
+            file: Path of file to open.
+            flags: BASS_StreamCreateFile flags.
+            storage: MemoryFile or ReadaheadFile of file, if any. Members
+                of archives get an ArchiveMember (see scribepy.archive).
+
+        Returns:
+            Tuple of (stream handle, decoder), (0, None) if unsupported.
+        """
+        file = Path(file)
+        ext = file.suffix.lower().lstrip(".")
+        member = None
+        if storage is None and split_archive(file) is not None:
+            try:
+                storage = member = ArchiveMember(file)
+            except ArchiveError as error:
+                # Corrupt or unsupported archive, a missing member raises
+                # FileNotFoundError.
+                logger.error(error)
+                return 0, None
+
+        for decoder in self.candidates(file):
+            self.load_plugin(decoder)
+            stream = decoder.open(file, flags, storage=storage)
+            logger.debug(
+                f"Decoder {decoder.name} {'opened' if stream else 'failed'} "
+                f"{file.name} in {decoder.last_ms:.2f}ms"
+            )
+            if stream:
+                self._learn(ext, decoder)
+                return stream, decoder
+
+        logger.error(
+            f"No decoder could open {file}: "
+            f"{get_error_description(BASS_ErrorGetCode())}"
+        )
+        if member is not None:
+            member.close()
+        return 0, None
+
+    def report(self):
+        """
+        Per decoder open latency report.
+
+        Returns:
+            Report as a multi line string.
+        """
+        lines = [
+            f"{'decoder':<10}{'opens':>7}{'failed':>8}"
+            f"{'mean ms':>10}{'last ms':>10}"
+        ]
+        for d in self.decoders:
+            lines.append(
+                f"{d.name:<10}{d.opens:>7}{d.failures:>8}"
+                f"{d.mean_ms:>10.2f}{d.last_ms:>10.2f}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,193 @@
+import os
+import wave
+import ctypes
+from pathlib import Path
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor
+
+from scribepy import logger
+from scribepy.tempo import DEFAULT_PROFILE
+
+# Bytes pulled from the tempo stream per BASS_ChannelGetData call.
+BLOCK_SIZE = 1 << 20
+BASS_DATA_ERROR = 0xFFFFFFFF
+# "No sound" device, renders don't need an output device.
+NO_SOUND_DEVICE = 0
+
+
+def render_file(source, target, tempo, profile=DEFAULT_PROFILE):
+    """
+    Write file played at tempo to a 16 bit WAV file, as fast as BASS can
+    decode it.
+
+    The tempo stream is created like Player.create_file_stream does but as
+    a decoding channel, and read in BLOCK_SIZE blocks.
+
+    Arguments:
+        source: File to render.
+        target: WAV file to write.
+        tempo: Tempo change in percent.
+        profile: Name of the tempo profile.
+
+    Returns:
+        Dictionary with the duration of source, the seconds written and
+        the time spent decoding and writing them (player setup and file
+        opening excluded) if successful or error dictionary if
+        unsuccessful.
+    """
+    from scribepy.player import BASS_ChannelGetData, Player
+
+    player = Player(
+        device=NO_SOUND_DEVICE, decode=True, tempo_profile=profile
+    )
+    try:
+        error = player.create_file_stream(source)
+        if error is not None:
+            return error
+        player.change_tempo(tempo)
+
+        start = perf_counter()
+        info = player.clock.info
+        sample_size = player.clock.bytes_per_second // (
+            info.freq * info.chans
+        )
+        buffer = ctypes.create_string_buffer(BLOCK_SIZE)
+        written = 0
+        with wave.open(str(target), "wb") as out:
+            out.setnchannels(info.chans)
+            out.setsampwidth(2 if sample_size == 4 else sample_size)
+            out.setframerate(info.freq)
+            while True:
+                read = BASS_ChannelGetData(player.stream, buffer, BLOCK_SIZE)
+                if read == BASS_DATA_ERROR or not read:
+                    break
+                data = buffer.raw[:read]
+                if sample_size == 4:
+                    data = float_to_pcm16(data)
+                out.writeframes(data)
+                written += read
+        return {
+            "file": str(source),
+            "output": str(target),
+            "duration": player.length,
+            "seconds": written / player.clock.bytes_per_second,
+            "elapsed": perf_counter() - start,
+        }
+    except Exception as error:
+        logger.exception(error)
+        return {"error": f"Rendering {source} failed: {error}"}
+    finally:
+        player.destruct()
+
+
+def float_to_pcm16(data):
+    """
+    Convert 32 bit float samples to 16 bit signed samples.
+
+    Arguments:
+        data: Bytes of float samples.
+
+    Returns:
+        Bytes of 16 bit samples.
+    """
+    import numpy as np
+
+    samples = np.frombuffer(data, "<f4")
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def output_paths(sources, target):
+    """
+    Pick the WAV file each source is rendered to.
+
+    Arguments:
+        sources: Files to render.
+        target: WAV file for a single source, else a directory that gets
+            one <name>.wav per source. Sources sharing a name
+            (day1/REC001.mp3 and day2/REC001.mp3, a.mp3 and a.flac) get
+            <name>-2.wav, <name>-3.wav... so workers never write the same
+            file.
+
+    Returns:
+        List of Path.
+    """
+    target = Path(target)
+    if len(sources) == 1 and not target.is_dir():
+        return [target]
+    target.mkdir(parents=True, exist_ok=True)
+    paths = []
+    taken = set()
+    for source in sources:
+        stem = name = Path(source).stem
+        count = 1
+        while name in taken:
+            count += 1
+            name = f"{stem}-{count}"
+        taken.add(name)
+        paths.append(target / f"{name}.wav")
+    return paths
+
+
+def render(sources, target, tempo, profile=DEFAULT_PROFILE, jobs=None):
+    """
+    Render files at tempo, spread over a pool of worker processes that
+    each run their own BASS instance.
+
+    Arguments:
+        sources: Files to render.
+        target: WAV file or directory, see output_paths.
+        tempo: Tempo change in percent.
+        profile: Name of the tempo profile.
+        jobs: Number of worker processes, the number of CPUs if None.
+
+    Yields:
+        Result dictionaries of render_file, in the order of sources.
+    """
+    targets = output_paths(sources, target)
+    jobs = min(jobs or os.cpu_count() or 1, len(sources))
+    if jobs <= 1:
+        for source, output in zip(sources, targets):
+            yield render_file(source, output, tempo, profile)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(render_file, source, output, tempo, profile)
+            for source, output in zip(sources, targets)
+        ]
+        for future in futures:
+            yield future.result()
+
+
+def render_files(
+    sources, target, tempo=0, tempo_profile=DEFAULT_PROFILE, jobs=None
+):
+    """
+    Render files from the command line and print the realtime factor of
+    each.
+
+    Arguments:
+        sources: Files to render.
+        target: WAV file or directory.
+        tempo: Tempo change in percent.
+        tempo_profile: Name of the tempo profile.
+        jobs: Number of worker processes.
+
+    Returns:
+        Number of files that failed.
+    """
+    failed = 0
+    for result in render(sources, target, tempo, tempo_profile, jobs):
+        if "error" in result:
+            failed += 1
+            print(result["error"])
+            continue
+        # Throughput in source seconds, whatever the tempo.
+        factor = result["duration"] / max(result["elapsed"], 1e-9)
+        print(
+            f"{result['file']} -> {result['output']}: "
+            f"{result['duration']:.1f}s of audio rendered to "
+            f"{result['seconds']:.1f}s in {result['elapsed']:.2f}s "
+            f"({factor:.1f}x realtime)"
+        )
+    return failed
@@ -0,0 +1,214 @@
+import mmap
+import struct
+from array import array
+
+from scribepy import logger
+from scribepy.cache import cache_dir, file_key
+
+MPEG_BITRATES = {
+    # (MPEG-1?, layer): kbps by bitrate index
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}  # fmt: skip
+MPEG_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}  # fmt: skip
+ADTS_RATES = (96000, 88200, 64000, 48000, 44100, 32000, 24000, 22050, 16000, 12000, 11025, 8000, 7350)  # fmt: skip
+
+HEADER = struct.Struct("<4sIdQ")
+MAGIC = b"SPSK"
+
+
+def parse_frame(data, pos):
+    """
+    Parse an MPEG audio or ADTS AAC frame header.
+
+    Arguments:
+        data: Buffer holding the file.
+        pos: Offset of the frame.
+
+    Returns:
+        Tuple (frame size in bytes, samples, sample rate) or None if there
+        is no valid frame header at pos.
+    """
+    if (
+        pos + 7 > len(data)
+        or data[pos] != 0xFF
+        or data[pos + 1] & 0xE0 != 0xE0
+    ):
+        return None
+    b1, b2 = data[pos + 1], data[pos + 2]
+    version, layer = (b1 >> 3) & 3, (b1 >> 1) & 3
+
+    if layer == 0:
+        # ADTS: 12 bit sync and layer 00
+        if b1 & 0xF0 != 0xF0 or (b2 >> 2) & 0xF >= len(ADTS_RATES):
+            return None
+        size = (
+            ((data[pos + 3] & 3) << 11)
+            | (data[pos + 4] << 3)
+            | (data[pos + 5] >> 5)
+        )
+        blocks = (data[pos + 6] & 3) + 1
+        return (
+            (size, 1024 * blocks, ADTS_RATES[(b2 >> 2) & 0xF])
+            if size > 7
+            else None
+        )
+
+    bitrate_index, rate_index = b2 >> 4, (b2 >> 2) & 3
+    if version == 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    layer = 4 - layer
+    bitrate = MPEG_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    rate = MPEG_RATES[version][rate_index]
+    padding = (b2 >> 1) & 1
+
+    if layer == 1:
+        return (12 * bitrate // rate + padding) * 4, 384, rate
+    if layer == 3 and not mpeg1:
+        return 72 * bitrate // rate + padding, 576, rate
+    return 144 * bitrate // rate + padding, 1152, rate
+
+
+def skip_id3v2(data):
+    """
+    Get offset of the first byte after an ID3v2 tag at the start of data.
+    """
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+class SeekTable:
+    """
+    Time to file offset index of an MPEG audio or ADTS AAC file.
+
+    Entry k is the first frame starting at or after k * interval seconds,
+    so looking up a time is a single array access.
+    """
+
+    def __init__(self, interval, duration, times, offsets):
+        self.interval = interval
+        self.duration = duration
+        self.times = times
+        self.offsets = offsets
+
+    @classmethod
+    def build(cls, file, interval=1.0):
+        """
+        Scan every frame header of file and build its seek table.
+
+        Arguments:
+            file: MPEG audio or ADTS AAC file.
+            interval: Seconds between table entries.
+
+        Returns:
+            SeekTable or None if file isn't made of MPEG/ADTS frames.
+        """
+        times, offsets = array("d"), array("q")
+        samples = 0
+        with (
+            open(file, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+        ):
+            pos = skip_id3v2(data)
+            first = parse_frame(data, pos)
+            if first is None:
+                return None
+            rate = first[2]
+            mark = 0.0
+            end = len(data)
+
+            while pos < end:
+                frame = parse_frame(data, pos)
+                if frame is None or frame[2] != rate:
+                    # Lost sync (junk or trailing tags), look for next frame.
+                    pos = data.find(b"\xff", pos + 1)
+                    if pos < 0:
+                        break
+                    continue
+                size, frame_samples, _ = frame
+                time = samples / rate
+                if time >= mark:
+                    times.append(time)
+                    offsets.append(pos)
+                    mark = len(times) * interval
+                samples += frame_samples
+                pos += size
+
+        return cls(interval, samples / rate, times, offsets)
+
+    def lookup(self, seconds):
+        """
+        Find the last indexed frame starting at or before seconds.
+
+        Arguments:
+            seconds: Stream position.
+
+        Returns:
+            Tuple (frame time in seconds, frame file offset).
+        """
+        k = min(max(int(seconds / self.interval), 0), len(self.times) - 1)
+        if self.times[k] > seconds and k > 0:
+            k -= 1
+        return self.times[k], self.offsets[k]
+
+    @staticmethod
+    def path(file):
+        return cache_dir("seektables") / f"{file_key(file)}.idx"
+
+    def save(self, file):
+        """
+        Store table in the seek table cache under the identity of file.
+
+        Arguments:
+            file: File the table was built from.
+
+        Returns:
+            True if successful else False.
+        """
+        path = self.path(file)
+        try:
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                f.write(HEADER.pack(MAGIC, len(self.times), self.interval, 0))
+                f.write(struct.pack("<d", self.duration))
+                self.times.tofile(f)
+                self.offsets.tofile(f)
+            tmp.replace(path)
+            return True
+        except OSError as error:
+            logger.exception(error)
+            return False
+
+    @classmethod
+    def load(cls, file):
+        """
+        Get the cached seek table of file.
+
+        Arguments:
+            file: File to get table of.
+
+        Returns:
+            SeekTable or None if no table is cached for this version of file.
+        """
+        try:
+            with open(cls.path(file), "rb") as f:
+                magic, count, interval, _ = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC:
+                    return None
+                (duration,) = struct.unpack("<d", f.read(8))
+                times, offsets = array("d"), array("q")
+                times.fromfile(f, count)
+                offsets.fromfile(f, count)
+        except (OSError, EOFError, struct.error):
+            return None
+        return cls(interval, duration, times, offsets)
@@ -0,0 +1,177 @@
+import struct
+from pathlib import Path
+
+from scribepy import logger
+from scribepy.cache import cache_dir, file_key
+
+HEADER = struct.Struct("<4sIffd")
+MAGIC = b"SPSL"
+
+# Seconds per RMS window.
+WINDOW = 0.02
+# Windows quieter than this (dBFS) are silent.
+THRESHOLD_DB = -45.0
+# Shortest silence stored in the map, in seconds.
+MIN_SILENCE = 0.5
+# Windows decoded per BASS_ChannelGetData call.
+BLOCK_WINDOWS = 3000
+
+
+class SilenceMap:
+    """
+    Silent intervals of a file, as (start, end) seconds sorted by start.
+
+    Built by decoding the file to float samples and comparing the RMS of
+    each WINDOW against THRESHOLD_DB.
+    """
+
+    def __init__(
+        self, duration, intervals, window=WINDOW, threshold_db=THRESHOLD_DB
+    ):
+        self.duration = duration
+        self.intervals = intervals
+        self.window = window
+        self.threshold_db = threshold_db
+
+    @classmethod
+    def build(cls, file):
+        """
+        Decode file and find its silent intervals.
+
+        Arguments:
+            file: File to analyse.
+
+        Returns:
+            SilenceMap or None if file can't be decoded.
+        """
+        import numpy as np
+        from scribepy.player import registry
+        from scribepy.pybass.pybass import (
+            BASS_CHANNELINFO,
+            BASS_ChannelGetData,
+            BASS_ChannelGetInfo,
+            BASS_SAMPLE_FLOAT,
+            BASS_SAMPLE_MONO,
+            BASS_STREAM_DECODE,
+            BASS_StreamFree,
+        )
+
+        # Mono is only honoured by the MPEG decoder, other files are
+        # downmixed below.
+        flags = BASS_STREAM_DECODE | BASS_SAMPLE_FLOAT | BASS_SAMPLE_MONO
+        stream, _ = registry.open(Path(file), flags)
+        if not stream:
+            return None
+        try:
+            info = BASS_CHANNELINFO()
+            BASS_ChannelGetInfo(stream, info)
+            frames = max(int(info.freq * WINDOW), 1)
+            window = frames / info.freq
+            block = np.empty(frames * info.chans * BLOCK_WINDOWS, np.float32)
+            # Compare mean squares, 10*log10(mean square) is the RMS in dB.
+            limit = 10 ** (THRESHOLD_DB / 10)
+
+            silent = []
+            while True:
+                read = BASS_ChannelGetData(
+                    stream, block.ctypes.data, block.nbytes
+                )
+                if read == 0xFFFFFFFF or not read:
+                    break
+                samples = block[: read // 4]
+                count = len(samples) // (frames * info.chans)
+                power = np.square(
+                    samples[: count * frames * info.chans]
+                ).reshape(count, -1).mean(axis=1)
+                silent.append(power < limit)
+        finally:
+            BASS_StreamFree(stream)
+
+        silent = np.concatenate(silent) if silent else np.zeros(0, bool)
+        edges = np.diff(np.concatenate(([0], silent.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        keep = (ends - starts) * window >= MIN_SILENCE
+        intervals = np.column_stack((starts[keep], ends[keep])) * window
+        return cls(len(silent) * window, intervals, window)
+
+    def skippable(self, min_length):
+        """
+        Get intervals of at least min_length seconds.
+
+        Arguments:
+            min_length: Shortest interval in seconds.
+
+        Returns:
+            Array of (start, end) rows.
+        """
+        intervals = self.intervals
+        return intervals[intervals[:, 1] - intervals[:, 0] >= min_length]
+
+    @property
+    def silent_seconds(self):
+        return float((self.intervals[:, 1] - self.intervals[:, 0]).sum())
+
+    @staticmethod
+    def path(file):
+        return cache_dir("silence") / f"{file_key(file)}.sil"
+
+    def save(self, file):
+        """
+        Store map in the silence cache under the identity of file.
+
+        Arguments:
+            file: File the map was built from.
+
+        Returns:
+            True if successful else False.
+        """
+        path = self.path(file)
+        try:
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                f.write(
+                    HEADER.pack(
+                        MAGIC,
+                        len(self.intervals),
+                        self.window,
+                        self.threshold_db,
+                        self.duration,
+                    )
+                )
+                self.intervals.astype("<f8").tofile(f)
+            tmp.replace(path)
+            return True
+        except OSError as error:
+            logger.exception(error)
+            return False
+
+    @classmethod
+    def load(cls, file):
+        """
+        Get the cached silence map of file.
+
+        Arguments:
+            file: File to get map of.
+
+        Returns:
+            SilenceMap or None if no map is cached for this version of file
+            and the current THRESHOLD_DB.
+        """
+        import numpy as np
+
+        try:
+            with open(cls.path(file), "rb") as f:
+                magic, count, window, threshold_db, duration = HEADER.unpack(
+                    f.read(HEADER.size)
+                )
+                if magic != MAGIC or threshold_db != THRESHOLD_DB:
+                    return None
+                intervals = np.fromfile(f, "<f8", count * 2)
+        except (OSError, struct.error):
+            return None
+        if len(intervals) != count * 2:
+            return None
+        return cls(
+            duration, intervals.reshape(count, 2), window, threshold_db
+        )
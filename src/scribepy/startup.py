@@ -0,0 +1,115 @@
+import os
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+# Modules imported by each stage of a scribepy run, in the order they happen.
+STAGES = (
+    ("startup", "scribepy.main"),
+    ("play path", "scribepy.cli"),
+    ("keyboard listener", "pynput.keyboard"),
+    ("banner", "pyfiglet"),
+    ("libmagic fallback", "magic"),
+    ("logging", "loguru"),
+)
+
+# Run in a fresh interpreter so nothing is imported yet.
+PROFILE_SCRIPT = """
+import sys, json, importlib
+from time import perf_counter
+
+stages = []
+for title, module in json.loads(sys.argv[1]):
+    start = perf_counter()
+    try:
+        importlib.import_module(module)
+        ms = (perf_counter() - start) * 1000
+    except Exception:
+        ms = None
+    stages.append((title, module, ms))
+
+from scribepy.pybass.pybass import LazyLibrary
+
+libraries = []
+for library in LazyLibrary.libraries:
+    try:
+        library.dll
+        libraries.append((library.name, library.load_ms))
+    except OSError:
+        libraries.append((library.name, None))
+
+print(json.dumps({"stages": stages, "libraries": libraries}))
+"""
+
+
+def parse_importtime(stderr):
+    """
+    Parse the output of python -X importtime.
+
+    Arguments:
+        stderr: Standard error of the profiled interpreter.
+
+    Returns:
+        List of (module, self microseconds, cumulative microseconds).
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def startup_profile(top=12):
+    """
+    Print an import time breakdown of a scribepy run.
+
+    Arguments:
+        top: Number of packages to list.
+
+    Returns:
+        None.
+    """
+    env = dict(os.environ)
+    package_root = str(Path(__file__).parents[1])
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, (package_root, env.get("PYTHONPATH")))
+    )
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            PROFILE_SCRIPT,
+            json.dumps(STAGES),
+        ],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        return
+
+    report = json.loads(result.stdout)
+    packages = {}
+    for name, self_us, _ in parse_importtime(result.stderr):
+        root = name.split(".")[0]
+        packages[root] = packages.get(root, 0) + self_us
+
+    print(f"{'stage':<20}{'module':<20}{'ms':>10}")
+    for title, module, ms in report["stages"]:
+        shown = "failed" if ms is None else f"{ms:.1f}"
+        print(f"{title:<20}{module:<20}{shown:>10}")
+
+    print(f"\n{'package':<40}{'self ms':>10}")
+    for root, us in sorted(packages.items(), key=lambda p: -p[1])[:top]:
+        print(f"{root:<40}{us / 1000:>10.1f}")
+
+    print(f"\n{'native library (loaded on demand)':<40}{'ms':>10}")
+    for name, ms in report["libraries"]:
+        shown = "failed" if ms is None else f"{ms:.1f}"
+        print(f"{Path(name).name:<40}{shown:>10}")
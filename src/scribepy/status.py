@@ -0,0 +1,159 @@
+import threading
+from time import monotonic
+
+from scribepy import lifecycle
+from scribepy.pybass.pybass import (
+    BASS_CHANNELINFO,
+    BASS_CONFIG_BUFFER,
+    BASS_ChannelGetData,
+    BASS_ChannelGetInfo,
+    BASS_ChannelGetLevel,
+    BASS_DATA_AVAILABLE,
+    BASS_GetConfig,
+    BASS_GetCPU,
+    BASS_SAMPLE_8BITS,
+    BASS_SAMPLE_FLOAT,
+)
+
+# Seconds between two samples, whatever rate the UI draws at.
+SAMPLE_INTERVAL = 0.05
+LEVEL_ERROR = 0xFFFFFFFF
+METER = "█"
+METER_EMPTY = "░"
+
+
+class Status:
+    """
+    Engine readings taken at one time.
+
+    left and right are the output levels (0 to 1), cpu is BASS_GetCPU in
+    percent and buffer is the fill of the playback buffer (0 to 1).
+    """
+
+    __slots__ = ("left", "right", "cpu", "buffer", "time")
+
+    def __init__(self, left=0.0, right=0.0, cpu=0.0, buffer=0.0):
+        self.left = left
+        self.right = right
+        self.cpu = cpu
+        self.buffer = buffer
+        self.time = monotonic()
+
+    def __repr__(self):
+        return (
+            f"<Status L {self.left:.2f} R {self.right:.2f} "
+            f"CPU {self.cpu:.1f}% buffer {self.buffer:.0%}>"
+        )
+
+    def meter(self, width=20):
+        """
+        Draw the levels as a VU meter and the load as text.
+
+        Arguments:
+            width: Width of each channel's meter.
+
+        Returns:
+            String.
+        """
+
+        def bar(level):
+            filled = int(round(min(max(level, 0.0), 1.0) * width))
+            return METER * filled + METER_EMPTY * (width - filled)
+
+        return (
+            f"L {bar(self.left)} R {bar(self.right)} "
+            f"CPU {self.cpu:4.1f}% buffer {self.buffer:4.0%}"
+        )
+
+
+class StatusMonitor:
+    """
+    Samples the level, CPU usage and buffer fill of a player every
+    SAMPLE_INTERVAL seconds on a worker thread.
+
+    UIs read the latest Status from self.status on every frame, which
+    makes no BASS call, so the sampling cost doesn't depend on the frame
+    rate. Nothing is sampled while the player isn't playing.
+    """
+
+    def __init__(self, player, interval=SAMPLE_INTERVAL):
+        self.player = player
+        self.interval = interval
+        self.status = Status()
+        self._bytes_per_second = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start sampling.
+
+        Returns:
+            self.
+        """
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop sampling.
+
+        Returns:
+            None.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if self.player.state == lifecycle.PLAYING:
+                self.status = self.sample()
+            elif self.status.left or self.status.right:
+                self.status = Status()
+
+    def sample(self):
+        """
+        Read the engine status now.
+
+        Returns:
+            Status.
+        """
+        channel = self.player.output
+        if not channel:
+            return Status()
+
+        level = BASS_ChannelGetLevel(channel)
+        if level == LEVEL_ERROR:
+            level = 0
+        left = (level & 0xFFFF) / 32768
+        right = (level >> 16) / 32768
+
+        buffer = 0.0
+        buffered = BASS_ChannelGetData(channel, None, BASS_DATA_AVAILABLE)
+        length = BASS_GetConfig(BASS_CONFIG_BUFFER) / 1000
+        if buffered != LEVEL_ERROR and length:
+            seconds = buffered / self._rate(channel)
+            buffer = min(seconds / length, 1.0)
+
+        return Status(left, right, BASS_GetCPU(), buffer)
+
+    def _rate(self, channel):
+        # Bytes per second of a channel, read once per channel.
+        rate = self._bytes_per_second.get(channel)
+        if rate is None:
+            info = BASS_CHANNELINFO()
+            BASS_ChannelGetInfo(channel, info)
+            if info.flags & BASS_SAMPLE_FLOAT:
+                size = 4
+            elif info.flags & BASS_SAMPLE_8BITS:
+                size = 1
+            else:
+                size = 2
+            rate = max(info.freq * info.chans * size, 1)
+            self._bytes_per_second = {channel: rate}
+        return rate
@@ -0,0 +1,730 @@
+"""
+How files are handed to BASS, chosen by file size and the storage they
+are on.
+
+BASS reads files with blocking reads on its own thread, so on slow disks
+and USB recorders every backward seek waits for the device. Files on such
+storage are instead mapped into memory (or read whole when small) with
+read ahead hints, and BASS decodes them from memory
+(BASS_StreamCreateFile with mem=True).
+
+Network mounts stall for much longer than a seek, and mapping doesn't help
+there because page faults block as well. BASS reads files on network
+filesystems through ReadaheadFile instead (BASS_StreamCreateFileUser), which
+serves its reads from a window of the file kept filled by a thread.
+"""
+
+import ctypes
+import mmap
+import os
+import threading
+from pathlib import Path
+from time import perf_counter
+
+from scribepy import logger
+
+# Open modes: BASS reads the file itself, the file is memory mapped, it is
+# read into memory whole, or BASS reads it through a readahead thread. auto
+# picks one with open_mode().
+OPEN_AUTO = "auto"
+OPEN_FILE = "file"
+OPEN_MAP = "map"
+OPEN_READ = "read"
+OPEN_READAHEAD = "readahead"
+OPEN_MODES = (OPEN_AUTO, OPEN_FILE, OPEN_MAP, OPEN_READ, OPEN_READAHEAD)
+
+# Kinds of storage a file can be on.
+SOLID = "solid"
+ROTATIONAL = "rotational"
+REMOVABLE = "removable"
+NETWORK = "network"
+UNKNOWN = "unknown"
+
+# Files up to this size on slow storage are read whole instead of mapped.
+READ_LIMIT = 16 << 20
+# Bytes from the start of a file the kernel is asked to read ahead.
+WILLNEED_LIMIT = 512 << 20
+# Readahead window: bytes read per request, kept ahead of the read position
+# and kept behind it for short rewinds.
+READAHEAD_BLOCK = 256 << 10
+READAHEAD_AHEAD = 16 << 20
+READAHEAD_BEHIND = 8 << 20
+# Seconds the readahead thread waits before retrying a failed read.
+READAHEAD_RETRY = 0.5
+NETWORK_FILESYSTEMS = (
+    "nfs",
+    "nfs4",
+    "cifs",
+    "smb3",
+    "smbfs",
+    "9p",
+    "fuse.sshfs",
+    "fuse.rclone",
+    "afs",
+    "ceph",
+)
+
+_kinds = {}
+# Memory and readahead files in use by streams, and released ones whose
+# callbacks (which can't be destroyed while they run) are kept until the
+# next open.
+_mapped = set()
+_released = []
+_lock = threading.Lock()
+
+
+def _mount_type(path):
+    # Filesystem type of the longest mount point containing path.
+    best, fstype = "", None
+    try:
+        with open("/proc/self/mounts") as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                point = fields[1].replace("\\040", " ")
+                if (
+                    path == point
+                    or path.startswith(point.rstrip("/") + "/")
+                    or point == "/"
+                ) and len(point) > len(best):
+                    best, fstype = point, fields[2]
+    except OSError:
+        return None
+    return fstype
+
+
+def _block_device(st_dev):
+    # sysfs directory of the disk (not the partition) holding a device.
+    device = Path(f"/sys/dev/block/{os.major(st_dev)}:{os.minor(st_dev)}")
+    try:
+        device = device.resolve(strict=True)
+    except OSError:
+        return None
+    if not (device / "queue").exists():
+        device = device.parent
+    return device if (device / "queue").exists() else None
+
+
+def storage_kind(file):
+    """
+    Get the kind of storage file is on, cached per device.
+
+    Arguments:
+        file: Path of a file.
+
+    Returns:
+        One of SOLID, ROTATIONAL, REMOVABLE, NETWORK or UNKNOWN.
+    """
+    try:
+        st_dev = os.stat(file).st_dev
+    except OSError:
+        return UNKNOWN
+    kind = _kinds.get(st_dev)
+    if kind is not None:
+        return kind
+
+    kind = UNKNOWN
+    fstype = _mount_type(os.path.realpath(file))
+    device = _block_device(st_dev)
+    if fstype in NETWORK_FILESYSTEMS:
+        kind = NETWORK
+    elif device is not None:
+
+        def read(name):
+            try:
+                return (device / name).read_text().strip()
+            except OSError:
+                return ""
+
+        if read("removable") == "1" or "/usb" in str(device):
+            kind = REMOVABLE
+        elif read("queue/rotational") == "1":
+            kind = ROTATIONAL
+        else:
+            kind = SOLID
+    _kinds[st_dev] = kind
+    return kind
+
+
+def open_mode(file, mode=OPEN_AUTO):
+    """
+    Choose how file is handed to BASS.
+
+    Files on rotational or removable storage are mapped, or read whole up
+    to READ_LIMIT bytes, files on network filesystems are read ahead;
+    anything else is left to BASS.
+
+    Arguments:
+        file: Path of a file.
+        mode: Requested mode, one of OPEN_MODES.
+
+    Returns:
+        OPEN_FILE, OPEN_MAP, OPEN_READ or OPEN_READAHEAD.
+    """
+    if mode != OPEN_AUTO:
+        return mode
+    kind = storage_kind(file)
+    if kind == NETWORK:
+        return OPEN_READAHEAD
+    if kind not in (ROTATIONAL, REMOVABLE):
+        return OPEN_FILE
+    try:
+        size = os.stat(file).st_size
+    except OSError:
+        return OPEN_FILE
+    return OPEN_READ if size <= READ_LIMIT else OPEN_MAP
+
+
+def advise(fd, length):
+    """
+    Ask the kernel to read a file ahead, sequentially and from now on.
+
+    Arguments:
+        fd: File descriptor.
+        length: Bytes of the file.
+
+    Returns:
+        None.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(
+            fd, 0, min(length, WILLNEED_LIMIT), os.POSIX_FADV_WILLNEED
+        )
+    except OSError as error:
+        logger.debug(f"posix_fadvise failed: {error}")
+
+
+def open_source(file, mode=OPEN_AUTO):
+    """
+    Prepare file for BASS as its open mode says.
+
+    Arguments:
+        file: Path of the file.
+        mode: Requested mode, one of OPEN_MODES.
+
+    Returns:
+        MemoryFile, ReadaheadFile, or None if BASS should read the file
+        itself.
+    """
+    with _lock:
+        _released.clear()
+    mode = open_mode(file, mode)
+    if mode == OPEN_FILE:
+        return None
+    try:
+        if mode == OPEN_READAHEAD:
+            source = ReadaheadFile(file)
+        else:
+            source = MemoryFile(file, mode)
+    except (OSError, ValueError) as error:
+        # Empty files can't be mapped, special files can't be either.
+        logger.debug(f"Reading {file} from disk: {error}")
+        return None
+    logger.debug(f"Opened {file} ({mode}, {source.length} B)")
+    return source
+
+
+class MemoryFile:
+    """
+    File contents in memory for BASS_StreamCreateFile(mem=True).
+
+    BASS doesn't copy the memory, so it has to outlive every stream
+    decoding it: each stream attached with attach() holds a reference
+    released by a BASS_SYNC_FREE sync, and the mapping is closed when the
+    last one is freed.
+    """
+
+    def __init__(self, file, mode):
+        """
+        Arguments:
+            file: Path of the file.
+            mode: OPEN_MAP or OPEN_READ.
+        """
+        self.file = Path(file)
+        self.mode = mode
+        with open(file, "rb") as f:
+            length = os.fstat(f.fileno()).st_size
+            advise(f.fileno(), length)
+            if mode == OPEN_READ:
+                self._data = bytearray(f.read())
+            else:
+                # Copy on write only so ctypes can take its address, the
+                # pages are never written.
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+                if hasattr(self._data, "madvise"):
+                    self._data.madvise(
+                        mmap.MADV_WILLNEED, 0, min(length, WILLNEED_LIMIT)
+                    )
+        self.length = len(self._data)
+        self._buffer = (ctypes.c_char * self.length).from_buffer(self._data)
+        self.address = ctypes.addressof(self._buffer)
+        self.users = 0
+        self._syncs = {}
+
+    def create(self, decoder, flags, offset=0):
+        """
+        Create a stream decoding the memory.
+
+        Arguments:
+            decoder: scribepy.registry.Decoder to create the stream with.
+            flags: BASS_StreamCreateFile flags.
+            offset: File offset to start decoding at.
+
+        Returns:
+            Stream handle, 0 if the decoder can't open the file.
+        """
+        return self.attach(
+            decoder.create(
+                True, self.address + offset, 0, self.length - offset, flags
+            )
+        )
+
+    def attach(self, stream):
+        """
+        Keep the memory alive until stream is freed.
+
+        Arguments:
+            stream: Stream decoding this memory.
+
+        Returns:
+            stream.
+        """
+        from scribepy.pybass.pybass import (
+            BASS_ChannelSetSync,
+            BASS_SYNC_FREE,
+            BASS_SYNC_ONETIME,
+            BASS_StreamFree,
+            SYNCPROC,
+            get_error_description,
+            BASS_ErrorGetCode,
+        )
+
+        if not stream:
+            return stream
+        proc = SYNCPROC(self._on_free)
+        sync = BASS_ChannelSetSync(
+            stream, BASS_SYNC_FREE | BASS_SYNC_ONETIME, 0, proc, None
+        )
+        if not sync:
+            # Without the sync the memory could be freed under the stream.
+            logger.error(
+                f"BASS_ChannelSetSync error "
+                f"{get_error_description(BASS_ErrorGetCode())}"
+            )
+            BASS_StreamFree(stream)
+            return 0
+        with _lock:
+            self._syncs[stream] = proc
+            self.users += 1
+            _mapped.add(self)
+        return stream
+
+    def _on_free(self, sync, channel, data, user):
+        with _lock:
+            self.users -= 1
+            if self.users > 0:
+                return
+            _mapped.discard(self)
+            _released.append(self)
+        self.close()
+
+    def close(self):
+        """
+        Free the memory. Only called once no stream decodes it anymore.
+
+        Returns:
+            None.
+        """
+        if self.users > 0 or self._buffer is None:
+            return
+        self._buffer = None
+        if self.mode == OPEN_MAP:
+            self._data.close()
+        self._data = None
+        logger.debug(f"Released {self.file} from memory")
+
+
+class ReadaheadStats:
+    """
+    Counters of every ReadaheadFile, telling whether the network or the
+    decoder is the bottleneck: stalls are reads BASS had to wait for
+    because the block wasn't read ahead yet.
+    """
+
+    def __init__(self):
+        self.reads = 0
+        self.hits = 0
+        self.stalls = 0
+        self.stall_ms = 0.0
+        self.max_stall_ms = 0.0
+        self.seeks = 0
+        self.cached_seeks = 0
+        self.fetched = 0
+        self.fetch_ms = 0.0
+        self.errors = 0
+
+    def stalled(self, ms):
+        self.stalls += 1
+        self.stall_ms += ms
+        self.max_stall_ms = max(self.max_stall_ms, ms)
+
+    @property
+    def throughput(self):
+        """
+        Network read speed in MB/s, 0 before the first read.
+        """
+        return self.fetched / self.fetch_ms / 1000 if self.fetch_ms else 0.0
+
+    def report(self):
+        """
+        Returns:
+            Counters as a one line string.
+        """
+        return (
+            f"{self.reads} reads, {self.hits} from cache, {self.stalls} "
+            f"stalls ({self.stall_ms:.0f}ms, longest "
+            f"{self.max_stall_ms:.0f}ms), {self.cached_seeks}/{self.seeks} "
+            f"seeks in cache, {self.fetched >> 20} MB read at "
+            f"{self.throughput:.1f} MB/s, {self.errors} errors"
+        )
+
+
+readahead_stats = ReadaheadStats()
+
+
+class UserFile:
+    """
+    Base of files BASS reads through BASS_FILEPROCS callbacks
+    (BASS_StreamCreateFileUser) instead of by path.
+
+    Subclasses implement read() and close(). Every stream gets its own
+    FileView with its own position and offset; each holds a reference to
+    the file, which is closed when the last stream is freed.
+    """
+
+    def __init__(self, file, length):
+        """
+        Arguments:
+            file: Path of the file, for messages.
+            length: Bytes of the file.
+        """
+        self.file = Path(file)
+        self.length = length
+        self.users = 0
+        self.errors = 0
+        self._views = []
+
+    def create(self, decoder, flags, offset=0):
+        """
+        Create a stream reading the file through the callbacks.
+
+        Arguments:
+            decoder: scribepy.registry.Decoder to create the stream with.
+            flags: BASS_StreamCreateFile flags.
+            offset: File offset to start decoding at.
+
+        Returns:
+            Stream handle, 0 if the decoder can't open the file.
+        """
+        from scribepy.pybass.pybass import STREAMFILE_NOBUFFER
+
+        if decoder.create_user is None:
+            return 0
+        view = FileView(self, offset)
+        with _lock:
+            # Views of freed streams are done with their callbacks by now.
+            self._views = [v for v in self._views if not v.closed]
+            self._views.append(view)
+            self.users += 1
+            _mapped.add(self)
+        stream = decoder.create_user(
+            STREAMFILE_NOBUFFER, flags, view.procs, None
+        )
+        view.creating = False
+        if not stream:
+            # BASS calls close when it fails, but the file stays open for
+            # the next decoder tried; close() is up to the caller.
+            with _lock:
+                self.users -= 1
+                if not self.users:
+                    _mapped.discard(self)
+        return stream
+
+    def read(self, position, buffer, length):
+        """
+        Copy file bytes to a buffer.
+
+        Arguments:
+            position: File offset to read from.
+            buffer: Address to copy to.
+            length: Bytes to copy.
+
+        Returns:
+            Bytes copied, less than length at the end of the file.
+
+        Raises:
+            OSError if the file can't be read.
+        """
+        raise NotImplementedError
+
+    def seek(self, position):
+        """
+        Called when BASS moves to a file offset, before reading there.
+
+        Arguments:
+            position: File offset BASS will read from next.
+
+        Returns:
+            None.
+        """
+
+    def release(self):
+        """
+        Drop a stream's reference, closing the file after the last one.
+
+        Returns:
+            None.
+        """
+        with _lock:
+            self.users -= 1
+            if self.users > 0:
+                return
+            _mapped.discard(self)
+            _released.append(self)
+        self.close()
+
+    def close(self):
+        """
+        Close the file. Only called once no stream reads it anymore.
+
+        Returns:
+            None.
+        """
+        raise NotImplementedError
+
+
+class ReadaheadFile(UserFile):
+    """
+    File read by BASS through BASS_FILEPROCS callbacks, from a window of
+    blocks a thread keeps READAHEAD_AHEAD bytes ahead of the last read.
+
+    Once the blocks ahead are read, the READAHEAD_BEHIND bytes behind the
+    last read are too, so rewinds and seeks within the window don't touch
+    the network.
+    A read outside the window is read in place and counted as a stall.
+    """
+
+    def __init__(
+        self,
+        file,
+        block=READAHEAD_BLOCK,
+        ahead=READAHEAD_AHEAD,
+        behind=READAHEAD_BEHIND,
+        stats=readahead_stats,
+    ):
+        """
+        Arguments:
+            file: Path of the file.
+            block: Bytes read per request.
+            ahead: Bytes kept read ahead of the last read.
+            behind: Bytes kept behind the last read.
+            stats: ReadaheadStats to count into.
+        """
+        self.fd = os.open(file, os.O_RDONLY)
+        try:
+            length = os.fstat(self.fd).st_size
+        except OSError:
+            os.close(self.fd)
+            raise
+        super().__init__(file, length)
+        self.block = block
+        self.ahead = max(ahead // block, 1)
+        self.behind = behind // block
+        self.stats = stats
+        self.blocks = {}
+        self._cursor = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def create(self, decoder, flags, offset=0):
+        if decoder.create_user is None:
+            return decoder.create(False, bytes(self.file), offset, 0, flags)
+        return super().create(decoder, flags, offset)
+
+    def read(self, position, buffer, length):
+        # Copy from the window when possible.
+        stats = self.stats
+        stats.reads += 1
+        copied = 0
+        hit = True
+        while copied < length and position < self.length:
+            index, start = divmod(position, self.block)
+            with self._cond:
+                data = self.blocks.get(index)
+                if index != self._cursor:
+                    self._cursor = index
+                    self._cond.notify()
+            if data is None:
+                hit = False
+                started = perf_counter()
+                try:
+                    data = self._fetch(index)
+                except OSError:
+                    stats.errors += 1
+                    raise
+                with self._cond:
+                    self.blocks[index] = data
+                    self._evict()
+                stats.stalled((perf_counter() - started) * 1000)
+            count = min(len(data) - start, length - copied)
+            if count <= 0:
+                break
+            ctypes.memmove(
+                buffer + copied,
+                ctypes.cast(data, ctypes.c_void_p).value + start,
+                count,
+            )
+            copied += count
+            position += count
+        if hit:
+            stats.hits += 1
+        return copied
+
+    def seek(self, position):
+        # Move the window.
+        index = position // self.block
+        self.stats.seeks += 1
+        with self._cond:
+            if index in self.blocks:
+                self.stats.cached_seeks += 1
+            self._cursor = index
+            self._cond.notify()
+
+    def _fetch(self, index):
+        started = perf_counter()
+        data = os.pread(self.fd, self.block, index * self.block)
+        self.stats.fetched += len(data)
+        self.stats.fetch_ms += (perf_counter() - started) * 1000
+        return data
+
+    def _evict(self):
+        # Called with the condition held. Only evicts over capacity, so
+        # the blocks around the play position survive a decoder probing
+        # tags at the end of the file.
+        excess = len(self.blocks) - self.ahead - self.behind
+        if excess <= 0:
+            return
+        low = self._cursor - self.behind
+        high = self._cursor + self.ahead
+        outside = [i for i in self.blocks if not low <= i < high]
+        outside.sort(key=lambda i: abs(i - self._cursor), reverse=True)
+        for index in outside[:excess]:
+            del self.blocks[index]
+
+    def _next_missing(self):
+        # The blocks ahead first, then the ones behind for rewinds.
+        last = min(self._cursor + self.ahead, -(-self.length // self.block))
+        first = max(self._cursor - self.behind, 0)
+        for index in range(self._cursor, last):
+            if index not in self.blocks:
+                return index
+        for index in range(self._cursor - 1, first - 1, -1):
+            if index not in self.blocks:
+                return index
+        return None
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    index = self._next_missing()
+                    while index is None and not self._closed:
+                        self._cond.wait()
+                        index = self._next_missing()
+                    if self._closed:
+                        return
+                try:
+                    data = self._fetch(index)
+                except OSError as error:
+                    self.stats.errors += 1
+                    logger.warning(f"Readahead of {self.file} failed: {error}")
+                    with self._cond:
+                        self._cond.wait(READAHEAD_RETRY)
+                    continue
+                with self._cond:
+                    self.blocks[index] = data
+                    self._evict()
+        finally:
+            os.close(self.fd)
+
+    def close(self):
+        # The readahead thread closes the file when it stops.
+        if self.users > 0:
+            return
+        with self._cond:
+            self._closed = True
+            self.blocks = {}
+            self._cond.notify()
+        logger.debug(f"Closed readahead of {self.file}")
+
+
+class FileView:
+    """
+    BASS_FILEPROCS of one stream reading a UserFile from an offset.
+    """
+
+    def __init__(self, reader, offset):
+        from scribepy.pybass.pybass import (
+            BASS_FILEPROCS,
+            FILECLOSEPROC,
+            FILELENPROC,
+            FILEREADPROC,
+            FILESEEKPROC,
+        )
+
+        self.reader = reader
+        self.offset = offset
+        self.position = 0
+        self.closed = False
+        self.creating = True
+        self.procs = BASS_FILEPROCS(
+            FILECLOSEPROC(self.close),
+            FILELENPROC(self.length),
+            FILEREADPROC(self.read),
+            FILESEEKPROC(self.seek),
+        )
+
+    def close(self, user):
+        if self.closed:
+            return
+        self.closed = True
+        if not self.creating:
+            self.reader.release()
+
+    def length(self, user):
+        return max(self.reader.length - self.offset, 0)
+
+    def read(self, buffer, length, user):
+        try:
+            read = self.reader.read(
+                self.offset + self.position, buffer, length
+            )
+        except OSError as error:
+            self.reader.errors += 1
+            logger.error(f"Reading {self.reader.file} failed: {error}")
+            return 0xFFFFFFFF
+        self.position += read
+        return read
+
+    def seek(self, offset, user):
+        if offset > self.length(user):
+            return False
+        self.position = offset
+        self.reader.seek(self.offset + offset)
+        return True
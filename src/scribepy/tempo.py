@@ -0,0 +1,77 @@
+"""
+BASS_FX tempo settings.
+
+Kept free of BASS imports so the command line parser can list the
+profiles without loading the player.
+"""
+
+BASS_ATTRIB_TEMPO = 0x10000
+BASS_ATTRIB_TEMPO_OPTION_USE_AA_FILTER = 0x10010
+BASS_ATTRIB_TEMPO_OPTION_AA_FILTER_LENGTH = 0x10011
+BASS_ATTRIB_TEMPO_OPTION_USE_QUICKALGO = 0x10012
+BASS_ATTRIB_TEMPO_OPTION_SEQUENCE_MS = 0x10013
+BASS_ATTRIB_TEMPO_OPTION_SEEKWINDOW_MS = 0x10014
+BASS_ATTRIB_TEMPO_OPTION_OVERLAP_MS = 0x10015
+BASS_ATTRIB_TEMPO_OPTION_PREVENT_CLICK = 0x10016
+
+# Tempo option names accepted by Player.set_tempo_options.
+TEMPO_OPTIONS = {
+    "aa_filter": BASS_ATTRIB_TEMPO_OPTION_USE_AA_FILTER,
+    "aa_filter_length": BASS_ATTRIB_TEMPO_OPTION_AA_FILTER_LENGTH,
+    "quick_algorithm": BASS_ATTRIB_TEMPO_OPTION_USE_QUICKALGO,
+    "sequence_ms": BASS_ATTRIB_TEMPO_OPTION_SEQUENCE_MS,
+    "seek_window_ms": BASS_ATTRIB_TEMPO_OPTION_SEEKWINDOW_MS,
+    "overlap_ms": BASS_ATTRIB_TEMPO_OPTION_OVERLAP_MS,
+    "prevent_click": BASS_ATTRIB_TEMPO_OPTION_PREVENT_CLICK,
+}
+
+# Named sets of tempo options. "default" keeps the BASS_FX defaults,
+# "low-cpu" trades quality for the cheapest settings (no anti-alias filter,
+# quick seek, short seek window) and "high-quality" uses the SoundTouch
+# settings recommended for speech with a longer anti-alias filter.
+TEMPO_PROFILES = {
+    "default": {},
+    "low-cpu": {
+        "aa_filter": 0,
+        "quick_algorithm": 1,
+        "sequence_ms": 82,
+        "seek_window_ms": 14,
+        "overlap_ms": 8,
+    },
+    "high-quality": {
+        "aa_filter": 1,
+        "aa_filter_length": 64,
+        "quick_algorithm": 0,
+        "sequence_ms": 40,
+        "seek_window_ms": 15,
+        "overlap_ms": 8,
+        "prevent_click": 1,
+    },
+}
+DEFAULT_PROFILE = "default"
+
+# Milliseconds a tempo change is slid over.
+TEMPO_RAMP_MS = 150
+# Tempo step of the increase/decrease tempo hotkeys, in percent.
+TEMPO_STEP = 4
+
+
+def tempo_options(profile=DEFAULT_PROFILE, **options):
+    """
+    Get the BASS attributes of a tempo profile.
+
+    Arguments:
+        profile: Name of a profile in TEMPO_PROFILES.
+        options: Tempo options (names of TEMPO_OPTIONS) overriding the
+            profile.
+
+    Returns:
+        Dictionary of BASS attribute to value.
+    """
+    if profile not in TEMPO_PROFILES:
+        raise ValueError(f"Unknown tempo profile {profile}")
+    values = {**TEMPO_PROFILES[profile], **options}
+    unknown = set(values) - set(TEMPO_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown tempo options {sorted(unknown)}")
+    return {TEMPO_OPTIONS[name]: value for name, value in values.items()}
@@ -0,0 +1,259 @@
+"""
+Audio tracks of video files extracted to WAV files, so they open and seek
+as fast as any WAV file.
+
+Video containers (MP4, MOV) are parsed whole by the BASS MP4 add-on every
+time they are opened and seeked, which takes seconds with hours long
+recordings. The first open of such a file plays it as usual and starts a
+background job decoding its audio track to a 16 bit WAV file in the
+transcode cache, keyed by the identity of the file (see
+scribepy.cache.file_key); later opens play the WAV file instead. The cache
+is kept under a size budget by deleting the least recently used files.
+"""
+
+import ctypes
+import os
+import re
+import struct
+import threading
+import wave
+from pathlib import Path
+from time import perf_counter
+
+from scribepy import logger
+from scribepy.archive import ArchiveMember
+from scribepy.archive import split as split_archive
+from scribepy.cache import cache_dir, file_key
+
+# Containers whose audio tracks are extracted.
+TRANSCODE_MIMES = (
+    "video/mp4",
+    "video/quicktime",
+    "video/x-m4v",
+    "video/3gpp",
+)
+# Default size budget of the cache in MB.
+TRANSCODE_BUDGET_MB = 2048
+# Bytes decoded per BASS_ChannelGetData call.
+BLOCK_SIZE = 1 << 20
+BASS_DATA_ERROR = 0xFFFFFFFF
+# Largest audio data a WAV file can hold.
+WAV_LIMIT = 0xFFFFFFFF - 36
+# Handler box of a video track ("hdlr", version, flags, pre_defined,
+# handler type).
+VIDEO_HANDLER = re.compile(rb"hdlr.{8}vide", re.DOTALL)
+
+# Keys of the files being extracted.
+_building = set()
+_lock = threading.Lock()
+
+
+def has_video(file):
+    """
+    Tell whether an MP4 or QuickTime file has a video track, by looking
+    for a video handler in its moov box.
+
+    Arguments:
+        file: File or archive member.
+
+    Returns:
+        False if the file only has audio tracks, True if it has a video
+        track or can't be parsed.
+    """
+    if split_archive(file) is not None:
+        source = ArchiveMember(file)
+        read, size, close = source.read_bytes, source.length, source.close
+    else:
+        f = open(file, "rb")
+        size, close = os.fstat(f.fileno()).st_size, f.close
+
+        def read(position, length):
+            return os.pread(f.fileno(), length, position)
+
+    try:
+        position = 0
+        while position + 8 <= size:
+            header = read(position, 16)
+            length, kind = struct.unpack(">I4s", header[:8])
+            if length == 1 and len(header) == 16:
+                length = struct.unpack(">Q", header[8:])[0]
+            elif length == 0:
+                length = size - position
+            if kind == b"moov":
+                return bool(VIDEO_HANDLER.search(read(position, length)))
+            if length < 8:
+                break
+            position += length
+    finally:
+        close()
+    return True
+
+
+class TranscodeCache:
+    """
+    WAV copies of the audio tracks of video files.
+    """
+
+    def __init__(self, budget, directory=None):
+        """
+        Arguments:
+            budget: Size budget of the cache in bytes.
+            directory: Directory of the copies, cache_dir("transcode") if
+                None.
+        """
+        self.budget = budget
+        self.directory = directory
+
+    def path(self, file):
+        """
+        Get the path of the WAV copy of file.
+        """
+        directory = Path(self.directory or cache_dir("transcode"))
+        return directory / f"{file_key(file)}.wav"
+
+    def lookup(self, file):
+        """
+        Get the WAV copy of file, marking it as recently used.
+
+        Arguments:
+            file: Video file.
+
+        Returns:
+            Path of the copy, None if file isn't extracted yet.
+        """
+        path = self.path(file)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def build(self, file):
+        """
+        Decode the audio track of file to its WAV copy.
+
+        Arguments:
+            file: Video file.
+
+        Returns:
+            Path of the copy if successful else None.
+        """
+        from scribepy.player import registry
+        from scribepy.pybass.pybass import (
+            BASS_ChannelGetData,
+            BASS_ChannelGetInfo,
+            BASS_ChannelGetLength,
+            BASS_CHANNELINFO,
+            BASS_POS_BYTE,
+            BASS_STREAM_DECODE,
+            BASS_StreamFree,
+        )
+
+        start = perf_counter()
+        path = self.path(file)
+        stream, decoder = registry.open(file, BASS_STREAM_DECODE)
+        if not stream:
+            logger.error(f"Can't extract the audio of {file}")
+            return None
+        tmp = path.with_name(f"{path.name}.part")
+        try:
+            info = BASS_CHANNELINFO()
+            BASS_ChannelGetInfo(stream, info)
+            length = BASS_ChannelGetLength(stream, BASS_POS_BYTE)
+            if length > min(self.budget, WAV_LIMIT):
+                logger.info(
+                    f"Not extracting the audio of {file}, {length} B is "
+                    f"over the budget of the transcode cache"
+                )
+                return None
+            buffer = ctypes.create_string_buffer(BLOCK_SIZE)
+            with wave.open(str(tmp), "wb") as out:
+                out.setnchannels(info.chans)
+                out.setsampwidth(2)
+                out.setframerate(info.freq)
+                while True:
+                    read = BASS_ChannelGetData(stream, buffer, BLOCK_SIZE)
+                    if read == BASS_DATA_ERROR or not read:
+                        break
+                    out.writeframes(buffer.raw[:read])
+            os.replace(tmp, path)
+        except (OSError, wave.Error) as error:
+            logger.error(f"Extracting the audio of {file} failed: {error}")
+            tmp.unlink(missing_ok=True)
+            return None
+        finally:
+            BASS_StreamFree(stream)
+        logger.info(
+            f"Extracted the audio of {file} to {path} in "
+            f"{perf_counter() - start:.1f}s"
+        )
+        self.evict(keep=path)
+        return path
+
+    def build_in_background(self, file):
+        """
+        Extract the audio track of file on a worker thread, unless it is
+        being extracted already.
+
+        Returns:
+            None.
+        """
+        key = file_key(file)
+        with _lock:
+            if key in _building:
+                return
+            _building.add(key)
+
+        def work():
+            try:
+                self.build(file)
+            finally:
+                with _lock:
+                    _building.discard(key)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def usage(self):
+        """
+        Get the copies in the cache, least recently used first, with the
+        partial copies left by interrupted extractions.
+
+        Returns:
+            List of (mtime, size, Path).
+        """
+        directory = Path(self.directory or cache_dir("transcode"))
+        entries = []
+        for path in directory.glob("*.wav*"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+        return sorted(entries)
+
+    def evict(self, keep=None):
+        """
+        Delete the least recently used copies until the cache fits its
+        budget.
+
+        Arguments:
+            keep: Copy never deleted, the one just extracted.
+
+        Returns:
+            Number of deleted copies.
+        """
+        entries = self.usage()
+        total = sum(size for _, size, _ in entries)
+        deleted = 0
+        with _lock:
+            building = set(_building)
+        for _, size, path in entries:
+            if total <= self.budget:
+                break
+            if path == keep or path.name.split(".")[0] in building:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            deleted += 1
+            logger.debug(f"Evicted {path} from the transcode cache")
+        return deleted
@@ -16,7 +16,7 @@ from asciimatics.exceptions import StopApplication, NextScene
 from scribepy.tui.utils.widgets import CustomFileBrowser
 from scribepy.player import Player
 
-multimedia_string = r"^.*(aac|flac|m4a|wav|ogg|mp3|mp4|tta|ac3)$"
+multimedia_string = r"^.*(aac|flac|m4a|wav|ogg|mp3|mp4|tta|ac3|m3u|m3u8)$"
 
 
 class BrowserFrame(Frame):
@@ -48,8 +48,8 @@ class BrowserFrame(Frame):
 
         self.fix()
 
-    def _play(self):
-        stream = self.connector.player_play(self.browser.value)
+    def _play(self, path=None):
+        stream = self.connector.player_play(path or self.browser.value)
         if stream is None:
             self.connector.run()
             raise NextScene("Progress Bar")
@@ -78,6 +78,9 @@ class BrowserFrame(Frame):
                 self.browser._populate_list(
                     Path(self.browser._root).parent.absolute()
                 )
+            if event.key_code in [ord("a")]:
+                # Play every file in the current directory.
+                self._play(self.browser._root)
 
         return Frame.process_event(self, event)
 
@@ -3,36 +3,54 @@ from asciimatics.event import KeyboardEvent
 from asciimatics.renderers import BarChart
 from asciimatics.effects import Print
 from asciimatics.exceptions import NextScene
+from scribepy import events
+from scribepy.status import StatusMonitor
+
+HEIGHT = 11
 
 
 class ProgressBar(Print):
+    # Status monitor of the latest widget. The TUI creates the widgets
+    # again on every terminal resize, the previous monitor is stopped.
+    _monitor = None
+
     def __init__(self, screen):
         Print.__init__(
             self,
             screen,
             BarChart(
-                7,
+                HEIGHT,
                 60,
-                [self.get_progress],
+                [
+                    self.get_progress,
+                    self.get_left,
+                    self.get_right,
+                    self.get_buffer,
+                    self.get_cpu,
+                ],
                 char=">",
                 scale=100.0,
                 # Create custom labels
                 labels=True,
                 axes=BarChart.X_AXIS,
+                keys=["Progress", "Left", "Right", "Buffer", "CPU"],
             ),
             x=(screen.width - 60) // 2,
-            y=(screen.height - 7) // 2,
+            y=(screen.height - HEIGHT) // 2,
             transparent=False,
             speed=2,
         ),
+        self.snapshot = None
+        self.monitor = None
 
     def _update(self, frame_no):
-        if (
-            self.connector.player.position / self.connector.player.length
-        ) == 1:
-            raise NextScene("Scribepy File Browser")
-        else:
-            Print._update(self, frame_no)
+        for event in self.connector.player.events.drain():
+            if self.connector.playlist is not None:
+                self.connector.playlist.handle(event)
+            if event.name == events.ENDED:
+                raise NextScene("Scribepy File Browser")
+        self.snapshot = self.connector.player.snapshot()
+        Print._update(self, frame_no)
 
     def process_event(self, event):
 
@@ -56,9 +74,26 @@ class ProgressBar(Print):
                 self.connector.decrease_volume()
 
     def get_progress(self):
-        return (
-            self.connector.player.position / self.connector.player.length
-        ) * 100
+        if self.snapshot is None:
+            self.snapshot = self.connector.player.snapshot()
+        return self.snapshot.percent
+
+    def get_left(self):
+        return self.monitor.status.left * 100
+
+    def get_right(self):
+        return self.monitor.status.right * 100
+
+    def get_buffer(self):
+        return self.monitor.status.buffer * 100
+
+    def get_cpu(self):
+        return self.monitor.status.cpu
 
     def set_connector(self, c):
         self.connector = c
+        # Sampled on its own thread, frames only read the latest status.
+        if ProgressBar._monitor is not None:
+            ProgressBar._monitor.stop()
+        self.monitor = StatusMonitor(c.player).start()
+        ProgressBar._monitor = self.monitor
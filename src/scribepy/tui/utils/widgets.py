@@ -18,6 +18,7 @@ import unicodedata
 from asciimatics.widgets.utilities import _enforce_width
 from future.moves.itertools import zip_longest
 from asciimatics.utilities import readable_timestamp, readable_mem
+from scribepy import archive
 
 
 class _CustomBaseListBox(with_metaclass(ABCMeta, Widget)):
@@ -612,6 +613,8 @@ class CustomMultiColumnListBox(_CustomBaseListBox):
 class CustomFileBrowser(CustomMultiColumnListBox):
     """
     A FileBrowser is a widget for finding a file on the local disk.
+
+    Zip and tar archives are shown and browsed like directories.
     """
 
     def __init__(
@@ -670,7 +673,9 @@ class CustomFileBrowser(CustomMultiColumnListBox):
         Internal function to handle directory traversal or bubble notifications up to user of the
         Widget as needed.
         """
-        if self.value and os.path.isdir(self.value):
+        if self.value and (
+            os.path.isdir(self.value) or archive.is_dir(self.value)
+        ):
             self._populate_list(self.value)
         elif self._external_notification:
             self._external_notification()
@@ -703,7 +708,9 @@ class CustomFileBrowser(CustomMultiColumnListBox):
 
         # We need to update the tree view.
         self._root = os.path.abspath(
-            value if os.path.isdir(value) else os.path.dirname(value)
+            value
+            if os.path.isdir(value) or archive.is_dir(value)
+            else os.path.dirname(value)
         )
 
         # The absolute expansion of "/" or "\" is the root of the disk, so is a cross-platform
@@ -716,10 +723,14 @@ class CustomFileBrowser(CustomMultiColumnListBox):
 
         tree_dirs = []
         tree_files = []
-        try:
-            files = os.listdir(self._root)
-        except OSError:
-            # Can fail on Windows due to access permissions
+        if os.path.isdir(self._root):
+            try:
+                files = os.listdir(self._root)
+            except OSError:
+                # Can fail on Windows due to access permissions
+                files = []
+        else:
+            self._list_archive(tree_dirs, tree_files)
             files = []
         for my_file in files:
             full_path = os.path.join(self._root, my_file)
@@ -740,6 +751,9 @@ class CustomFileBrowser(CustomMultiColumnListBox):
                     name = "|-+ {} -> {}".format(my_file, real_path)
                 else:
                     name = "|-+ {}".format(my_file)
+            elif archive.is_archive(full_path):
+                tree = tree_dirs
+                name = "|-+ {}".format(my_file)
             elif self._file_filter and not self._file_filter.match(my_file):
                 # Skip files that don't match the filter (if present)
                 continue
@@ -779,3 +793,24 @@ class CustomFileBrowser(CustomMultiColumnListBox):
 
         # We're out of the function - unset recursion flag.
         self._in_update = False
+
+    def _list_archive(self, tree_dirs, tree_files):
+        """
+        Add the entries of the archive (or directory inside one) at the
+        root to the tree.
+
+        :param tree_dirs: List of directory rows to add to.
+        :param tree_files: List of file rows to add to.
+        """
+        for name, is_dir, info in archive.listdir(self._root):
+            full_path = os.path.join(self._root, name)
+            if is_dir:
+                row = ["|-+ {}".format(name), "", ""]
+                tree_dirs.append((row, full_path))
+            elif not self._file_filter or self._file_filter.match(name):
+                row = [
+                    "|-- {}".format(name),
+                    readable_mem(info.size),
+                    readable_timestamp(info.mtime),
+                ]
+                tree_files.append((row, full_path))
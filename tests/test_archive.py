@@ -0,0 +1,72 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from scribepy import archive
+from scribepy.archive import ArchiveMember, listdir, walk
+
+DATA = bytes(range(256)) * 40
+
+
+def add(tar, name, data=None):
+    info = tarfile.TarInfo(name)
+    if data is None:
+        info.type = tarfile.DIRTYPE
+        tar.addfile(info)
+    else:
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+
+
+@pytest.fixture(params=["batch.tar", "batch.tgz"])
+def dot_tar(tmp_path, request):
+    # What "tar cf batch.tar ." stores.
+    path = tmp_path / request.param
+    with tarfile.open(path, "w:gz" if path.suffix == ".tgz" else "w") as tar:
+        add(tar, ".")
+        add(tar, "./day1")
+        add(tar, "./day1/a.mp3", DATA)
+        add(tar, "./b.wav", DATA[:100])
+    archive._indexes.clear()
+    return path
+
+
+def test_dot_prefixed_tar_lists_normalized_names(dot_tar):
+    assert [(name, is_dir) for name, is_dir, _ in listdir(dot_tar)] == [
+        ("b.wav", False),
+        ("day1", True),
+    ]
+    assert [name for name, _, _ in listdir(dot_tar / "day1")] == ["a.mp3"]
+    assert walk(dot_tar, ("mp3", "wav")) == [
+        dot_tar / "b.wav",
+        dot_tar / "day1" / "a.mp3",
+    ]
+
+
+def test_dot_prefixed_tar_members_open(dot_tar):
+    for path in walk(dot_tar, ("mp3",)):
+        member = ArchiveMember(path)
+        try:
+            assert member.read_bytes(0, len(DATA)) == DATA
+            assert member.read_bytes(1000, 10) == DATA[1000:1010]
+        finally:
+            member.close()
+
+
+def test_missing_member_raises_file_not_found(dot_tar):
+    with pytest.raises(FileNotFoundError):
+        ArchiveMember(dot_tar / "day2" / "a.mp3")
+
+
+def test_zip_with_leading_slash(tmp_path):
+    path = tmp_path / "batch.zip"
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("/day1/a.mp3", DATA)
+    archive._indexes.clear()
+    member = ArchiveMember(path / "day1" / "a.mp3")
+    try:
+        assert member.read_bytes(0, len(DATA)) == DATA
+    finally:
+        member.close()
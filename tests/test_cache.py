@@ -0,0 +1,23 @@
+import json
+import threading
+
+from scribepy.cache import JsonStore
+
+
+def test_concurrent_sets_are_all_saved(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRIBEPY_CACHE_DIR", str(tmp_path))
+    store = JsonStore("store.json")
+
+    def work(n):
+        for i in range(200):
+            store.set(f"{n}-{i}", i)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(store.path) as f:
+        assert len(json.load(f)) == 800
+    assert not list(tmp_path.glob("*.tmp"))
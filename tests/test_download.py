@@ -0,0 +1,98 @@
+import ctypes
+import http.server
+import io
+import re
+import threading
+import time
+import wave
+
+import pytest
+
+from scribepy.cache import JsonStore
+
+
+def wav_bytes(seconds):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(8000)
+        out.writeframes(bytes(range(256)) * (seconds * 8000 * 2 // 256))
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def server():
+    data = wav_bytes(2)
+    requests = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            start = 0
+            match = re.match(r"bytes=(\d+)-", self.headers.get("Range", ""))
+            if match:
+                start = int(match.group(1))
+                self.send_response(206)
+                self.send_header(
+                    "Content-Range",
+                    f"bytes {start}-{len(data) - 1}/{len(data)}",
+                )
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(len(data) - start))
+            self.end_headers()
+            requests.append((self.headers.get("Range"), len(data) - start))
+            self.wfile.write(data[start:])
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}/talk.wav", data, requests
+    httpd.shutdown()
+
+
+def test_resumed_download_fetches_only_the_missing_bytes(
+    server, tmp_path, monkeypatch
+):
+    monkeypatch.setenv("SCRIBEPY_CACHE_DIR", str(tmp_path))
+    try:
+        from scribepy.player import Player
+
+        Player(device=0)
+    except OSError as error:
+        pytest.skip(f"BASS is not available: {error}")
+    from scribepy import download
+    from scribepy.pybass.pybass import (
+        BASS_ChannelGetData,
+        BASS_STREAM_DECODE,
+        BASS_StreamFree,
+    )
+
+    url, data, requests = server
+    cache = download.DownloadCache(JsonStore("downloads.json"))
+    cache.partial(url).write_bytes(data[:10000])
+    cache.store.set(
+        download.url_key(url),
+        {"url": url, "complete": False, "length": len(data)},
+    )
+
+    stream = cache.open(url, BASS_STREAM_DECODE)
+    assert stream
+    buffer = ctypes.create_string_buffer(1 << 16)
+    decoded = 0
+    while True:
+        read = BASS_ChannelGetData(stream, buffer, len(buffer))
+        if read == 0xFFFFFFFF or not read:
+            break
+        decoded += read
+    BASS_StreamFree(stream)
+    assert decoded == len(data) - 44
+
+    for _ in range(100):
+        if cache.lookup(url) is not None:
+            break
+        time.sleep(0.05)
+    assert cache.lookup(url).read_bytes() == data
+    assert requests == [("bytes=10000-", len(data) - 10000)]
@@ -0,0 +1,12 @@
+import json
+
+from scribepy.keymap import keymap_help, load_keymap
+
+
+def test_help_follows_the_keymap(tmp_path):
+    path = tmp_path / "keymap.json"
+    path.write_text(json.dumps({"f2": ["seek", -30], "f9": None}))
+    help = keymap_help(load_keymap(path))
+    assert "F2 - Rewind (-30)" in help
+    assert "F9" not in help
+    assert "F11 - Decrease tempo" in help
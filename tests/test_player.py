@@ -0,0 +1,66 @@
+import pytest
+
+from scribepy import events
+
+# Silent MPEG-1 Layer III frames, 44.1 kHz stereo at 128 kbps.
+FRAME_SECONDS = 1152 / 44100
+
+
+def silent_mp3(path, seconds):
+    with open(path, "wb") as f:
+        for i in range(int(seconds / FRAME_SECONDS)):
+            padding = i % 3 != 0
+            size = 144 * 128000 // 44100 + padding
+            f.write(bytes((0xFF, 0xFB, 0x90 | padding << 1, 0xC4)))
+            f.write(bytes(size - 4))
+    return path
+
+
+@pytest.fixture
+def player(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRIBEPY_CACHE_DIR", str(tmp_path / "cache"))
+    try:
+        from scribepy.player import Player
+
+        player = Player(device=0, precise_seek=True, skip_silence=1)
+    except OSError as error:
+        pytest.skip(f"BASS is not available: {error}")
+    yield player
+    player.destruct()
+
+
+def test_silence_skip_with_seek_table(player, tmp_path):
+    from scribepy.seektable import SeekTable
+    from scribepy.silence import SilenceMap
+
+    path = silent_mp3(tmp_path / "silent.mp3", 4)
+    SeekTable.build(path).save(path)
+    SilenceMap.build(path).save(path)
+    player.create_file_stream(path)
+    assert player.seek_table is not None
+    stream = player.stream
+    player.play()
+
+    event = player.events.get(timeout=5)
+    while event is not None and event.name != events.SILENCE_SKIPPED:
+        event = player.events.get(timeout=5)
+    assert event is not None
+    # The stream was replaced from its own sync callback, and kept alive
+    # until released outside of it.
+    assert player.stream != stream
+    assert stream in player.handles.live
+    player.release()
+    assert stream not in player.handles.live
+    assert player.position == pytest.approx(event.data[1], abs=0.1)
+
+
+def test_failed_open_forgets_the_previous_file(player, tmp_path):
+    from scribepy import lifecycle
+
+    player.create_file_stream(silent_mp3(tmp_path / "silent.mp3", 1))
+    assert player.decoder is not None
+    error = player.create_file_stream(tmp_path / "missing.mp3")
+    assert "does not exist" in error["error"]
+    assert player.state == lifecycle.ERROR
+    assert player.file is None and player.decoder is None
+    assert player.snapshot().length == 0
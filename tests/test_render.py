@@ -0,0 +1,23 @@
+import struct
+
+from scribepy.render import float_to_pcm16, output_paths
+
+
+def test_output_paths_are_unique(tmp_path):
+    sources = ["day1/REC001.mp3", "day2/REC001.mp3", "a.mp3", "a.flac"]
+    assert [p.name for p in output_paths(sources, tmp_path)] == [
+        "REC001.wav",
+        "REC001-2.wav",
+        "a.wav",
+        "a-2.wav",
+    ]
+
+
+def test_float_to_pcm16_clips():
+    data = struct.pack("<4f", 0.0, 0.5, -2.0, 2.0)
+    assert struct.unpack("<4h", float_to_pcm16(data)) == (
+        0,
+        16383,
+        -32767,
+        32767,
+    )
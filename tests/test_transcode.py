@@ -0,0 +1,42 @@
+import os
+import struct
+
+from scribepy.transcode import TranscodeCache, has_video
+
+
+def box(kind, payload=b""):
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def hdlr(handler):
+    return box(b"hdlr", bytes(8) + handler + bytes(12))
+
+
+def mp4(path, *handlers):
+    tracks = b"".join(box(b"trak", box(b"mdia", hdlr(h))) for h in handlers)
+    path.write_bytes(
+        box(b"ftyp", b"mp42" + bytes(4))
+        + box(b"mdat", bytes(1000))
+        + box(b"moov", tracks)
+    )
+    return path
+
+
+def test_has_video(tmp_path):
+    assert not has_video(mp4(tmp_path / "audio.mp4", b"soun"))
+    assert has_video(mp4(tmp_path / "video.mp4", b"soun", b"vide"))
+    (tmp_path / "junk.mp4").write_bytes(b"junk")
+    assert has_video(tmp_path / "junk.mp4")
+
+
+def test_interrupted_extractions_count_against_the_budget(tmp_path):
+    for i, (name, size) in enumerate(
+        [("a.wav.part", 600), ("b.wav", 300), ("c.wav", 300)]
+    ):
+        path = tmp_path / name
+        path.write_bytes(bytes(size))
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+    cache = TranscodeCache(1000, tmp_path)
+    assert sum(size for _, size, _ in cache.usage()) == 1200
+    assert cache.evict() == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["b.wav", "c.wav"]